@@ -9,7 +9,7 @@ MyBank (은행거래) Flask 앱 (bank_app.py)
 
 주요 데이터:
   - bank_before.json, bank_after.json: MyBank 폴더. category_table_io·category_table.json은 MyInfo/.source 공통.
-  - 원본: MyInfo/.source/Bank 의 .xls, .xlsx.
+  - 원본: MyInfo/.source/Bank 의 .xls, .xlsx. /api/upload 로 올리면 새 거래만 before/after 에 반영 (upload_jobs).
 
 유지보수: ensure_working_directory로 API 호출 시 cwd를 MyBank로 고정. 캐시 무효화는 파일 재생성 시.
 """
@@ -64,6 +64,7 @@ except ImportError:
     )
 # 원본 은행 파일: .source/Bank. before/after: MyBank 폴더 JSON (절대경로로 통일해 Errno 2 방지)
 SOURCE_BANK_DIR = os.path.join(PROJECT_ROOT, '.source', 'Bank')
+UPLOAD_TMP_DIR = os.path.join(PROJECT_ROOT, '.source', 'upload_tmp')
 BANK_BEFORE_PATH = str(Path(SCRIPT_DIR).resolve() / 'bank_before.json')
 BANK_AFTER_PATH = str(Path(SCRIPT_DIR).resolve() / 'bank_after.json')
 
@@ -144,6 +145,10 @@ from shared_app_utils import (
     is_bad_zip_error as _is_bad_zip_error,
     format_bytes,
 )
+from excel_backend import read_sheet_frames, sheet_names as excel_sheet_names
+from bank_formats import bank_name_for_file, bank_names
+import source_watcher
+import upload_jobs
 ensure_working_directory = make_ensure_working_directory(SCRIPT_DIR)
 
 def load_source_files():
@@ -166,8 +171,7 @@ def load_source_files():
         }
         
         try:
-            xls = pd.ExcelFile(file_path)
-            for sheet_name in xls.sheet_names:
+            for sheet_name in excel_sheet_names(file_path):
                 file_info['sheets'].append({
                     'name': sheet_name,
                     'filename': file_path.name
@@ -400,8 +404,61 @@ def _remove_bank_before_after_and_bak():
 @ensure_working_directory
 def reintegrate_bank():
     """bank_before를 .source/Bank 기준으로 다시 통합·전처리하여 덮어쓴다. before/after 삭제 후 통합·전처리만 수행(bank_after 미생성)."""
+    # 감시 재생성과 겹치지 않게 before/after 를 다시 만든다
+    with source_watcher.exclusive():
+        try:
+            _remove_bank_before_after_and_bak()
+            _path_added = False
+            try:
+                _dir_str = str(SCRIPT_DIR)
+                if _dir_str not in sys.path:
+                    sys.path.insert(0, _dir_str)
+                    _path_added = True
+                import process_bank_data as _pbd
+                _pbd.integrate_bank_transactions(output_file=str(Path(BANK_BEFORE_PATH)))
+            except Exception as e:
+                return jsonify({'ok': False, 'error': str(e)}), 500
+            finally:
+                if _path_added and str(SCRIPT_DIR) in sys.path:
+                    sys.path.remove(str(SCRIPT_DIR))
+            return jsonify({'ok': True})
+        except Exception as e:
+            return jsonify({'ok': False, 'error': str(e)}), 500
+
+
+def _rebuild_from_source_watch():
+    """source_watcher 콜백 (.source/Bank 변경 후 감시 스레드): before·after 재생성 후 캐시 교체.
+    재생성 중 요청은 이전 캐시를 그대로 쓰므로 엑셀 읽기를 기다리지 않는다."""
+    global _source_bank_cache, _bank_before_cache, _bank_after_cache
+    _path_added = False
     try:
-        _remove_bank_before_after_and_bak()
+        _dir_str = str(SCRIPT_DIR)
+        if _dir_str not in sys.path:
+            sys.path.insert(0, _dir_str)
+            _path_added = True
+        import process_bank_data as _pbd
+        df_before = _pbd.integrate_bank_transactions(output_file=str(Path(BANK_BEFORE_PATH)))
+        if not Path(BANK_BEFORE_PATH).exists() or Path(BANK_BEFORE_PATH).stat().st_size == 0:
+            raise RuntimeError(getattr(_pbd, 'LAST_INTEGRATE_ERROR', None) or 'bank_before 생성 실패')
+        if not _pbd.classify_and_save(input_df=df_before if df_before is not None and not df_before.empty else None):
+            raise RuntimeError(getattr(_pbd, 'LAST_CLASSIFY_ERROR', None) or '카테고리 분류·후처리 실패')
+    finally:
+        if _path_added and str(SCRIPT_DIR) in sys.path:
+            sys.path.remove(str(SCRIPT_DIR))
+    # 새 파일을 이 스레드에서 읽어 캐시 채움 (그 사이 요청은 새 JSON 을 직접 읽음)
+    _source_bank_cache = None
+    _bank_before_cache = None
+    _bank_after_cache = None
+    load_processed_file()
+    load_category_file()
+    return True
+
+
+def _ingest_uploaded_source(path, report):
+    """upload_jobs 작업 (작업 스레드): 새 거래만 bank_before·bank_after 에 반영 → 원본을 .source/Bank 로 옮기고 캐시 교체."""
+    global _source_bank_cache, _bank_before_cache, _bank_after_cache
+    # 감시 재생성과 겹치지 않게 (옮긴 원본은 감시 스냅샷에 넣어 전체 재생성하지 않음)
+    with source_watcher.exclusive():
         _path_added = False
         try:
             _dir_str = str(SCRIPT_DIR)
@@ -409,45 +466,85 @@ def reintegrate_bank():
                 sys.path.insert(0, _dir_str)
                 _path_added = True
             import process_bank_data as _pbd
-            _pbd.integrate_bank_transactions(output_file=str(Path(BANK_BEFORE_PATH)))
-        except Exception as e:
-            return jsonify({'ok': False, 'error': str(e)}), 500
+            result = _pbd.ingest_bank_file(path, before_file=BANK_BEFORE_PATH, after_file=BANK_AFTER_PATH, progress=report)
         finally:
             if _path_added and str(SCRIPT_DIR) in sys.path:
                 sys.path.remove(str(SCRIPT_DIR))
-        return jsonify({'ok': True})
-    except Exception as e:
-        return jsonify({'ok': False, 'error': str(e)}), 500
+        # 같은 이름 원본이 있으면 덮어쓰지 않고 다른 이름으로 저장 (이전 원본의 거래가 다음 전체 재생성에서 빠지지 않게)
+        result['source_file'] = upload_jobs.move_to_source(path, SOURCE_BANK_DIR)
+        source_watcher.acknowledge('bank', [result['source_file']])
+    _source_bank_cache = None
+    if result['added']:
+        _bank_before_cache = None
+        _bank_after_cache = None
+        load_processed_file()
+        load_category_file()
+    return result
+
 
+@app.route('/api/upload', methods=['POST'])
+@ensure_working_directory
+def upload_source_file():
+    """은행 원본 엑셀 업로드 (multipart 'file' 또는 본문 + ?filename=). 저장 후 백그라운드에서 파싱해 새 거래만 반영.
+    202 + job_id → GET /api/upload/<job_id> 로 진행 조회."""
+    if upload_jobs.content_too_large(request):
+        return jsonify({'ok': False, 'error': upload_jobs.TOO_LARGE_MESSAGE}), 413
+    filename, stream = upload_jobs.request_upload(request)
+    filename = upload_jobs.safe_filename(filename)
+    if not filename:
+        return jsonify({'ok': False, 'error': '.xls 또는 .xlsx 파일명이 필요합니다.'}), 400
+    if bank_name_for_file(filename) is None:
+        return jsonify({'ok': False, 'error': f"파일명에 {', '.join(bank_names())} 중 하나가 포함되어야 합니다."}), 400
+    job = upload_jobs.start_upload('bank', filename, stream, UPLOAD_TMP_DIR, _ingest_uploaded_source)
+    if job['state'] == 'error':
+        return jsonify({'ok': False, 'error': job['error'], 'job': job}), 413 if job['too_large'] else 500
+    return jsonify({'ok': True, 'job_id': job['id'], 'job': job}), 202
+
+
+@app.route('/api/upload')
+def list_upload_jobs():
+    """은행 업로드 작업 목록."""
+    return jsonify({'jobs': upload_jobs.list_jobs('bank')})
+
+
+@app.route('/api/upload/<job_id>')
+def get_upload_job(job_id):
+    """업로드 작업 진행 상태 (state, stage, progress, result: rows/added/duplicates/total, error)."""
+    job = upload_jobs.get_job(job_id)
+    if job is None or job['kind'] != 'bank':
+        return jsonify({'ok': False, 'error': '작업을 찾을 수 없습니다.'}), 404
+    return jsonify(job)
 
 @app.route('/api/regenerate-prepost', methods=['POST'])
 @ensure_working_directory
 def regenerate_prepost():
     """bank_before·bank_after 삭제 후 source→전처리→before→카테고리분류→후처리→after 전체 재생성."""
-    try:
-        _remove_bank_before_after_and_bak()
-        _path_added = False
+    # 감시 재생성과 겹치지 않게 before/after 를 다시 만든다
+    with source_watcher.exclusive():
         try:
-            _dir_str = str(SCRIPT_DIR)
-            if _dir_str not in sys.path:
-                sys.path.insert(0, _dir_str)
-                _path_added = True
-            import process_bank_data as _pbd
-            df_before = _pbd.integrate_bank_transactions(output_file=str(Path(BANK_BEFORE_PATH)))
-            if not Path(BANK_BEFORE_PATH).exists() or Path(BANK_BEFORE_PATH).stat().st_size == 0:
-                return jsonify({'ok': False, 'error': 'bank_before 생성 후에도 없거나 비어 있습니다. .source/Bank 원본을 확인하세요.'}), 500
-            # before 메모리(df_before)로 after 생성. 파일 재읽기 생략.
-            if not _pbd.classify_and_save(input_df=df_before if df_before is not None and not df_before.empty else None):
-                err = getattr(_pbd, 'LAST_CLASSIFY_ERROR', None) or '카테고리 분류·후처리 실패'
-                return jsonify({'ok': False, 'error': str(err)}), 500
-            return jsonify({'ok': True})
+            _remove_bank_before_after_and_bak()
+            _path_added = False
+            try:
+                _dir_str = str(SCRIPT_DIR)
+                if _dir_str not in sys.path:
+                    sys.path.insert(0, _dir_str)
+                    _path_added = True
+                import process_bank_data as _pbd
+                df_before = _pbd.integrate_bank_transactions(output_file=str(Path(BANK_BEFORE_PATH)))
+                if not Path(BANK_BEFORE_PATH).exists() or Path(BANK_BEFORE_PATH).stat().st_size == 0:
+                    return jsonify({'ok': False, 'error': 'bank_before 생성 후에도 없거나 비어 있습니다. .source/Bank 원본을 확인하세요.'}), 500
+                # before 메모리(df_before)로 after 생성. 파일 재읽기 생략.
+                if not _pbd.classify_and_save(input_df=df_before if df_before is not None and not df_before.empty else None):
+                    err = getattr(_pbd, 'LAST_CLASSIFY_ERROR', None) or '카테고리 분류·후처리 실패'
+                    return jsonify({'ok': False, 'error': str(err)}), 500
+                return jsonify({'ok': True})
+            except Exception as e:
+                return jsonify({'ok': False, 'error': str(e)}), 500
+            finally:
+                if _path_added and str(SCRIPT_DIR) in sys.path:
+                    sys.path.remove(str(SCRIPT_DIR))
         except Exception as e:
             return jsonify({'ok': False, 'error': str(e)}), 500
-        finally:
-            if _path_added and str(SCRIPT_DIR) in sys.path:
-                sys.path.remove(str(SCRIPT_DIR))
-    except Exception as e:
-        return jsonify({'ok': False, 'error': str(e)}), 500
 
 
 @app.route('/api/processed-data')
@@ -458,6 +555,9 @@ def get_processed_data():
         output_path = Path(BANK_BEFORE_PATH).resolve()
         output_path.parent.mkdir(parents=True, exist_ok=True)
         bank_before_existed = output_path.exists()
+        # before 없음: 감시 스레드가 재생성 중이면 같은 원본을 다시 읽지 않고 끝나길 기다림
+        if not bank_before_existed:
+            source_watcher.wait_idle('bank')
         # 캐시 없을 때만 ensure 실행 (재생성 버튼 시 캐시 무효화 후 여기서 다시 준비)
         if _bank_before_cache is None:
             _path_added = False
@@ -786,18 +886,10 @@ def _build_source_bank_cache():
     all_data = []
     for file_path in xls_files:
         filename = file_path.name
-        bank_name = None
-        if '국민은행' in filename:
-            bank_name = '국민은행'
-        elif '신한은행' in filename:
-            bank_name = '신한은행'
-        elif '하나은행' in filename:
-            bank_name = '하나은행'
+        bank_name = bank_name_for_file(filename)
         try:
-            xls = pd.ExcelFile(file_path)
-            for sheet_name in xls.sheet_names:
+            for sheet_name, df in read_sheet_frames(file_path, header=None):
                 try:
-                    df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
                     df = df.where(pd.notna(df), None)
                     data_dict = df.to_dict('records')
                     data_dict = _json_safe(data_dict)
@@ -879,7 +971,46 @@ def category():
     """카테고리 페이지"""
     return render_template('category.html')
 
+def _build_bank_search_index():
+    """bank_before → 계정과목 매칭용 before_text 색인 (키워드 영향 미리보기용, 증분 재분류와 같은 색인). 실패 시 None."""
+    _path_added = False
+    try:
+        _dir_str = str(SCRIPT_DIR)
+        if _dir_str not in sys.path:
+            sys.path.insert(0, _dir_str)
+            _path_added = True
+        import process_bank_data as _pbd
+        return _pbd._build_before_text_index(BANK_BEFORE_PATH)
+    except Exception:
+        traceback.print_exc()
+        return None
+    finally:
+        if _path_added and str(SCRIPT_DIR) in sys.path:
+            sys.path.remove(str(SCRIPT_DIR))
+
+
+# 키워드 영향 미리보기: 은행 검색 텍스트는 분류기와 같은 before_text (색인은 첫 미리보기 요청 때 생성)
+from category_impact import register_text_source
+register_text_source('bank', BANK_BEFORE_PATH, _build_bank_search_index)
+
 # 카테고리: MyInfo/.source/category_table.json 단일 테이블(구분 없음, 은행/신용카드 공통)
+@app.route('/api/category-impact')
+def get_category_impact():
+    """후보 키워드(/ 구분)가 은행·카드·금융정보 after에서 걸리는 행 수·카테고리별 건수·예시 행. 분류 검색 텍스트 n-gram 색인 사용 (첫 요청 때 생성)."""
+    try:
+        from category_impact import default_after_paths, impact_payload
+        paths = default_after_paths(PROJECT_ROOT)
+        paths['bank'] = BANK_AFTER_PATH
+        limit = min(max(request.args.get('limit', default=5, type=int) or 5, 1), 50)
+        response = jsonify(impact_payload(request.args.get('keyword', ''), paths, limit=limit))
+        response.headers['Content-Type'] = 'application/json; charset=utf-8'
+        return response
+    except Exception as e:
+        traceback.print_exc()
+        response = jsonify({'error': str(e), 'results': {}})
+        response.headers['Content-Type'] = 'application/json; charset=utf-8'
+        return response, 500
+
 @app.route('/api/bank_category')
 @ensure_working_directory
 def get_category_table():
@@ -975,6 +1106,81 @@ def get_category_table():
         response.headers['Content-Type'] = 'application/json; charset=utf-8'
         return response, 500
 
+def _current_rule_set(path):
+    """편집 전 category_table 규칙 세트 (증분 재분류 비교용). 실패 시 None."""
+    try:
+        from category_rules import get_rule_set
+        return get_rule_set(path)
+    except Exception:
+        return None
+
+
+def _reclassify_bank_after_incremental(old_rule_set):
+    """규칙 편집 후 bank_after에서 바뀐 키워드를 포함하는 행만 재분류하고 파일·캐시 갱신.
+    Returns: 재분류 행 수. 증분 불가(bank_after 없음·후처리 변경 등)면 None → 재생성 필요."""
+    global _bank_after_cache, _bank_after_cache_mtime
+    if old_rule_set is None or not Path(BANK_AFTER_PATH).exists():
+        return None
+    _path_added = False
+    try:
+        _dir_str = str(SCRIPT_DIR)
+        if _dir_str not in sys.path:
+            sys.path.insert(0, _dir_str)
+            _path_added = True
+        import process_bank_data as _pbd
+        from category_rules import get_rule_set
+        new_rule_set = get_rule_set(CATEGORY_TABLE_PATH, ensure_prepost=True)
+        result = _pbd.reclassify_after_for_rule_edit(
+            old_rule_set, new_rule_set, input_file=BANK_BEFORE_PATH, output_file=BANK_AFTER_PATH)
+    except Exception:
+        traceback.print_exc()
+        return None
+    finally:
+        if _path_added and str(SCRIPT_DIR) in sys.path:
+            sys.path.remove(str(SCRIPT_DIR))
+    if result is None:
+        return None
+    after_df, reclassified, changed = result
+    if changed:
+        # 캐시를 갱신된 after로 교체 (load_category_file과 같은 컬럼 정리)
+        df = after_df.copy()
+        df.columns = [str(c).strip().lstrip('\ufeff') for c in df.columns]
+        if '구분' in df.columns and '취소' not in df.columns:
+            df = df.rename(columns={'구분': '취소'})
+        _bank_after_cache = df
+        try:
+            _bank_after_cache_mtime = Path(BANK_AFTER_PATH).stat().st_mtime
+        except OSError:
+            _bank_after_cache_mtime = None
+    return reclassified
+
+
+def _reclassify_bank_after_full():
+    """증분 재분류가 불가할 때: bank_before 전체를 현재 규칙으로 다시 분류해 bank_after 저장·캐시 무효화.
+    Returns: bank_after 행 수. bank_before/bank_after가 없거나 실패면 None."""
+    global _bank_after_cache, _bank_after_cache_mtime
+    if not Path(BANK_AFTER_PATH).exists() or not Path(BANK_BEFORE_PATH).exists():
+        return None
+    _path_added = False
+    try:
+        _dir_str = str(SCRIPT_DIR)
+        if _dir_str not in sys.path:
+            sys.path.insert(0, _dir_str)
+            _path_added = True
+        import process_bank_data as _pbd
+        if not _pbd.classify_and_save(input_file=BANK_BEFORE_PATH, output_file=BANK_AFTER_PATH):
+            return None
+    except Exception:
+        traceback.print_exc()
+        return None
+    finally:
+        if _path_added and str(SCRIPT_DIR) in sys.path:
+            sys.path.remove(str(SCRIPT_DIR))
+    _bank_after_cache = None
+    _bank_after_cache_mtime = None
+    return len(load_category_file())
+
+
 @app.route('/api/bank_category', methods=['POST'])
 @ensure_working_directory
 def save_category_table():
@@ -983,6 +1189,7 @@ def save_category_table():
         path = str(Path(CATEGORY_TABLE_PATH))
         data = request.json or {}
         action = data.get('action', 'add')
+        old_rule_set = _current_rule_set(path)
         success, error_msg, count = apply_category_action(path, action, data)
         if not success:
             return jsonify({'success': False, 'error': error_msg}), 400
@@ -991,10 +1198,16 @@ def save_category_table():
             sync_category_create_from_xlsx(path)
         except Exception:
             pass
+        # 바뀐 규칙 행만 재분류, 불가하면(다른 규칙 세트로 분류된 after 등) 전체 재분류. 업로드·감시 재생성과 겹치지 않게
+        with source_watcher.exclusive():
+            reclassified = _reclassify_bank_after_incremental(old_rule_set)
+            if reclassified is None:
+                reclassified = _reclassify_bank_after_full()
         response = jsonify({
             'success': True,
             'message': '카테고리 테이블이 업데이트되었습니다.',
-            'count': count
+            'count': count,
+            'reclassified': reclassified,
         })
         response.headers['Content-Type'] = 'application/json; charset=utf-8'
         return response
@@ -1906,8 +2119,10 @@ def generate_category():
                 sys.path.insert(0, _dir_str)
                 _path_added = True
             import process_bank_data as _pbd
-            _pbd.ensure_bank_before_and_category()  # bank_before, category_table 준비 (생성 시에만 카테고리 분류)
-            success = _pbd.classify_and_save()
+            # 감시 재생성과 겹치지 않게 before/after 를 다시 만든다
+            with source_watcher.exclusive():
+                _pbd.ensure_bank_before_and_category()  # bank_before, category_table 준비 (생성 시에만 카테고리 분류)
+                success = _pbd.classify_and_save()
             if not success:
                 detail = getattr(_pbd, 'LAST_CLASSIFY_ERROR', None)
         except Exception as e:
@@ -1955,6 +2170,9 @@ def help():
     """은행거래 도움말 페이지"""
     return render_template('help.html')
 
+# .source/Bank 감시 등록 (app.py 가 MYINFO_SOURCE_WATCH=1 일 때 감시 시작)
+source_watcher.register('bank', SOURCE_BANK_DIR, _rebuild_from_source_watch, outputs=(BANK_BEFORE_PATH, BANK_AFTER_PATH))
+
 if __name__ == '__main__':
     script_dir = os.path.dirname(os.path.abspath(__file__))
     os.chdir(script_dir)
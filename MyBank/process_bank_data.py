@@ -3,7 +3,7 @@
 
 전체 흐름:
   [before 생성] integrate_bank_transactions():
-    (1) source: .source/Bank 엑셀 읽기·통합
+    (1) source: .source/Bank 엑셀 읽기·통합 (은행별 형식은 bank_formats 등록부)
     (2) 전처리: category_table '전처리' 규칙으로 적요·내용·송금메모·거래점 치환 (예: 초록마을→초록증권)
     (3) before: 전처리만 반영하여 bank_before.xlsx 저장 (후처리·계정과목 미적용)
 
@@ -13,6 +13,8 @@
     (6) 후처리: category_table '후처리' 규칙으로 적요·내용·송금메모 치환
     (7) after: bank_after.xlsx 저장 (기타거래 = before_text에서 #→_)
 """
+import hashlib
+import numpy as np
 import pandas as pd
 import os
 import re
@@ -42,6 +44,24 @@ except ImportError:
     def _is_bad_zip_error(e):
         msg = str(e).lower()
         return isinstance(e, zipfile.BadZipFile) or 'not a zip file' in msg or 'bad zip' in msg
+from category_matcher import compile_account_rules
+from classification_memo import get_classification_memo
+from category_rules import get_rule_set
+from category_rewriter import compile_keyword_rules, compile_spaced_rules
+from ingest_cache import get_ingest_cache
+from bank_formats import bank_names, find_bank_format
+from row_dedup import drop_overlapping_rows
+from column_kernels import (
+    clean_amount_column,
+    map_unique,
+    nfkc_text_column,
+    safe_str as _safe_str,
+    safe_str_column,
+)
+from category_incremental import (
+    TextRowIndex, after_rules_fingerprint, changed_account_keywords, get_row_index, patch_after_rows,
+    record_after_rules, remember_row_index, rules_fingerprint,
+)
 try:
     from excel_io import safe_write_excel
 except ImportError:
@@ -202,43 +222,38 @@ def ensure_bank_before_and_category(bank_before_path=None):
     _ensure_bank_before_and_category_only(bank_before_path=bank_before_path)
 
 
+# 은행 safe_str 은 빈 '[]' 를 지우지 않음 (카드·금융정보는 '{}', '[]' 모두 제거)
+_SAFE_STR_REMOVE = ('{}',)
+
+
 def safe_str(value):
     """NaN/공백 처리, 주식회사·㈜ → (주) 통일(매칭용)."""
-    if pd.isna(value) or value is None:
-        return ""
-    val = str(value).strip()
-    if val.lower() in ['nan', 'na', 'n', 'none', '']:
-        return ""
-    val = normalize_주식회사_for_match(val)
-    val = val.replace('((', '(')
-    val = val.replace('))', ')')
-    val = val.replace('__', '_')
-    val = val.replace('{}', '')
-    if val.count('(') != val.count(')'):
-        if val.count('(') > val.count(')'):
-            val = val.replace('(', '')
-        elif val.count(')') > val.count('('):
-            val = val.replace(')', '')
-    return val
+    return _safe_str(value, remove=_SAFE_STR_REMOVE)
+
+
+def safe_str_series(series):
+    """safe_str 컬럼 버전. 고유값에만 pandas 문자열 연산 적용 (값은 safe_str과 동일)."""
+    return safe_str_column(series, remove=_SAFE_STR_REMOVE)
+
+
+def _str_column(df, col):
+    """df[col]을 safe_str_series로 변환. 컬럼이 없으면 빈 문자열 컬럼."""
+    if col in df.columns:
+        return safe_str_series(df[col])
+    return pd.Series('', index=df.index, dtype=object)
+
+
+def _join_nonempty(columns, sep):
+    """문자열 컬럼들을 행별로 비어 있지 않은 값만 sep으로 연결."""
+    arrays = [c.to_numpy(dtype=object) for c in columns]
+    return [sep.join([p for p in parts if p]) for parts in zip(*arrays)]
+
 
 def normalize_text(text):
     if not text:
         return ""
     return str(text).strip()
 
-def clean_amount(value):
-    if pd.isna(value) or value == '' or value == 0:
-        return 0
-    if isinstance(value, (int, float)):
-        return float(value)
-    value_str = str(value).replace(',', '').strip()
-    if value_str == '' or value_str == '-':
-        return 0
-    try:
-        return float(value_str)
-    except (ValueError, TypeError):
-        return 0
-
 if safe_write_excel is None:
     def safe_write_excel(df, filepath, max_retries=3):
         for attempt in range(max_retries):
@@ -265,346 +280,136 @@ if safe_write_excel is None:
 
 LAST_INTEGRATE_ERROR = None
 LAST_CLASSIFY_ERROR = None
-
-def _excel_engine(path):
-    """파일 확장자에 맞는 엔진 반환. .xls → xlrd, .xlsx → openpyxl"""
-    suf = (path.suffix if hasattr(path, 'suffix') else os.path.splitext(str(path))[1]).lower()
-    return 'xlrd' if suf == '.xls' else 'openpyxl'
-
-def read_kb_file_excel(file_path):
-    """국민은행 Excel(.xlsx) 파일 읽기. 시트별로 경로만 넘겨 read_excel 호출해 매번 열고 닫아 I/O closed file 방지."""
-    path = Path(file_path)
-    engine = _excel_engine(path)
-    all_data = []
-    with pd.ExcelFile(file_path, engine=engine) as xls:
-        sheet_names = list(xls.sheet_names)
-    for sheet_name in sheet_names:
-        df_raw = pd.read_excel(file_path, sheet_name=sheet_name, header=None, engine=engine)
-        header_row = None
-        for idx in range(min(15, len(df_raw))):
-            cell = df_raw.iloc[idx, 0]
-            if pd.notna(cell) and ('거래일시' in str(cell) or '거래일자' in str(cell)):
-                header_row = idx
-                break
-        if header_row is None:
-            continue
-        df = pd.read_excel(file_path, sheet_name=sheet_name, header=header_row, engine=engine)
-        date_col = None
-        for c in df.columns:
-            s = str(c)
-            if '거래일시' in s or '거래일자' in s:
-                date_col = c
-                break
-        if date_col is None:
-            continue
-        df = df[df[date_col].notna()].copy()
-        df = df[df[date_col].astype(str).str.strip() != ''].copy()
-        df = df[df[date_col].astype(str) != '합계'].copy()
-
-        account_number = None
-        df_info = pd.read_excel(file_path, sheet_name=sheet_name, header=None, nrows=10, engine=engine)
-        for idx in range(len(df_info)):
-            for col in df_info.columns:
-                value = str(df_info.iloc[idx, col])
-                if '계좌번호' in value or '285102' in value:
-                    m = re.search(r'(\d{6}-\d{2}-\d{6})', value)
-                    if m:
-                        account_number = m.group(1)
-                    break
-            if account_number:
-                break
-        if not account_number:
-            m = re.search(r'(\d{6}-\d{2}-\d{6})', str(file_path))
-            if m:
-                account_number = m.group(1)
-
-        bank_name = '국민은행'
-        if '거래일시' in str(date_col):
-            df['거래일'] = df[date_col].astype(str).str.split(' ').str[0]
-            df['거래시간'] = df[date_col].astype(str).str.split(' ').str[1]
-            df['거래시간'] = df['거래시간'].fillna('')
-        else:
-            df['거래일'] = df[date_col].astype(str)
-            df['거래시간'] = ''
-
-        result_df = pd.DataFrame()
-        result_df['거래일'] = df['거래일']
-        result_df['거래시간'] = df['거래시간']
-        result_df['적요'] = df['적요'] if '적요' in df.columns else ''
-        result_df['출금액'] = df['출금액'] if '출금액' in df.columns else 0
-        result_df['입금액'] = df['입금액'] if '입금액' in df.columns else 0
-        result_df['잔액'] = df['잔액'] if '잔액' in df.columns else 0
-        result_df['거래점'] = df['거래점'] if '거래점' in df.columns else ''
-        result_df['취소'] = df['구분'] if '구분' in df.columns else (df['취소'] if '취소' in df.columns else '')
-        content_col = None
-        for c in df.columns:
-            if '보낸분' in str(c) or '받는분' in str(c) or '내용' in str(c):
-                content_col = c
-                break
-        result_df['내용'] = df[content_col].fillna('') if content_col else ''
-        result_df['송금메모'] = df['송금메모'].fillna('') if '송금메모' in df.columns else ''
-        result_df['메모'] = df['메모'].fillna('') if '메모' in df.columns else ''
-        result_df['은행명'] = bank_name
-        result_df['계좌번호'] = account_number
-        result_df = result_df[result_df['거래일'].notna()].copy()
-        result_df = result_df[result_df['거래일'].astype(str).str.strip() != ''].copy()
-        all_data.append(result_df)
-
-    if all_data:
-        return pd.concat(all_data, ignore_index=True)
-    return None
-
-def read_sh_file(file_path):
-    """신한은행 파일 읽기 (.xls, .xlsx). 시트별로 경로만 넘겨 read_excel 호출해 I/O closed file 방지."""
-    path = Path(file_path)
-    engine = _excel_engine(path)
-    all_data = []
-    with pd.ExcelFile(file_path, engine=engine) as xls:
-        sheet_names = list(xls.sheet_names)
-    for sheet_name in sheet_names:
-        df_raw = pd.read_excel(file_path, sheet_name=sheet_name, header=None, engine=engine)
-        header_row = None
-        for idx in range(min(15, len(df_raw))):
-            if pd.notna(df_raw.iloc[idx, 0]) and '거래일자' in str(df_raw.iloc[idx, 0]):
-                header_row = idx
-                break
-
-        if header_row is None:
-            continue
-
-        df = pd.read_excel(file_path, sheet_name=sheet_name, header=header_row, engine=engine)
-        df = df[df['거래일자'].notna()].copy()
-        df = df[df['거래일자'] != ''].copy()
-
-        account_number = None
-        df_info = pd.read_excel(file_path, sheet_name=sheet_name, header=None, nrows=5, engine=engine)
-        for idx in range(len(df_info)):
-            for col in df_info.columns:
-                value = str(df_info.iloc[idx, col])
-                if '계좌번호' in value or '110-478' in value:
-                    match = re.search(r'(\d{3}-\d{3}-\d{6})', value)
-                    if match:
-                        account_number = match.group(1)
-                    break
-            if account_number:
-                break
-
-        if not account_number:
-            match = re.search(r'(\d{3}-\d{3}-\d{6})', str(file_path))
-            if match:
-                account_number = match.group(1)
-
-        bank_name = '신한은행'
-
-        result_df = pd.DataFrame(index=df.index)
-        result_df['거래일'] = df['거래일자'] if '거래일자' in df.columns else ''
-        result_df['거래시간'] = df['거래시간'].fillna('') if '거래시간' in df.columns else ''
-        result_df['적요'] = df['적요'] if '적요' in df.columns else ''
-        result_df['출금액'] = df['출금(원)'] if '출금(원)' in df.columns else (df['출금액'] if '출금액' in df.columns else 0)
-        result_df['입금액'] = df['입금(원)'] if '입금(원)' in df.columns else (df['입금액'] if '입금액' in df.columns else 0)
-        result_df['잔액'] = df['잔액(원)'] if '잔액(원)' in df.columns else (df['잔액'] if '잔액' in df.columns else 0)
-        result_df['거래점'] = df['거래점'] if '거래점' in df.columns else ''
-        result_df['취소'] = ''
-
-        if '내용' in df.columns:
-            result_df['내용'] = df['내용'].fillna('')
-        else:
-            content_found = False
-            for col in df.columns:
-                col_str = str(col).lower()
-                if any(keyword in col_str for keyword in ['내용', '거래처', '상대방', '받는분', '보낸분', '거래상대방']):
-                    result_df['내용'] = df[col].fillna('')
-                    content_found = True
-                    break
-
-            if not content_found and len(df.columns) > 5:
-                result_df['내용'] = df[df.columns[5]].fillna('')
-            elif not content_found and len(df.columns) > 4:
-                result_df['내용'] = df[df.columns[4]].fillna('')
-            else:
-                result_df['내용'] = ''
-
-        result_df['송금메모'] = ''
-        result_df['메모'] = df['메모'].fillna('') if '메모' in df.columns else ''
-        result_df['은행명'] = bank_name
-        result_df['계좌번호'] = account_number
-
-        result_df = result_df[result_df['거래일'].notna()].copy()
-        result_df = result_df[result_df['거래일'] != ''].copy()
-
-        all_data.append(result_df)
-
-    if all_data:
-        return pd.concat(all_data, ignore_index=True)
-    return None
-
-def read_hana_file(file_path):
-    """하나은행 파일 읽기 (.xls, .xlsx). 시트별로 경로만 넘겨 read_excel 호출해 I/O closed file 방지."""
-    path = Path(file_path)
-    engine = _excel_engine(path)
-    all_data = []
-    with pd.ExcelFile(file_path, engine=engine) as xls:
-        sheet_names = list(xls.sheet_names)
-    for sheet_name in sheet_names:
-        df_raw = pd.read_excel(file_path, sheet_name=sheet_name, header=None, engine=engine)
-        header_row = None
-        for idx in range(min(15, len(df_raw))):
-            if pd.notna(df_raw.iloc[idx, 0]) and ('거래일시' in str(df_raw.iloc[idx, 0]) or '거래일' in str(df_raw.iloc[idx, 0])):
-                header_row = idx
-                break
-
-        if header_row is None:
-            continue
-
-        df = pd.read_excel(file_path, sheet_name=sheet_name, header=header_row, engine=engine)
-        df = df[df['거래일시'].notna()].copy()
-
-        account_number = None
-        df_info = pd.read_excel(file_path, sheet_name=sheet_name, header=None, nrows=5, engine=engine)
-        for idx in range(len(df_info)):
-            for col in df_info.columns:
-                value = str(df_info.iloc[idx, col])
-                if '계좌번호' in value or '433-910' in value:
-                    match = re.search(r'(\d{3}-\d{6}-\d{5})', value)
-                    if match:
-                        account_number = match.group(1)
-                    break
-            if account_number:
-                break
-
-        if not account_number:
-            match = re.search(r'(\d{3}-\d{6}-\d{5})', str(file_path))
-            if match:
-                account_number = match.group(1)
-
-        bank_name = '하나은행'
-
-        df['거래일'] = df['거래일시'].astype(str).str.split(' ').str[0]
-        df['거래시간'] = df['거래일시'].astype(str).str.split(' ').str[1]
-        df['거래시간'] = df['거래시간'].fillna('')
-
-        df = df[df['거래일'].notna()].copy()
-        df = df[df['거래일'] != ''].copy()
-
-        result_df = pd.DataFrame()
-        result_df['거래일'] = df['거래일']
-        result_df['거래시간'] = df['거래시간']
-        result_df['적요'] = df['적요'] if '적요' in df.columns else ''
-        result_df['출금액'] = df['출금액'] if '출금액' in df.columns else 0
-        result_df['입금액'] = df['입금액'] if '입금액' in df.columns else 0
-        result_df['잔액'] = df['잔액'] if '잔액' in df.columns else 0
-        result_df['거래점'] = df['거래점'] if '거래점' in df.columns else ''
-        result_df['취소'] = ''
-        result_df['내용'] = df['내용'].fillna('') if '내용' in df.columns else ''
-        result_df['송금메모'] = ''
-        result_df['메모'] = ''
-        result_df['은행명'] = bank_name
-        result_df['계좌번호'] = account_number
-
-        all_data.append(result_df)
-
-    if all_data:
-        return pd.concat(all_data, ignore_index=True)
-    return None
+# 마지막 integrate_bank_transactions 의 파일별 파싱 시간(초) {파일명: 초} (캐시 사용 파일 제외)
+LAST_INTEGRATE_PARSE_TIMES = {}
+# 마지막 integrate_bank_transactions 에서 앞선 파일과 겹쳐 제거한 행 수 {파일명: 건수}
+LAST_INTEGRATE_DUPLICATES = {}
+# 겹치는 내보내기 중복 판단 키 (잔액까지 같아야 같은 거래)
+DEDUP_KEY_COLUMNS = ['거래일', '거래시간', '은행명', '계좌번호', '입금액', '출금액', '잔액', '적요', '내용']
 
 def _bank_excel_files(source_dir):
-    """국민/신한/하나 포함 .xls·.xlsx 목록."""
+    """bank_formats 에 등록된 은행명이 파일명에 들어간 .xls·.xlsx 목록."""
     out = []
     if not source_dir.exists():
         return out
     for ext in ('*.xls', '*.xlsx'):
         for p in source_dir.glob(ext):
-            n = p.name
-            if '국민은행' in n or '신한은행' in n or '하나은행' in n:
+            if find_bank_format(p.name) is not None:
                 out.append(p)
     return sorted(set(out), key=lambda p: (p.name, str(p)))
 
-def integrate_bank_transactions(output_file=None):
-    """(1) source 읽기 (2) 전처리 (3) before 저장. 후처리·계정과목은 하지 않음."""
-    if output_file is None:
-        output_file = INPUT_FILE
-    output_file = str(Path(output_file).resolve())
-    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-
-    source_dir = Path(os.path.abspath(SOURCE_BANK_DIR)) if SOURCE_BANK_DIR else Path('.source', 'Bank').resolve()
-    if not source_dir.exists():
+def _read_bank_file(file_path):
+    """은행 원본 파일 1개 읽기 (프로세스 풀 작업 단위).
+    Returns: (파일명, DataFrame 또는 None, 오류 문자열 또는 None, 파싱 시간(초))."""
+    file_path = Path(file_path)
+    name = file_path.name
+    t0 = time.perf_counter()
+    try:
+        fmt = find_bank_format(name)
+        if fmt is None:
+            return name, None, None, time.perf_counter() - t0
+        if not fmt.supports(file_path):
+            return name, None, None, 0.0  # 형식에 없는 확장자 (국민은행 .xls 등)
+        df = fmt.read(file_path)
+        return name, df, None, time.perf_counter() - t0
+    except Exception as e:
+        err_str = str(e).strip()
+        if 'xlrd' in err_str or 'No module' in err_str:
+            err_str = err_str + ' ( .xls 파일은 pip install xlrd 필요 )'
+        _safe_print(f"오류: {name} 처리 실패 - {e}", flush=True)
         try:
-            source_dir.mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            _safe_print(f"오류: .source/Bank 폴더 생성 실패 - {source_dir}: {e}", flush=True)
-    global LAST_INTEGRATE_ERROR
-    LAST_INTEGRATE_ERROR = None
-    all_data = []
-    read_errors = []
-    bank_files = _bank_excel_files(source_dir)
-    all_xls_xlsx = list(source_dir.glob('*.xls')) + list(source_dir.glob('*.xlsx')) if source_dir.exists() else []
-    if not bank_files:
-        if all_xls_xlsx:
-            LAST_INTEGRATE_ERROR = (
-                '파일명에 국민은행, 신한은행, 하나은행 중 하나가 포함되어야 합니다. '
-                f'(현재 .source/Bank에 .xls/.xlsx {len(all_xls_xlsx)}개 있으나 해당하는 파일 없음)'
-            )
-        _safe_print(f"경고: 은행 파일 없음 - {source_dir}", flush=True)
+            import traceback
+            traceback.print_exc()
+        except (ValueError, OSError):
+            pass
+        return name, None, err_str, time.perf_counter() - t0
 
-    for file_path in bank_files:
-        name = file_path.name
-        suf = file_path.suffix.lower()
-        try:
-            if '국민은행' in name:
-                if suf == '.xlsx':
-                    df = read_kb_file_excel(file_path)
-                else:
-                    continue  # 국민은행 .xls 미지원, .xlsx만 사용
-            elif '신한은행' in name:
-                df = read_sh_file(file_path)
-            elif '하나은행' in name:
-                df = read_hana_file(file_path)
-            else:
-                df = None
-            if df is not None and len(df) > 0:
-                all_data.append(df)
-        except Exception as e:
-            err_str = str(e).strip()
-            if 'xlrd' in err_str or 'No module' in err_str:
-                err_str = err_str + ' ( .xls 파일은 pip install xlrd 필요 )'
-            read_errors.append(f"{name}: {err_str}")
-            _safe_print(f"오류: {name} 처리 실패 - {e}", flush=True)
-            try:
-                import traceback
-                traceback.print_exc()
-            except (ValueError, OSError):
-                pass
-    if bank_files and not all_data and read_errors:
-        LAST_INTEGRATE_ERROR = ' | '.join(read_errors[:5])
-        if len(read_errors) > 5:
-            LAST_INTEGRATE_ERROR += f' ... 외 {len(read_errors)-5}건'
-    elif bank_files and not all_data:
-        # 예외 없이 스킵됐거나 빈 DataFrame 반환된 경우 (파일명·형식·시트 구조 등)
-        LAST_INTEGRATE_ERROR = (
-            '파일명에 국민은행/신한은행/하나은행이 포함되어야 합니다. '
-            '국민은행은 .xlsx만 지원(.xls 미지원). '
-            '또는 파일을 읽었지만 데이터 행이 없거나 시트 구조가 맞지 않습니다.'
-        )
-        _safe_print("경고: 통합 데이터 없음.", flush=True)
 
-    if not all_data:
-        combined_df = pd.DataFrame(columns=['거래일', '거래시간', '은행명', '계좌번호', '입금액', '출금액', '잔액',
-                                           '취소', '적요', '내용', '송금메모', '거래점'])
-        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-        try:
-            from data_json_io import safe_write_data_json
-            safe_write_data_json(output_file, combined_df)
-        except ImportError:
-            combined_df.to_excel(output_file, index=False, engine='openpyxl')
-        return combined_df
+def _ingest_workers(workers=None):
+    """원본 파일 병렬 읽기 프로세스 수. 인자 > MYINFO_INGEST_WORKERS 환경변수 > 1. 0 또는 'auto'는 CPU 수."""
+    if workers is None:
+        workers = os.environ.get('MYINFO_INGEST_WORKERS', '1').strip() or '1'
+    if str(workers).lower() == 'auto':
+        workers = 0
+    try:
+        workers = int(workers)
+    except (TypeError, ValueError):
+        workers = 1
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def _read_bank_files(bank_files, workers=None):
+    """은행 원본 파일들을 읽어 파일 순서대로 [(파일명, DataFrame, 오류, 파싱 시간)] 반환.
+    workers > 1이고 파일이 2개 이상이면 프로세스 풀로 병렬 파싱(결과 순서는 파일 순서 유지).
+    풀 생성·통신 실패 시 남은 파일은 순차로 읽음."""
+    workers = min(_ingest_workers(workers), len(bank_files))
+    if workers <= 1:
+        return [_read_bank_file(p) for p in bank_files]
+    results = []
+    try:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for res in pool.map(_read_bank_file, [str(p) for p in bank_files]):
+                results.append(res)
+        return results
+    except Exception as e:
+        _safe_print(f"경고: 병렬 읽기 실패, 순차 읽기로 전환 - {e}", flush=True)
+    return results + [_read_bank_file(p) for p in bank_files[len(results):]]
 
-    combined_df = pd.concat(all_data, ignore_index=True)
 
-    # 금액 데이터 정리
-    combined_df['출금액'] = combined_df['출금액'].apply(clean_amount)
-    combined_df['입금액'] = combined_df['입금액'].apply(clean_amount)
-    combined_df['잔액'] = combined_df['잔액'].apply(clean_amount)
+def _ingest_cache_version():
+    """파일별 읽기 캐시 버전: 이 모듈·bank_formats·column_kernels·excel_backend 소스 해시 + 엑셀 엔진 설정
+    (읽기 코드·형식·열 정규화·엔진이 바뀌면 캐시 전체 무효)."""
+    import bank_formats
+    import column_kernels
+    import excel_backend
+    h = hashlib.sha1()
+    try:
+        for path in (os.path.abspath(__file__), bank_formats.__file__, column_kernels.__file__, excel_backend.__file__):
+            with open(path, 'rb') as f:
+                h.update(f.read())
+    except OSError:
+        return None
+    h.update(excel_backend.engine_preference().encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def _read_bank_files_cached(bank_files, workers=None):
+    """_read_bank_files 와 같은 결과. 이전 실행과 같은 파일(크기·mtime 또는 내용 해시)은 캐시된 DataFrame 사용,
+    새 파일·바뀐 파일만 읽는다. 캐시 사용 파일의 파싱 시간은 None."""
+    version = _ingest_cache_version()
+    cache = get_ingest_cache('bank', version, _PROJECT_ROOT) if version else None
+    if cache is None:
+        return _read_bank_files(bank_files, workers=workers)
+    results = {}
+    to_read, stamps = [], []
+    for file_path in bank_files:
+        hit, df, stamp = cache.lookup(file_path)
+        if hit:
+            results[file_path] = (file_path.name, df, None, None)
+        else:
+            to_read.append(file_path)
+            stamps.append(stamp)
+    for file_path, stamp, res in zip(to_read, stamps, _read_bank_files(to_read, workers=workers)):
+        results[file_path] = res
+        if not res[2]:
+            cache.store(file_path, stamp, res[1])
+    cache.save(bank_files)
+    return [results[p] for p in bank_files]
+
+
+def _clean_bank_amounts(df):
+    """출금액·입금액·잔액 금액 정리 (숫자)."""
+    for col in ('출금액', '입금액', '잔액'):
+        df[col] = clean_amount_column(df[col])
+    return df
+
 
+def _prepare_bank_before_rows(combined_df):
+    """읽은 원본 행(금액 정리 후) → bank_before 행: 정렬, 거래일 없는 행 제거, 전각→반각, 취소 통일, 전처리, 컬럼 순서.
+    통합(integrate_bank_transactions)과 업로드 증분 반영(ingest_bank_file) 공용."""
     # 정렬
     combined_df['거래일_정렬용'] = pd.to_datetime(combined_df['거래일'], errors='coerce')
     combined_df = combined_df.sort_values(['거래일_정렬용', '거래시간', '은행명', '계좌번호'], na_position='last')
@@ -620,9 +425,7 @@ def integrate_bank_transactions(output_file=None):
     # 적요/내용/송금메모/거래점: 전각→반각 변환
     for col in ['적요', '내용', '송금메모', '거래점']:
         if col in combined_df.columns:
-            combined_df[col] = combined_df[col].fillna('').astype(str).apply(
-                lambda s: unicodedata.normalize('NFKC', s) if s else ''
-            )
+            combined_df[col] = nfkc_text_column(combined_df[col])
 
     # 적요의 "-"를 공백으로 변경
     if '적요' in combined_df.columns:
@@ -665,6 +468,81 @@ def integrate_bank_transactions(output_file=None):
         if col not in existing_columns:
             existing_columns.append(col)
     combined_df = combined_df[existing_columns]
+    return combined_df
+
+
+def integrate_bank_transactions(output_file=None, workers=None):
+    """(1) source 읽기 (2) 전처리 (3) before 저장. 후처리·계정과목은 하지 않음.
+    workers: 원본 파일 병렬 읽기 프로세스 수 (생략 시 MYINFO_INGEST_WORKERS, 기본 1=순차)."""
+    if output_file is None:
+        output_file = INPUT_FILE
+    output_file = str(Path(output_file).resolve())
+    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+
+    source_dir = Path(os.path.abspath(SOURCE_BANK_DIR)) if SOURCE_BANK_DIR else Path('.source', 'Bank').resolve()
+    if not source_dir.exists():
+        try:
+            source_dir.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            _safe_print(f"오류: .source/Bank 폴더 생성 실패 - {source_dir}: {e}", flush=True)
+    global LAST_INTEGRATE_ERROR, LAST_INTEGRATE_PARSE_TIMES, LAST_INTEGRATE_DUPLICATES
+    LAST_INTEGRATE_ERROR = None
+    LAST_INTEGRATE_PARSE_TIMES = {}
+    LAST_INTEGRATE_DUPLICATES = {}
+    all_data = []
+    sources = []
+    read_errors = []
+    bank_files = _bank_excel_files(source_dir)
+    all_xls_xlsx = list(source_dir.glob('*.xls')) + list(source_dir.glob('*.xlsx')) if source_dir.exists() else []
+    if not bank_files:
+        if all_xls_xlsx:
+            LAST_INTEGRATE_ERROR = (
+                f"파일명에 {', '.join(bank_names())} 중 하나가 포함되어야 합니다. "
+                f'(현재 .source/Bank에 .xls/.xlsx {len(all_xls_xlsx)}개 있으나 해당하는 파일 없음)'
+            )
+        _safe_print(f"경고: 은행 파일 없음 - {source_dir}", flush=True)
+
+    for name, df, err, seconds in _read_bank_files_cached(bank_files, workers=workers):
+        if seconds is not None:
+            LAST_INTEGRATE_PARSE_TIMES[name] = round(seconds, 3)
+        if err:
+            read_errors.append(f"{name}: {err}")
+        elif df is not None and len(df) > 0:
+            all_data.append(df)
+            sources.append(name)
+    if bank_files and not all_data and read_errors:
+        LAST_INTEGRATE_ERROR = ' | '.join(read_errors[:5])
+        if len(read_errors) > 5:
+            LAST_INTEGRATE_ERROR += f' ... 외 {len(read_errors)-5}건'
+    elif bank_files and not all_data:
+        # 예외 없이 스킵됐거나 빈 DataFrame 반환된 경우 (파일명·형식·시트 구조 등)
+        LAST_INTEGRATE_ERROR = (
+            f"파일명에 {'/'.join(bank_names())}이 포함되어야 합니다. "
+            '국민은행은 .xlsx만 지원(.xls 미지원). '
+            '또는 파일을 읽었지만 데이터 행이 없거나 시트 구조가 맞지 않습니다.'
+        )
+        _safe_print("경고: 통합 데이터 없음.", flush=True)
+
+    if not all_data:
+        combined_df = pd.DataFrame(columns=['거래일', '거래시간', '은행명', '계좌번호', '입금액', '출금액', '잔액',
+                                           '취소', '적요', '내용', '송금메모', '거래점'])
+        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        try:
+            from data_json_io import safe_write_data_json
+            safe_write_data_json(output_file, combined_df)
+        except ImportError:
+            combined_df.to_excel(output_file, index=False, engine='openpyxl')
+        return combined_df
+
+    combined_df = _clean_bank_amounts(pd.concat(all_data, ignore_index=True))
+
+    # 겹치는 원본(기간 중복·다시 받은 파일) 중복 행 제거: 파일 읽은 순서 기준, 앞선 파일 행 유지
+    row_sources = np.repeat(np.array(sources, dtype=object), [len(d) for d in all_data])
+    combined_df, LAST_INTEGRATE_DUPLICATES = drop_overlapping_rows(combined_df, DEDUP_KEY_COLUMNS, row_sources)
+    for name, count in LAST_INTEGRATE_DUPLICATES.items():
+        _safe_print(f"중복 제거: {name} {count}건 (앞선 원본 파일과 겹침)", flush=True)
+
+    combined_df = _prepare_bank_before_rows(combined_df)
 
     # before 저장: 전처리만 반영. 후처리·계정과목 분류는 하지 않음 (bank_after는 전처리후 다시 실행에서 생성).
     try:
@@ -675,6 +553,79 @@ def integrate_bank_transactions(output_file=None):
     return combined_df
 
 
+def _write_bank_data(path, df):
+    try:
+        from data_json_io import safe_write_data_json
+        safe_write_data_json(path, df)
+    except ImportError:
+        df.to_excel(path, index=False, engine='openpyxl')
+
+
+def ingest_bank_file(file_path, before_file=None, after_file=None, progress=None):
+    """원본 파일 1개(업로드)를 bank_before·bank_after 에 증분 반영. 새 행만 전처리·계정과목 분류한다.
+    before 에 이미 있는 거래(DEDUP_KEY_COLUMNS 기준, 파일 안 같은 거래 횟수만큼)는 버리고, 남은 행을 before 정렬 순서에 끼워 넣는다.
+    bank_after 는 before 와 행 수가 같으면(행 순서 동일) 새 행 분류 결과만 같은 자리에 넣고, 아니면 합친 before 전체를 분류.
+    progress: progress(단계, 퍼센트) 콜백 (생략 가능).
+    Returns: {'rows': 읽은 행, 'added': 추가 행, 'duplicates': 겹쳐 버린 행, 'total': before 전체 행}. 실패 시 ValueError."""
+    report = progress or (lambda stage, percent: None)
+    before_file = str(Path(before_file or INPUT_FILE).resolve())
+    after_file = str(Path(after_file or OUTPUT_FILE).resolve())
+
+    report('parse', 10)
+    name, new_df, err, _seconds = _read_bank_file(file_path)
+    if err:
+        raise ValueError(f"{name}: {err}")
+    if new_df is None or new_df.empty:
+        raise ValueError(
+            f"{name}: 거래 내역을 읽지 못했습니다. 파일명에 {'/'.join(bank_names())} 중 하나가 포함되어야 하고, "
+            '국민은행은 .xlsx만 지원합니다.'
+        )
+    rows = len(new_df)
+    new_df = _prepare_bank_before_rows(_clean_bank_amounts(new_df))
+
+    report('merge', 40)
+    before_df = _safe_read_data_file(before_file, default_empty=True)
+    if before_df is None:
+        before_df = pd.DataFrame()
+    sources = np.array(['bank_before'] * len(before_df) + [name] * len(new_df), dtype=object)
+    merged = pd.concat([before_df, new_df], ignore_index=True)
+    merged, dropped = drop_overlapping_rows(merged, DEDUP_KEY_COLUMNS, sources)
+    duplicates = dropped.get(name, 0)
+    added = len(new_df) - duplicates
+    result = {'rows': rows, 'added': added, 'duplicates': duplicates, 'total': len(before_df) + added}
+    if added == 0:
+        report('done', 100)
+        return result
+    new_rows = merged.iloc[len(before_df):]
+
+    report('classify', 60)
+    fingerprint = rules_fingerprint(CATEGORY_TABLE_FILE)
+    after_df = _safe_read_data_file(after_file, default_empty=True) if os.path.exists(after_file) else None
+    aligned = after_df is not None and not after_df.empty and len(after_df) == len(before_df)
+    # 기존 after 행을 분류한 규칙 세트가 지금과 다르면 합친 after 의 규칙 지문은 남기지 않음
+    after_fingerprint = after_rules_fingerprint(after_file) if aligned else fingerprint
+    new_after = classify_bank_frame((new_rows if aligned else merged).reset_index(drop=True))
+    if new_after is None:
+        raise ValueError(LAST_CLASSIFY_ERROR or 'bank_after 분류 실패')
+
+    # 통합과 같은 기준으로 정렬 (같은 키는 기존 before 행 먼저). bank_after 도 같은 순서로 재배열
+    merged['거래일_정렬용'] = pd.to_datetime(merged['거래일'], errors='coerce')
+    merged = merged.reset_index(drop=True).sort_values(['거래일_정렬용', '거래시간', '은행명', '계좌번호'], na_position='last')
+    order = merged.index.to_numpy()
+    merged = merged.drop(columns=['거래일_정렬용']).reset_index(drop=True)
+    if aligned:
+        after_merged = pd.concat([after_df, new_after], ignore_index=True).iloc[order].reset_index(drop=True)
+    else:
+        after_merged = new_after.iloc[order].reset_index(drop=True)
+
+    report('save', 90)
+    _write_bank_data(before_file, merged)
+    _write_bank_data(after_file, after_merged)
+    record_after_rules(after_file, fingerprint if after_fingerprint == fingerprint else None)
+    report('done', 100)
+    return result
+
+
 def create_category_table(df):
     """bank_before 데이터를 기반으로 category_table.json 생성(구분 없음). 전처리·후처리·계정과목만 사용."""
     load_rules = get_default_rules
@@ -750,152 +701,106 @@ def _bank_row_search_text(row):
     return text
 
 
-def apply_category_from_bank(df, category_df):
-    """계정과목 규칙 적용: before_text만 사용해 키워드 매칭. 매칭되면 해당 계정과목으로 덮어씀."""
-    if df is None or df.empty or category_df is None or category_df.empty:
-        return df
-    need_cols = ['분류', '키워드', '카테고리']
+def build_account_rules(category_df):
+    """계정과목 행 → 정렬된 규칙 ((카테고리, (키워드, ...)), ...). 최대 키워드 길이 내림차순. 계정과목 행이 없으면 None."""
+    if category_df is None or category_df.empty:
+        return None
     category_df = category_df.copy()
     category_df.columns = [str(c).strip() for c in category_df.columns]
-    if not all(c in category_df.columns for c in need_cols):
-        return df
+    if not all(c in category_df.columns for c in ['분류', '키워드', '카테고리']):
+        return None
     # 계정과목만 사용
     account_df = category_df[category_df['분류'].astype(str).str.strip() == '계정과목'].copy()
     if account_df.empty:
-        return df
-    if '카테고리' not in df.columns:
-        df = df.copy()
-        df['카테고리'] = ''
-    if '키워드' not in df.columns:
-        df['키워드'] = ''
-    df = df.copy()
-    df['카테고리'] = df['카테고리'].astype(object)
-    df['키워드'] = df['키워드'].astype(object)
-    if 'before_text' not in df.columns:
-        return df
-    search_series = df['before_text'].fillna('').astype(str)
-
-    # 1단계: 먼저 전체를 '기타거래'로 할당
-    df['카테고리'] = '기타거래'
-
-    # 2단계: 행별 최대 키워드 길이 기준 정렬(긴 것 먼저). 매칭된 키워드가 더 긴 경우에만 덮어씀.
-    account_df = account_df.copy()
+        return None
 
+    # 행별 최대 키워드 길이 기준 정렬(긴 것 먼저). 매칭된 키워드가 더 긴 경우에만 덮어씀.
     def _max_kw_len(s):
         parts = [k.strip() for k in str(s).split('/') if k.strip()]
         return max(len(k) for k in parts) if parts else 0
     account_df['_max_klen'] = account_df['키워드'].apply(_max_kw_len)
     account_df = account_df.sort_values('_max_klen', ascending=False).drop(columns=['_max_klen'], errors='ignore')
 
-    df['_matched_kw_len'] = 0
+    rules = []
     for _, cat_row in account_df.iterrows():
         cat_val = safe_str(cat_row.get('카테고리', '')).strip() or '기타거래'
         keywords_str = safe_str(cat_row.get('키워드', ''))
         if not keywords_str:
             continue
         keywords = [re.sub(r'\s+', ' ', k.strip()) for k in keywords_str.split('/') if k.strip()]
-        if not keywords:
-            continue
-        rule_match = pd.Series(False, index=df.index)
-        for kw in keywords:
-            if kw:
-                rule_match |= search_series.str.contains(re.escape(kw), regex=False, na=False)
-        # 행별로 매칭된 키워드 중 가장 긴 것
-        def longest_matched(text):
-            t = str(text)
-            matched = [k for k in keywords if k and k in t]
-            return max(matched, key=len) if matched else ''
-        matched_kw = search_series.apply(longest_matched)
-        matched_len = matched_kw.str.len()
-        fill_mask = rule_match & (
-            (df['카테고리'].fillna('').astype(str) == '기타거래') | (matched_len > df['_matched_kw_len'])
-        )
-        if fill_mask.any():
-            df.loc[fill_mask, '카테고리'] = cat_val
-            df.loc[fill_mask, '키워드'] = matched_kw.loc[fill_mask]
-            df.loc[fill_mask, '_matched_kw_len'] = matched_len.loc[fill_mask]
-    df = df.drop(columns=['_matched_kw_len'], errors='ignore')
-    return df
-
+        if keywords:
+            rules.append((cat_val, tuple(keywords)))
+    return tuple(rules)
 
-def create_before_text(row):
-    """before_text 생성. 계정과목 매칭용. 취소 + 적요·내용·송금메모·거래점(전처리 반영), 구분자 #."""
-    bank_name = safe_str(row.get("은행명", ""))
-    parts = []
-    취소 = safe_str(row.get("취소", "")).strip()
-    if 취소:
-        parts.append(취소)
 
-    적요 = safe_str(row.get("적요", ""))
-    if not 적요 and bank_name:
-        적요 = bank_name
-    parts.append(적요)
-
-    내용 = safe_str(row.get("내용", ""))
-    if not 내용 and bank_name:
-        내용 = bank_name
-    parts.append(내용)
-
-    parts.append(safe_str(row.get("송금메모", "")))
-    parts.append(safe_str(row.get("거래점", "")))
-
-    return "#".join([p for p in parts if p])
-
-def classify_1st_category(row):
-    """입출금 분류: 입금/출금/취소"""
-    before_text = safe_str(row.get("before_text", ""))
-    취소_val = safe_str(row.get("취소", ""))
+def apply_category_from_bank(df, category_df):
+    """계정과목 규칙 적용: before_text만 사용해 키워드 매칭. 매칭되면 해당 계정과목으로 덮어씀."""
+    if df is None or df.empty or category_df is None or category_df.empty:
+        return df
+    rules = build_account_rules(category_df)
+    if rules is None:
+        return df
+    if '카테고리' not in df.columns:
+        df = df.copy()
+        df['카테고리'] = ''
+    if '키워드' not in df.columns:
+        df['키워드'] = ''
+    df = df.copy()
+    df['카테고리'] = df['카테고리'].astype(object)
+    df['키워드'] = df['키워드'].astype(object)
+    if 'before_text' not in df.columns:
+        return df
+    search_series = df['before_text'].fillna('').astype(str)
 
-    if "취소" in before_text or "취소된 거래" in before_text:
-        return "취소"
-    if "취소" in 취소_val or "취소된 거래" in 취소_val:
-        return "취소"
+    # 정렬된 규칙을 다중 패턴 매처로 컴파일 → before_text당 한 번 스캔 (미매칭은 기타거래)
+    matcher = compile_account_rules(rules)
+    # 같은 before_text는 한 번만 분류 (factorize 코드로 행에 펼침). 이전 실행 결과는 .source 분류 메모에서 재사용
+    cats, kws = matcher.match_series(search_series, memo=get_classification_memo('bank', _PROJECT_ROOT))
+    unmatched = pd.isna(kws)
+    kws[unmatched] = df['키워드'].to_numpy(dtype=object)[unmatched]
+    df['카테고리'] = pd.Series(cats.tolist(), index=df.index)
+    df['키워드'] = pd.Series(kws, index=df.index, dtype=object)
+    return df
 
-    in_amt = row.get("입금액", 0) or 0
-    out_amt = row.get("출금액", 0) or 0
 
-    if out_amt > 0:
-        return "출금"
-    return "입금"
+def create_before_text(df):
+    """before_text 컬럼 생성. 계정과목 매칭용. 취소 + 적요·내용·송금메모·거래점(전처리 반영), 구분자 #.
+    적요·내용이 비어 있으면 은행명으로 채움."""
+    bank_name = _str_column(df, "은행명")
+    취소 = _str_column(df, "취소").str.strip()
+    적요 = _str_column(df, "적요")
+    적요 = 적요.where((적요 != '') | (bank_name == ''), bank_name)
+    내용 = _str_column(df, "내용")
+    내용 = 내용.where((내용 != '') | (bank_name == ''), bank_name)
+    parts = [취소, 적요, 내용, _str_column(df, "송금메모"), _str_column(df, "거래점")]
+    return pd.Series(_join_nonempty(parts, "#"), index=df.index, dtype=object)
+
+def classify_1st_category(df):
+    """입출금 분류 컬럼: 입금/출금/취소"""
+    취소_mask = np.zeros(len(df), dtype=bool)
+    for col in ("before_text", "취소"):
+        if col in df.columns:
+            # "취소된 거래"도 "취소"를 포함
+            취소_mask |= _str_column(df, col).str.contains("취소", regex=False).to_numpy()
+    if "출금액" in df.columns:
+        out_amt = pd.to_numeric(df["출금액"], errors='coerce').fillna(0).to_numpy()
+    else:
+        out_amt = np.zeros(len(df))
+    return pd.Series(np.select([취소_mask, out_amt > 0], ["취소", "출금"], "입금"), index=df.index, dtype=object)
 
 def _load_전처리_규칙():
-    """category_table.json에서 분류=전처리인 행만 (키워드, 카테고리) 리스트로 반환. 긴 키워드 먼저."""
+    """category_table.json에서 분류=전처리인 행만 (키워드, 카테고리) 리스트로 반환. 긴 키워드 먼저. (규칙 세트 캐시 사용)"""
     if not CATEGORY_TABLE_FILE or not os.path.exists(CATEGORY_TABLE_FILE):
         return []
     try:
-        category_tables = get_category_tables()
-        if not category_tables or "전처리" not in category_tables:
+        rule_set = get_rule_set(CATEGORY_TABLE_FILE, ensure_prepost=True)
+        if rule_set is None or rule_set.df.empty:
             return []
-        tbl = category_tables["전처리"]
-        rules = []
-        for _, row in tbl.iterrows():
-            kw = str(row.get("키워드", "") or "").strip()
-            cat = str(row.get("카테고리", "") or "").strip()
-            if not kw or pd.isna(row.get("카테고리")):
-                continue
-            if kw == cat:
-                continue
-            kw_norm = normalize_주식회사_for_match(kw)
-            if kw_norm:
-                rules.append((kw_norm, cat))
-        rules.sort(key=lambda x: len(x[0]), reverse=True)
-        return rules
+        return list(rule_set.bank_전처리_rules())
     except Exception:
         return []
 
 
-def _전처리_한칸_치환(cell_val, keyword, category):
-    """한 셀 값에서 키워드(공백 허용)를 카테고리로 치환. 셀 내 모든 매칭 치환. NFC 정규화."""
-    if cell_val is None or (isinstance(cell_val, float) and pd.isna(cell_val)):
-        return cell_val
-    s = unicodedata.normalize('NFC', str(cell_val))
-    if not keyword or keyword not in re.sub(r'\s+', '', s):
-        return cell_val
-    pattern = r'\s*'.join(re.escape(c) for c in keyword)
-    out = re.sub(pattern, category, s)
-    return out if out != s else cell_val
-
-
 def _apply_전처리_only(df):
     """before 저장 전: source 읽은 df의 적요·내용·송금메모·거래점에 전처리 규칙(키워드→카테고리) 적용."""
     if df is None or df.empty:
@@ -909,21 +814,20 @@ def _apply_전처리_only(df):
     rules = _load_전처리_규칙()
     if not rules:
         return df
+    # 규칙 전체를 한 번 컴파일(공백 허용·긴 키워드 우선) → 컬럼당 한 번 스캔
+    rewriter = compile_spaced_rules(tuple(rules))
     df = df.copy()
     cols = [c for c in ['적요', '내용', '송금메모', '거래점'] if c in df.columns]
     for col in cols:
-        for kw, cat in rules:
-            df[col] = df[col].apply(lambda v, k=kw, c=cat: _전처리_한칸_치환(v, k, c))
+        df[col] = rewriter.rewrite_series(df[col])
     return df
 
 
-def apply_후처리_bank(df, category_tables):
-    """은행거래 후처리: category_table 후처리 규칙으로 적요/내용/송금메모 컬럼의 키워드 → 카테고리 치환."""
-    if df is None or df.empty or "후처리" not in category_tables:
-        return df
-    category_table = category_tables["후처리"]
+def _후처리_rules(category_tables):
+    """category_tables 후처리 표 → [(키워드(주식회사 정규화), 카테고리)], 긴 키워드 먼저."""
+    category_table = (category_tables or {}).get("후처리")
     if category_table is None or category_table.empty:
-        return df
+        return []
     rules = []
     for _, row in category_table.iterrows():
         kw = str(row.get("키워드", "")).strip()
@@ -933,46 +837,51 @@ def apply_후처리_bank(df, category_tables):
             if kw_norm:
                 rules.append((kw_norm, cat))
     rules.sort(key=lambda x: len(x[0]), reverse=True)
+    return rules
+
+
+def apply_후처리_bank(df, category_tables):
+    """은행거래 후처리: category_table 후처리 규칙으로 적요/내용/송금메모 컬럼의 키워드 → 카테고리 치환."""
+    if df is None or df.empty:
+        return df
+    rules = _후처리_rules(category_tables)
     if not rules:
         return df
+    # 규칙 전체를 한 번 컴파일(긴 키워드 우선, 카테고리는 re 치환 템플릿) → 컬럼당 한 번 스캔
+    rewriter = compile_keyword_rules(tuple(rules), template=True)
     df = df.copy()
     for col in ['적요', '내용', '송금메모']:
         if col not in df.columns:
             continue
-        for kw_norm, cat in rules:
-            df[col] = df[col].fillna('').astype(str).str.replace(re.escape(kw_norm), cat, regex=True)
+        df[col] = rewriter.rewrite_series(df[col].fillna('').astype(str))
     return df
 
 
-def compute_기타거래(row):
-    """기타거래: 취소(비어있지 않으면 '취소'만)/적요/내용/송금메모를 '_'로 연결, 중복 단어 제거, 연속 '_'·공백 정리. (거래점 제외)
-    단, 취소/적요/내용/송금메모가 모두 스페이스나 널이면 거래점을 송금메모로 사용."""
-    parts = []
-    취소 = safe_str(row.get('취소', '')).strip()
-    적요 = safe_str(row.get('적요', '')).strip()
-    내용 = safe_str(row.get('내용', '')).strip()
-    송금메모 = safe_str(row.get('송금메모', '')).strip()
-    거래점 = safe_str(row.get('거래점', '')).strip()
-    if not 취소 and not 적요 and not 내용 and not 송금메모 and 거래점:
-        송금메모 = 거래점
-    if 취소:
-        parts.append('취소')
-    for val in (적요, 내용, 송금메모):
-        if val:
-            parts.append(val)
-    s = '_'.join(parts)
-    # 중복 단어: 공백·'_'로 나눈 단어 중 처음 나온 것만 유지
-    tokens = [w for w in re.split(r'[\s_]+', s) if w]
+def _중복단어_제거(text, sep_pattern):
+    """sep_pattern으로 나눈 단어 중 처음 나온 것만 남겨 '_'로 연결."""
     seen = set()
     unique = []
-    for w in tokens:
-        if w not in seen:
+    for w in re.split(sep_pattern, text):
+        if w and w not in seen:
             seen.add(w)
             unique.append(w)
-    s = '_'.join(unique)
-    # '_' 2개 이상 → 1개
-    s = re.sub(r'_+', '_', s)
-    return s.strip('_')
+    return '_'.join(unique)
+
+
+def compute_기타거래(df):
+    """기타거래 컬럼: 취소(비어있지 않으면 '취소'만)/적요/내용/송금메모를 '_'로 연결, 중복 단어 제거, 연속 '_'·공백 정리. (거래점 제외)
+    단, 취소/적요/내용/송금메모가 모두 스페이스나 널이면 거래점을 송금메모로 사용."""
+    취소 = _str_column(df, '취소').str.strip()
+    적요 = _str_column(df, '적요').str.strip()
+    내용 = _str_column(df, '내용').str.strip()
+    송금메모 = _str_column(df, '송금메모').str.strip()
+    거래점 = _str_column(df, '거래점').str.strip()
+    all_empty = (취소 == '') & (적요 == '') & (내용 == '') & (송금메모 == '')
+    송금메모 = 송금메모.where(~all_empty, 거래점)
+    취소 = 취소.where(취소 == '', '취소')
+    joined = pd.Series(_join_nonempty([취소, 적요, 내용, 송금메모], '_'), index=df.index, dtype=object)
+    # 중복 단어: 공백·'_'로 나눈 단어 중 처음 나온 것만 유지 (같은 문자열은 한 번만 계산)
+    return map_unique(joined, lambda t: _중복단어_제거(t, r'[\s_]+'))
 
 
 def _기타거래_중복단어_제거(text):
@@ -982,46 +891,23 @@ def _기타거래_중복단어_제거(text):
     s = str(text).strip()
     if not s:
         return ''
-    tokens = [w for w in re.split(r'[\s_#,]+', s) if w]
-    seen = set()
-    unique = []
-    for w in tokens:
-        if w not in seen:
-            seen.add(w)
-            unique.append(w)
-    return '_'.join(unique)
+    return _중복단어_제거(s, r'[\s_#,]+')
+
+
+def _기타거래_from_before_text(before_text):
+    """기타거래 컬럼: before_text와 통일(구분자 # → _), 동일 단어 중복 1개로 치환. 같은 문자열은 한 번만 계산."""
+    return map_unique(before_text.fillna('').astype(str), _기타거래_중복단어_제거)
 
 
 def get_category_tables():
-    """category_table.json 로드 및 category_tables 구성 (구분 없음, 거래방법/거래지점 미사용). 전처리/후처리 없으면 기본 규칙 보강."""
+    """category_table.json 로드 및 category_tables 구성 (구분 없음, 거래방법/거래지점 미사용). 전처리/후처리 없으면 기본 규칙 보강.
+    파일 내용이 바뀌지 않았으면 category_rules 캐시에서 분류별 표를 복사해 반환."""
     if not CATEGORY_TABLE_FILE or not os.path.exists(CATEGORY_TABLE_FILE):
         return None
-    category_df = ensure_prepost_in_table(CATEGORY_TABLE_FILE)
-    if category_df is None or category_df.empty:
+    rule_set = get_rule_set(CATEGORY_TABLE_FILE, ensure_prepost=True)
+    if rule_set is None or rule_set.df.empty:
         return None
-    category_df = category_df.fillna('')
-    # 컬럼명 앞뒤 공백 제거 (Excel 등에서 올 수 있음)
-    category_df.columns = [str(c).strip() for c in category_df.columns]
-    if '구분' in category_df.columns:
-        category_df = category_df.drop(columns=['구분'], errors='ignore')
-    category_tables = {}
-    분류_컬럼명 = '분류' if '분류' in category_df.columns else '차수'
-    차수_분류_매핑 = {
-        '1차': '입출금',
-        '2차': '전처리',
-        '6차': '기타거래'
-    }
-
-    for 값 in category_df[분류_컬럼명].unique():
-        if pd.notna(값):
-            값_str = str(값).strip()
-            if 분류_컬럼명 == '차수' and 값_str in 차수_분류_매핑:
-                분류명 = 차수_분류_매핑[값_str]
-            else:
-                분류명 = 값_str
-            category_tables[분류명] = category_df[category_df[분류_컬럼명] == 값].copy()
-
-    return category_tables
+    return rule_set.tables()
 
 def classify_and_save(input_file=None, output_file=None, input_df=None):
     """bank_before → bank_after 생성. 전처리는 이미 before 저장 시 적용됨. before_text(취소+적요·내용·송금메모·거래점)만으로 계정과목 분류, 후처리(치환) 적용.
@@ -1070,6 +956,54 @@ def classify_and_save(input_file=None, output_file=None, input_df=None):
                 _safe_print(f"오류: {LAST_CLASSIFY_ERROR}", flush=True)
                 return False
 
+    fingerprint = rules_fingerprint(CATEGORY_TABLE_FILE)
+    result_df = classify_bank_frame(df)
+    if result_df is None:
+        return False
+
+    try:
+        out_dir = os.path.dirname(output_file)
+        if out_dir and not os.path.exists(out_dir):
+            try:
+                os.makedirs(out_dir, exist_ok=True)
+            except Exception as ex:
+                _safe_print(f"오류: 출력 폴더 생성 실패 - {out_dir}: {ex}")
+        try:
+            from data_json_io import safe_write_data_json
+            safe_write_data_json(output_file, result_df)
+        except ImportError:
+            if not safe_write_excel(result_df, output_file):
+                LAST_CLASSIFY_ERROR = f"파일 저장 실패: {output_file} (쓰기 권한 또는 파일 사용 중 확인)"
+                _safe_print(f"오류: {LAST_CLASSIFY_ERROR}")
+                return False
+    except PermissionError as e:
+        LAST_CLASSIFY_ERROR = f"bank_after 저장 권한 없음(파일을 닫아주세요): {e}"
+        _safe_print(f"오류: {LAST_CLASSIFY_ERROR}")
+        try:
+            import traceback
+            traceback.print_exc()
+        except (ValueError, OSError):
+            pass
+        return False
+    except Exception as e:
+        LAST_CLASSIFY_ERROR = f"파일 저장 중 예외: {e}"
+        _safe_print(f"오류: {LAST_CLASSIFY_ERROR}")
+        try:
+            import traceback
+            traceback.print_exc()
+        except (ValueError, OSError):
+            pass
+        return False
+
+    # 증분 재분류 기준: 이 after 를 만든 규칙 세트 지문
+    record_after_rules(output_file, fingerprint)
+    return True
+
+
+def classify_bank_frame(df):
+    """before DataFrame → after DataFrame (before_text 계정과목 분류·후처리·정리). 저장하지 않음.
+    classify_and_save 와 업로드 증분 반영(새 행만 분류) 공용. 실패 시 None (LAST_CLASSIFY_ERROR 설정)."""
+    global LAST_CLASSIFY_ERROR
     # 컬럼명 앞뒤 공백 제거 (취소·적요·내용·송금메모·거래점 매칭 보장)
     df.columns = [str(c).strip() for c in df.columns]
     # 기존 파일 호환: 구분 → 취소
@@ -1085,7 +1019,7 @@ def classify_and_save(input_file=None, output_file=None, input_df=None):
         except Exception as e:
             LAST_CLASSIFY_ERROR = f"category_table 생성 실패: {e}"
             _safe_print(f"오류: {LAST_CLASSIFY_ERROR}")
-            return False
+            return None
 
     category_tables = get_category_tables()
     if category_tables is None:
@@ -1103,10 +1037,10 @@ def classify_and_save(input_file=None, output_file=None, input_df=None):
         if category_tables is None:
             LAST_CLASSIFY_ERROR = f"{CATEGORY_TABLE_FILE} 로드 실패(파일 없음 또는 비어 있음)"
             _safe_print(f"오류: {LAST_CLASSIFY_ERROR}")
-            return False
+            return None
 
     try:
-        df["before_text"] = df.apply(create_before_text, axis=1)
+        df["before_text"] = create_before_text(df)
     except Exception as e:
         LAST_CLASSIFY_ERROR = f"before_text 생성 실패: {e}"
         _safe_print(f"오류: {LAST_CLASSIFY_ERROR}", flush=True)
@@ -1115,19 +1049,16 @@ def classify_and_save(input_file=None, output_file=None, input_df=None):
             traceback.print_exc()
         except (ValueError, OSError):
             pass
-        return False
+        return None
 
     # 후처리 매칭 전에 적요·내용·송금메모를 주식회사→(주) 등으로 정규화 (전처리는 before 저장 시 이미 적용됨)
     for col in ['적요', '내용', '송금메모']:
         if col in df.columns:
-            df[col] = df[col].apply(lambda v: safe_str(v))
+            df[col] = safe_str_series(df[col])
 
-    df["입출금"] = df.apply(classify_1st_category, axis=1)
+    df["입출금"] = classify_1st_category(df)
     # 기타거래: before_text와 통일(구분자 # → _), 동일 단어 중복 1개로 치환. 빈 값이면 안 됨 → 은행명 또는 '(미기재)'로 채움.
-    df["기타거래"] = (
-        df["before_text"].fillna('').astype(str).str.replace("#", "_", regex=False)
-        .apply(_기타거래_중복단어_제거)
-    )
+    df["기타거래"] = _기타거래_from_before_text(df["before_text"])
     # 기타거래가 빈 문자열인 행: 은행명으로 채우고, 없으면 '(미기재)'
     empty_etc = (df["기타거래"].fillna('').astype(str).str.strip() == '')
     if empty_etc.any():
@@ -1148,7 +1079,7 @@ def classify_and_save(input_file=None, output_file=None, input_df=None):
                 traceback.print_exc()
             except (ValueError, OSError):
                 pass
-            return False
+            return None
     else:
         if '카테고리' not in df.columns:
             df['카테고리'] = '기타거래'
@@ -1166,14 +1097,11 @@ def classify_and_save(input_file=None, output_file=None, input_df=None):
             traceback.print_exc()
         except (ValueError, OSError):
             pass
-        return False
+        return None
 
     # 기타거래: 저장 전 컬럼 확보 및 빈 값 제거(절대 비우지 않음)
     if '기타거래' not in df.columns and 'before_text' in df.columns:
-        df["기타거래"] = (
-            df["before_text"].fillna('').astype(str).str.replace("#", "_", regex=False)
-            .apply(_기타거래_중복단어_제거)
-        )
+        df["기타거래"] = _기타거래_from_before_text(df["before_text"])
     if '기타거래' in df.columns:
         empty_etc = (df["기타거래"].fillna('').astype(str).str.strip() == '')
         if empty_etc.any():
@@ -1267,42 +1195,65 @@ def classify_and_save(input_file=None, output_file=None, input_df=None):
     for col in ['취소', '적요', '내용', '송금메모', '거래점', '기타거래']:
         if col in result_df.columns:
             result_df[col] = result_df[col].apply(normalize_spaces)
+    return result_df
 
-    try:
-        out_dir = os.path.dirname(output_file)
-        if out_dir and not os.path.exists(out_dir):
-            try:
-                os.makedirs(out_dir, exist_ok=True)
-            except Exception as ex:
-                _safe_print(f"오류: 출력 폴더 생성 실패 - {out_dir}: {ex}")
-        try:
-            from data_json_io import safe_write_data_json
-            safe_write_data_json(output_file, result_df)
-        except ImportError:
-            if not safe_write_excel(result_df, output_file):
-                LAST_CLASSIFY_ERROR = f"파일 저장 실패: {output_file} (쓰기 권한 또는 파일 사용 중 확인)"
-                _safe_print(f"오류: {LAST_CLASSIFY_ERROR}")
-                return False
-    except PermissionError as e:
-        LAST_CLASSIFY_ERROR = f"bank_after 저장 권한 없음(파일을 닫아주세요): {e}"
-        _safe_print(f"오류: {LAST_CLASSIFY_ERROR}")
-        try:
-            import traceback
-            traceback.print_exc()
-        except (ValueError, OSError):
-            pass
-        return False
-    except Exception as e:
-        LAST_CLASSIFY_ERROR = f"파일 저장 중 예외: {e}"
-        _safe_print(f"오류: {LAST_CLASSIFY_ERROR}")
-        try:
-            import traceback
-            traceback.print_exc()
-        except (ValueError, OSError):
-            pass
-        return False
 
-    return True
+def _build_before_text_index(input_file):
+    """bank_before → before_text 역색인 (bank_after 행 순서와 동일). 읽기 실패면 None."""
+    df = _safe_read_data_file(input_file, default_empty=True)
+    if df is None or df.empty:
+        return None
+    df.columns = [str(c).strip() for c in df.columns]
+    if '구분' in df.columns and '취소' not in df.columns:
+        df = df.rename(columns={'구분': '취소'})
+    texts = create_before_text(df)
+    # 미매칭 행은 before의 키워드 유지 (없으면 '')
+    fallback = df['키워드'].fillna('').to_numpy(dtype=object) if '키워드' in df.columns else None
+    return TextRowIndex(texts, fallback_keywords=fallback)
+
+
+def reclassify_after_for_rule_edit(old_rule_set, new_rule_set, input_file=None, output_file=None):
+    """계정과목 규칙 편집 후 bank_after 증분 재분류. 바뀐 규칙 키워드(이전·새)를 포함하는 행만 다시 분류해 저장.
+    Returns: (갱신된 after DataFrame, 재분류 행 수, 값이 바뀐 행 수).
+    증분 불가(after 가 편집 전 규칙 세트로 분류된 것이 아님, 후처리 변경, 계정과목 없음, 규칙 순서 변동,
+    before/after 행 불일치 등)면 None → 전체 재생성 필요."""
+    if input_file is None:
+        input_file = INPUT_FILE
+    if output_file is None:
+        output_file = OUTPUT_FILE
+    if old_rule_set is None or new_rule_set is None:
+        return None
+    if not os.path.exists(input_file) or not os.path.exists(output_file):
+        return None
+    # 다른 규칙 세트로 분류된 after(다른 앱 편집만 반영된 뒤 등)는 편집 전/후 비교만으로 맞출 수 없음
+    if after_rules_fingerprint(output_file) != old_rule_set.fingerprint:
+        return None
+    old_tables, new_tables = old_rule_set.tables(), new_rule_set.tables()
+    # 후처리는 after 텍스트 자체를 바꾸므로 증분 대상 아님 (전처리는 before 저장 시 적용되어 after 재생성과 무관)
+    if _후처리_rules(old_tables) != _후처리_rules(new_tables):
+        return None
+    old_rules = build_account_rules(old_tables.get('계정과목'))
+    new_rules = build_account_rules(new_tables.get('계정과목'))
+    if old_rules is None or new_rules is None:
+        return None
+    keywords = changed_account_keywords(old_rules, new_rules)
+    if keywords is None:
+        return None
+    after_df = _safe_read_data_file(output_file, default_empty=True)
+    if after_df is None or after_df.empty or '카테고리' not in after_df.columns or '키워드' not in after_df.columns:
+        return None
+    index = get_row_index('bank', input_file, output_file, lambda: _build_before_text_index(input_file))
+    if index is None or len(index) != len(after_df):
+        return None
+    rows, cats, kws = index.reclassify(compile_account_rules(new_rules), keywords)
+    changed = patch_after_rows(after_df, rows, cats, kws)
+    if changed:
+        from data_json_io import safe_write_data_json
+        safe_write_data_json(output_file, after_df)
+        remember_row_index('bank', input_file, output_file, index)
+    record_after_rules(output_file, new_rule_set.fingerprint)
+    return after_df, len(rows), changed
+
 
 def main():
     """전체 워크플로우 실행"""
@@ -10,7 +10,7 @@ MyCard (신용카드) Flask 앱 (card_app.py)
 주요 데이터:
   - card_before.json, card_after.json: MyCard 폴더. category_table.json은 MyInfo/.source 공통.
   - 신용카드 전처리후 화면: card_before.json 사용 (은행의 bank_before와 동일한 역할. card_after는 카테고리 적용후).
-  - 원본: MyInfo/.source/Card 의 .xls, .xlsx.
+  - 원본: MyInfo/.source/Card 의 .xls, .xlsx. /api/upload 로 올리면 새 거래만 before/after 에 반영 (upload_jobs).
 
 유지보수: process_card_data는 importlib로 동적 로드. ensure_working_directory로 API 시 cwd를 MyCard로 고정.
 """
@@ -59,6 +59,7 @@ except ImportError:
     )
 # 원본 카드 파일: .source/Card. before/after: MyCard 폴더 JSON
 SOURCE_CARD_DIR = os.path.join(PROJECT_ROOT, '.source', 'Card')
+UPLOAD_TMP_DIR = os.path.join(PROJECT_ROOT, '.source', 'upload_tmp')
 CARD_BEFORE_PATH = os.path.join(SCRIPT_DIR, 'card_before.json')
 CARD_AFTER_PATH = os.path.join(SCRIPT_DIR, 'card_after.json')
 try:
@@ -97,7 +98,21 @@ def _call_integrate_card():
     """card_before.xlsx 생성 (MyCard 폴더). 카테고리는 card_after에서만 적용. 반환: 생성된 DataFrame(재생성 시 after에 넘길 때 사용)."""
     mod = _load_process_card_data_module()
     card_before_path = Path(CARD_BEFORE_PATH)
-    df = mod.integrate_card_excel(skip_write=True)
+    df = _prepare_card_before(mod.integrate_card_excel(skip_write=True))
+    # card_before에는 카테고리 미포함 (card_after에서만 카테고리·현금처리 적용)
+    if df is not None:
+        try:
+            if safe_write_data_json and str(card_before_path).endswith('.json'):
+                safe_write_data_json(str(card_before_path), df)
+            else:
+                mod.safe_write_excel(df, str(card_before_path))
+        except Exception as e:
+            print(f"card_before 저장 실패: {e}")
+    return df
+
+
+def _prepare_card_before(df):
+    """integrate_card_excel 결과 → card_before 행 (가맹점명·사업자번호 기본값, 할부→구분). 통합·업로드 반영 공용."""
     # 가맹점명 비어있으면 카드사로 채움 (카드사·카드번호·이용일·이용금액 있는 행)
     if df is not None and not df.empty and all(c in df.columns for c in ['카드사', '카드번호', '이용일', '이용금액', '가맹점명']):
         has_card = (
@@ -110,7 +125,6 @@ def _call_integrate_card():
         df.loc[has_card, '가맹점명'] = df.loc[has_card, '카드사']
     if df is not None and not df.empty:
         _apply_카드사_사업자번호_기본값(df)
-    # card_before에는 카테고리 미포함 (card_after에서만 카테고리·현금처리 적용)
     if df is not None:
         # 저장 시 컬럼명 "할부" → "구분" 통일 (card_before.xlsx는 항상 구분 컬럼으로 저장)
         if not df.empty and '할부' in df.columns:
@@ -120,13 +134,6 @@ def _call_integrate_card():
             df['구분'] = df['구분'].apply(
                 lambda v: '폐업' if v is not None and str(v).strip() == '폐업' else ''
             )
-        try:
-            if safe_write_data_json and str(card_before_path).endswith('.json'):
-                safe_write_data_json(str(card_before_path), df)
-            else:
-                mod.safe_write_excel(df, str(card_before_path))
-        except Exception as e:
-            print(f"card_before 저장 실패: {e}")
     return df
 
 # ensure_working_directory: 아래 공통 모듈 블록에서 생성
@@ -195,6 +202,11 @@ from shared_app_utils import (
     json_safe as _json_safe,
     format_bytes,
 )
+from excel_backend import read_sheet_frames, sheet_names as excel_sheet_names
+from row_dedup import drop_overlapping_rows
+from category_incremental import after_rules_fingerprint, record_after_rules, rules_fingerprint
+import source_watcher
+import upload_jobs
 ensure_working_directory = make_ensure_working_directory(SCRIPT_DIR)
 
 def load_source_files():
@@ -217,8 +229,7 @@ def load_source_files():
         }
         
         try:
-            xls = pd.ExcelFile(file_path)
-            for sheet_name in xls.sheet_names:
+            for sheet_name in excel_sheet_names(file_path):
                 file_info['sheets'].append({
                     'name': sheet_name,
                     'filename': file_path.name
@@ -447,6 +458,9 @@ def get_card_before_data():
     """전처리전 테이블용: card_before.xlsx 반환 (없으면 .source/Card Excel 통합 후 생성)"""
     try:
         card_before_path = Path(CARD_BEFORE_PATH)
+        # before 없음: 감시 스레드가 재생성 중이면 같은 원본을 다시 읽지 않고 끝나길 기다림
+        if not card_before_path.exists():
+            source_watcher.wait_idle('card')
         if not card_before_path.exists() or card_before_path.stat().st_size == 0:
             try:
                 _call_integrate_card()
@@ -494,12 +508,14 @@ def get_card_before_data():
 @ensure_working_directory
 def run_card_preprocess():
     """Source 루트 Excel 통합하여 card_before.xlsx 생성/갱신 (동일 프로세스에서 실행)"""
-    try:
-        _call_integrate_card()
-        return jsonify({'success': True, 'message': 'card_before.xlsx가 생성되었습니다.'})
-    except Exception as e:
-        traceback.print_exc()
-        return jsonify({'success': False, 'error': str(e)}), 500
+    # 감시 재생성과 겹치지 않게 before 를 다시 만든다
+    with source_watcher.exclusive():
+        try:
+            _call_integrate_card()
+            return jsonify({'success': True, 'message': 'card_before.xlsx가 생성되었습니다.'})
+        except Exception as e:
+            traceback.print_exc()
+            return jsonify({'success': False, 'error': str(e)}), 500
 
 
 def _remove_card_before_after_and_bak():
@@ -523,32 +539,168 @@ def _remove_card_before_after_and_bak():
 @ensure_working_directory
 def reintegrate_card():
     """card_before를 .source/Card 기준으로 다시 통합·전처리하여 덮어쓴다. 실행 전 before/after 삭제 후 한 번만 통합 수행."""
-    try:
-        _remove_card_before_after_and_bak()
-        _call_integrate_card()
-        return jsonify({'ok': True})
-    except Exception as e:
-        traceback.print_exc()
-        return jsonify({'ok': False, 'error': str(e)}), 500
+    # 감시 재생성과 겹치지 않게 before/after 를 다시 만든다
+    with source_watcher.exclusive():
+        try:
+            _remove_card_before_after_and_bak()
+            _call_integrate_card()
+            return jsonify({'ok': True})
+        except Exception as e:
+            traceback.print_exc()
+            return jsonify({'ok': False, 'error': str(e)}), 500
+
+
+def _rebuild_from_source_watch():
+    """source_watcher 콜백 (.source/Card 변경 후 감시 스레드): before·after 재생성 후 캐시 교체.
+    재생성 중 요청은 이전 캐시를 그대로 쓰므로 엑셀 읽기를 기다리지 않는다."""
+    global _source_card_cache, _card_before_cache, _card_after_cache
+    df_before = _call_integrate_card()
+    if not Path(CARD_BEFORE_PATH).exists():
+        raise RuntimeError('card_before 생성 실패')
+    success, error, _count = _create_card_after(
+        input_df=df_before if df_before is not None and not df_before.empty else None
+    )
+    if not success:
+        raise RuntimeError(error or 'card_after 생성 실패')
+    # 새 파일을 이 스레드에서 읽어 캐시 채움 (그 사이 요청은 새 JSON 을 직접 읽음)
+    _source_card_cache = None
+    _card_before_cache = None
+    _card_after_cache = None
+    load_card_before_file()
+    _load_card_after_cached()
+    return True
+
 
+def _read_card_data(path):
+    if safe_read_data_json and str(path).endswith('.json'):
+        return safe_read_data_json(str(path), default_empty=True)
+    return pd.read_excel(path, engine='openpyxl')
+
+
+def _write_card_data(path, df):
+    if safe_write_data_json and str(path).endswith('.json'):
+        safe_write_data_json(str(path), df)
+    else:
+        df.to_excel(str(path), index=False, engine='openpyxl')
+
+
+def _ingest_card_file(path, report):
+    """원본 파일 1개(업로드)를 card_before·card_after 에 증분 반영. 새 행만 전처리·분류해 기존 행 뒤에 붙인다.
+    card_before 에 이미 있는 거래(BEFORE_DEDUP_KEY_COLUMNS 기준, 파일 안 같은 거래 횟수만큼)는 버린다.
+    Returns: {'rows': 읽은 행, 'added': 추가 행, 'duplicates': 겹쳐 버린 행, 'total': before 전체 행}."""
+    mod = _load_process_card_data_module()
+    name = os.path.basename(path)
+    report('parse', 10)
+    new_df = _prepare_card_before(mod.integrate_card_excel(skip_write=True, files=[path]))
+    if new_df is None or new_df.empty:
+        raise ValueError(f'{name}: 카드 이용내역을 읽지 못했습니다. (시트·헤더 확인)')
+    report('merge', 40)
+    before_df = _read_card_data(CARD_BEFORE_PATH) if Path(CARD_BEFORE_PATH).exists() else None
+    if before_df is None:
+        before_df = pd.DataFrame()
+    sources = np.array(['card_before'] * len(before_df) + [name] * len(new_df), dtype=object)
+    merged = pd.concat([before_df, new_df], ignore_index=True)
+    merged, dropped = drop_overlapping_rows(merged, mod.BEFORE_DEDUP_KEY_COLUMNS, sources)
+    duplicates = dropped.get(name, 0)
+    added = len(new_df) - duplicates
+    result = {'rows': len(new_df), 'added': added, 'duplicates': duplicates, 'total': len(before_df) + added}
+    if added == 0:
+        return result
+    merged = merged.reset_index(drop=True)
+
+    report('classify', 60)
+    had_category_file = Path(CATEGORY_TABLE_PATH).exists()
+    fingerprint = rules_fingerprint(CATEGORY_TABLE_PATH) if had_category_file else None
+    after_df = _read_card_data(CARD_AFTER_PATH) if Path(CARD_AFTER_PATH).exists() else None
+    if after_df is not None and not after_df.empty:
+        # 기존 after 행을 분류한 규칙 세트가 지금과 다르면 합친 after 의 규칙 지문은 남기지 않음
+        after_fingerprint = after_rules_fingerprint(CARD_AFTER_PATH)
+        new_after = _card_after_frame(mod, merged.iloc[len(before_df):].reset_index(drop=True), had_category_file)
+        after_merged = pd.concat([after_df, new_after], ignore_index=True)
+    else:
+        after_fingerprint = fingerprint
+        after_merged = _card_after_frame(mod, merged.copy(), had_category_file)
+
+    report('save', 90)
+    _write_card_data(CARD_BEFORE_PATH, merged)
+    _write_card_data(CARD_AFTER_PATH, after_merged)
+    record_after_rules(CARD_AFTER_PATH, fingerprint if after_fingerprint == fingerprint else None)
+    if not had_category_file:
+        try:
+            mod.create_category_table(after_merged, category_filepath=CATEGORY_TABLE_PATH)
+        except Exception as e:
+            print(f"category_table.json 신용카드 섹션 생성 실패: {e}")
+    return result
+
+
+def _ingest_uploaded_source(path, report):
+    """upload_jobs 작업 (작업 스레드): 새 거래만 card_before·card_after 에 반영 → 원본을 .source/Card 로 옮기고 캐시 교체."""
+    global _source_card_cache, _card_before_cache, _card_after_cache
+    # 감시 재생성과 겹치지 않게 (옮긴 원본은 감시 스냅샷에 넣어 전체 재생성하지 않음)
+    with source_watcher.exclusive():
+        result = _ingest_card_file(path, report)
+        # 같은 이름 원본이 있으면 덮어쓰지 않고 다른 이름으로 저장 (이전 원본의 거래가 다음 전체 재생성에서 빠지지 않게)
+        result['source_file'] = upload_jobs.move_to_source(path, SOURCE_CARD_DIR)
+        source_watcher.acknowledge('card', [result['source_file']])
+    _source_card_cache = None
+    if result['added']:
+        _card_before_cache = None
+        _card_after_cache = None
+        load_card_before_file()
+        _load_card_after_cached()
+    return result
+
+
+@app.route('/api/upload', methods=['POST'])
+@ensure_working_directory
+def upload_source_file():
+    """카드 원본 엑셀 업로드 (multipart 'file' 또는 본문 + ?filename=). 저장 후 백그라운드에서 파싱해 새 거래만 반영.
+    202 + job_id → GET /api/upload/<job_id> 로 진행 조회."""
+    if upload_jobs.content_too_large(request):
+        return jsonify({'ok': False, 'error': upload_jobs.TOO_LARGE_MESSAGE}), 413
+    filename, stream = upload_jobs.request_upload(request)
+    filename = upload_jobs.safe_filename(filename)
+    if not filename:
+        return jsonify({'ok': False, 'error': '.xls 또는 .xlsx 파일명이 필요합니다.'}), 400
+    job = upload_jobs.start_upload('card', filename, stream, UPLOAD_TMP_DIR, _ingest_uploaded_source)
+    if job['state'] == 'error':
+        return jsonify({'ok': False, 'error': job['error'], 'job': job}), 413 if job['too_large'] else 500
+    return jsonify({'ok': True, 'job_id': job['id'], 'job': job}), 202
+
+
+@app.route('/api/upload')
+def list_upload_jobs():
+    """카드 업로드 작업 목록."""
+    return jsonify({'jobs': upload_jobs.list_jobs('card')})
+
+
+@app.route('/api/upload/<job_id>')
+def get_upload_job(job_id):
+    """업로드 작업 진행 상태 (state, stage, progress, result: rows/added/duplicates/total, error)."""
+    job = upload_jobs.get_job(job_id)
+    if job is None or job['kind'] != 'card':
+        return jsonify({'ok': False, 'error': '작업을 찾을 수 없습니다.'}), 404
+    return jsonify(job)
 
 @app.route('/api/regenerate-before-after', methods=['POST'])
 @ensure_working_directory
 def regenerate_before_after():
     """card_before·card_after 삭제 후 source→전처리→before→카테고리분류→후처리→after 전체 재생성."""
-    try:
-        _remove_card_before_after_and_bak()
-        df_before = _call_integrate_card()
-        # before 메모리(df_before)로 after 생성. 파일 재읽기 생략.
-        success, error, count = _create_card_after(
-            input_df=df_before if df_before is not None and not df_before.empty else None
-        )
-        if not success:
-            return jsonify({'ok': False, 'error': error or 'card_after 생성 실패', 'count': 0}), 500
-        return jsonify({'ok': True, 'message': f'전처리/후처리 재생성 완료: {count}건', 'count': count})
-    except Exception as e:
-        traceback.print_exc()
-        return jsonify({'ok': False, 'error': str(e), 'count': 0}), 500
+    # 감시 재생성과 겹치지 않게 before/after 를 다시 만든다
+    with source_watcher.exclusive():
+        try:
+            _remove_card_before_after_and_bak()
+            df_before = _call_integrate_card()
+            # before 메모리(df_before)로 after 생성. 파일 재읽기 생략.
+            success, error, count = _create_card_after(
+                input_df=df_before if df_before is not None and not df_before.empty else None
+            )
+            if not success:
+                return jsonify({'ok': False, 'error': error or 'card_after 생성 실패', 'count': 0}), 500
+            return jsonify({'ok': True, 'message': f'전처리/후처리 재생성 완료: {count}건', 'count': count})
+        except Exception as e:
+            traceback.print_exc()
+            return jsonify({'ok': False, 'error': str(e), 'count': 0}), 500
 
 
 @app.route('/api/processed-data')
@@ -843,12 +995,8 @@ def _build_source_card_cache():
         elif '농협' in filename:
             card_name = '농협카드'
         try:
-            suf = file_path.suffix.lower()
-            engine = 'xlrd' if suf == '.xls' else 'openpyxl'
-            xls = pd.ExcelFile(file_path, engine=engine)
-            for sheet_name in xls.sheet_names:
+            for sheet_name, df in read_sheet_frames(file_path, header=None):
                 try:
-                    df = pd.read_excel(file_path, sheet_name=sheet_name, header=None, engine=engine)
                     df = df.where(pd.notna(df), None)
                     data_dict = df.to_dict('records')
                     data_dict = _json_safe(data_dict)
@@ -918,6 +1066,23 @@ def category():
     """카테고리 페이지"""
     return render_template('category.html', category_filename='category_table.json')
 
+@app.route('/api/category-impact')
+def get_category_impact():
+    """후보 키워드(/ 구분)가 은행·카드·금융정보 after에서 걸리는 행 수·카테고리별 건수·예시 행. 분류 검색 텍스트 n-gram 색인 사용 (첫 요청 때 생성)."""
+    try:
+        from category_impact import default_after_paths, impact_payload
+        paths = default_after_paths(PROJECT_ROOT)
+        paths['card'] = CARD_AFTER_PATH
+        limit = min(max(request.args.get('limit', default=5, type=int) or 5, 1), 50)
+        response = jsonify(impact_payload(request.args.get('keyword', ''), paths, limit=limit))
+        response.headers['Content-Type'] = 'application/json; charset=utf-8'
+        return response
+    except Exception as e:
+        traceback.print_exc()
+        response = jsonify({'error': str(e), 'results': {}})
+        response.headers['Content-Type'] = 'application/json; charset=utf-8'
+        return response, 500
+
 @app.route('/api/card_category')
 def get_category_table():
     """category_table.json 전체 반환 (구분 없음)."""
@@ -950,6 +1115,7 @@ def save_category_table():
     try:
         data = request.json or {}
         action = data.get('action', 'add')
+        old_rule_set = _current_rule_set(path)
         success, error_msg, count = apply_category_action(path, action, data)
         if not success:
             return jsonify({'success': False, 'error': error_msg}), 400
@@ -958,10 +1124,16 @@ def save_category_table():
             sync_category_create_from_xlsx(path)
         except Exception:
             pass
+        # 바뀐 규칙 행만 재분류, 불가하면(다른 규칙 세트로 분류된 after 등) 전체 재분류. 업로드·감시 재생성과 겹치지 않게
+        with source_watcher.exclusive():
+            reclassified = _reclassify_card_after_incremental(old_rule_set)
+            if reclassified is None:
+                reclassified = _reclassify_card_after_full()
         response = jsonify({
             'success': True,
             'message': '카테고리 테이블이 업데이트되었습니다.',
-            'count': count
+            'count': count,
+            'reclassified': reclassified,
         })
         response.headers['Content-Type'] = 'application/json; charset=utf-8'
         return response
@@ -1743,6 +1915,247 @@ def get_date_range():
         return jsonify({'error': str(e), 'min_date': None, 'max_date': None}), 500
 
 
+def _fill_card_가맹점명(df_card):
+    """card_after 분류 전 가맹점명 보정 (df_card 직접 수정).
+    카드사/카드번호/입금액 또는 출금액이 있으면서 가맹점명이 공란이면 가맹점명에 카드사, 신한카드 카드론은 '신한카드_카드론'."""
+    if df_card.empty or not all(c in df_card.columns for c in ['카드사', '카드번호', '가맹점명']):
+        return
+    has_amt = ('입금액' in df_card.columns and df_card['입금액'].notna().any()) or ('출금액' in df_card.columns and df_card['출금액'].notna().any())
+    if has_amt:
+        has_card = (
+            (df_card['카드사'].fillna('').astype(str).str.strip() != '') &
+            (df_card['카드번호'].fillna('').astype(str).str.strip() != '') &
+            (df_card['가맹점명'].fillna('').astype(str).str.strip() == '')
+        )
+        df_card.loc[has_card, '가맹점명'] = df_card.loc[has_card, '카드사']
+    # 신한카드에서 가맹점명이 '신한카드'인 경우(카드론 등): '신한카드_카드론'으로 통일
+    sh_merchant = (
+        df_card['카드사'].fillna('').astype(str).str.strip().str.contains('신한', na=False) &
+        (df_card['가맹점명'].fillna('').astype(str).str.strip() == '신한카드')
+    )
+    if sh_merchant.any():
+        df_card.loc[sh_merchant, '가맹점명'] = '신한카드_카드론'
+
+
+def _card_after_row_mask(df_card):
+    """card_after에 남길 행: 카드번호 16자 초과."""
+    return df_card['카드번호'].astype(str).str.strip().str.len() > 16
+
+
+def _build_card_merchant_index(mod):
+    """card_before → 계정과목 매칭용 가맹점명 역색인 (card_after 행 순서와 동일). 읽기 실패·컬럼 없음이면 None."""
+    from category_incremental import TextRowIndex
+    if safe_read_data_json and str(CARD_BEFORE_PATH).endswith('.json'):
+        df_card = safe_read_data_json(str(CARD_BEFORE_PATH), default_empty=True)
+    else:
+        df_card = pd.read_excel(CARD_BEFORE_PATH, engine='openpyxl')
+    if df_card is None or df_card.empty:
+        return None
+    df_card.columns = [str(c).strip() for c in df_card.columns]
+    if '가맹점명' not in df_card.columns or '카드번호' not in df_card.columns:
+        return None
+    _fill_card_가맹점명(df_card)
+    df_card = df_card[_card_after_row_mask(df_card)]
+    return TextRowIndex(mod.merchant_search_texts(df_card))
+
+
+def _build_card_search_index():
+    """키워드 영향 미리보기용 가맹점명 색인 (증분 재분류와 같은 색인). 실패 시 None."""
+    try:
+        return _build_card_merchant_index(_load_process_card_data_module())
+    except Exception:
+        traceback.print_exc()
+        return None
+
+
+# 키워드 영향 미리보기: 카드 검색 텍스트는 분류기와 같은 가맹점명 (색인은 첫 미리보기 요청 때 생성)
+from category_impact import register_text_source
+register_text_source('card', CARD_BEFORE_PATH, _build_card_search_index)
+
+
+def _current_rule_set(path):
+    """편집 전 category_table 규칙 세트 (증분 재분류 비교용). 실패 시 None."""
+    try:
+        from category_rules import get_rule_set
+        return get_rule_set(path)
+    except Exception:
+        return None
+
+
+def _reclassify_card_after_incremental(old_rule_set):
+    """규칙 편집 후 card_after에서 바뀐 키워드를 포함하는 행만 재분류하고 파일·캐시 갱신.
+    Returns: 재분류 행 수. 증분 불가(card_after 없음·편집 전 규칙 세트로 분류된 after 아님·후처리 변경 등)면
+    None → 재생성 필요."""
+    global _card_after_cache, _card_after_cache_mtime
+    if old_rule_set is None or not Path(CARD_AFTER_PATH).exists() or not Path(CARD_BEFORE_PATH).exists():
+        return None
+    # 다른 규칙 세트로 분류된 after(은행 화면 편집만 반영된 뒤 등)는 편집 전/후 비교만으로 맞출 수 없음
+    if after_rules_fingerprint(CARD_AFTER_PATH) != old_rule_set.fingerprint:
+        return None
+    try:
+        from category_rules import get_rule_set
+        from category_matcher import compile_account_rules
+        from category_incremental import (
+            changed_account_keywords, get_row_index, patch_after_rows, remember_row_index,
+        )
+        mod = _load_process_card_data_module()
+        new_rule_set = get_rule_set(CATEGORY_TABLE_PATH)
+        if new_rule_set is None:
+            return None
+        # 후처리는 가맹점명 자체를 바꾸므로 증분 대상 아님
+        if old_rule_set.card_prepost_rules()[1] != new_rule_set.card_prepost_rules()[1]:
+            return None
+        old_rules = mod.build_account_rules(old_rule_set.df)
+        new_rules = mod.build_account_rules(new_rule_set.df)
+        if old_rules is None or new_rules is None:
+            return None
+        keywords = changed_account_keywords(old_rules, new_rules)
+        if keywords is None:
+            return None
+        if safe_read_data_json and CARD_AFTER_PATH.endswith('.json'):
+            after_df = safe_read_data_json(CARD_AFTER_PATH, default_empty=True)
+        else:
+            after_df = pd.read_excel(CARD_AFTER_PATH, engine='openpyxl')
+        if after_df is None or after_df.empty or '카테고리' not in after_df.columns or '키워드' not in after_df.columns:
+            return None
+        index = get_row_index('card', CARD_BEFORE_PATH, CARD_AFTER_PATH, lambda: _build_card_merchant_index(mod))
+        if index is None or len(index) != len(after_df):
+            return None
+        rows, cats, kws = index.reclassify(compile_account_rules(new_rules), keywords)
+        kws = np.array([str(k).strip() for k in kws], dtype=object)
+        changed = patch_after_rows(after_df, rows, cats, kws)
+        if changed:
+            if safe_write_data_json and CARD_AFTER_PATH.endswith('.json'):
+                safe_write_data_json(CARD_AFTER_PATH, after_df)
+            else:
+                after_df.to_excel(CARD_AFTER_PATH, index=False, engine='openpyxl')
+            remember_row_index('card', CARD_BEFORE_PATH, CARD_AFTER_PATH, index)
+            # 캐시 행도 같은 위치로 갱신 (캐시가 없으면 다음 조회 시 파일에서 읽음)
+            if _card_after_cache is not None and len(_card_after_cache) == len(after_df):
+                patch_after_rows(_card_after_cache, rows, cats, kws)
+                try:
+                    _card_after_cache_mtime = Path(CARD_AFTER_PATH).stat().st_mtime
+                except OSError:
+                    _card_after_cache_mtime = None
+            else:
+                _card_after_cache = None
+                _card_after_cache_mtime = None
+        record_after_rules(CARD_AFTER_PATH, new_rule_set.fingerprint)
+        return len(rows)
+    except Exception:
+        traceback.print_exc()
+        return None
+
+
+def _reclassify_card_after_full():
+    """증분 재분류가 불가할 때: card_before 전체를 현재 규칙으로 다시 분류해 card_after 저장·캐시 무효화.
+    Returns: card_after 행 수. card_before/card_after가 없거나 실패면 None."""
+    global _card_after_cache, _card_after_cache_mtime
+    if not Path(CARD_AFTER_PATH).exists() or not Path(CARD_BEFORE_PATH).exists():
+        return None
+    success, error, count = _create_card_after()
+    if not success:
+        print(f"card_after 재분류 실패: {error}", flush=True)
+        return None
+    _card_after_cache = None
+    _card_after_cache_mtime = None
+    return count
+
+
+def _card_after_frame(mod, df_card, apply_categories=True):
+    """card_before 행 → card_after 행 (가맹점명 보정·계정과목 분류·후처리·카드번호 필터·컬럼 정리). 저장하지 않음.
+    _create_card_after 와 업로드 증분 반영(새 행만 분류) 공용. apply_categories=False 면 분류 없이 미분류."""
+    df_card.columns = [str(c).strip() for c in df_card.columns]
+    if not df_card.empty and '할부' in df_card.columns and '구분' not in df_card.columns:
+        df_card = df_card.rename(columns={'할부': '구분'})
+
+    _fill_card_가맹점명(df_card)
+
+    # 신한카드/하나카드 + 사업자번호 없음 → 기본값 저장
+    _apply_카드사_사업자번호_기본값(df_card)
+
+    # 입금액 > 0 (환급) → 카테고리 현금처리 (우선 적용)
+    if '카테고리' not in df_card.columns:
+        df_card['카테고리'] = ''
+    if '입금액' in df_card.columns:
+        입금 = pd.to_numeric(df_card['입금액'], errors='coerce').fillna(0) > 0
+        if 입금.any():
+            df_card.loc[입금, '카테고리'] = '현금처리'
+
+    if apply_categories:
+        try:
+            full = load_category_table(CATEGORY_TABLE_PATH, default_empty=True)
+            if full is not None and not full.empty:
+                df_cat = normalize_category_df(full)
+                if not df_cat.empty:
+                    df_card = mod.apply_category_from_merchant(df_card, df_cat)
+        except Exception:
+            pass
+
+    # 후처리: 계정과목 분류 끝난 뒤, 저장 전에 수행 (전처리는 card_before 저장 시 이미 적용됨)
+    if hasattr(mod, '_apply_후처리_only_to_columns'):
+        df_card = mod._apply_후처리_only_to_columns(df_card, ['가맹점명', '카드사'])
+
+    # 카테고리 컬럼 없으면 추가, 비어 있거나 공백이면 '미분류' (card_before에 카테고리 없을 수 있음)
+    if '카테고리' not in df_card.columns:
+        df_card['카테고리'] = '미분류'
+    else:
+        empty_cat = df_card['카테고리'].fillna('').astype(str).str.strip() == ''
+        df_card.loc[empty_cat, '카테고리'] = '미분류'
+    # 카드번호 16자 이하 행 제외 후 card_after 저장
+    if not df_card.empty and '카드번호' in df_card.columns:
+        df_card = df_card[_card_after_row_mask(df_card)]
+    # 시간 제외: 이용시간(승인시간)은 유지, 그 외 '시간' 포함 컬럼 삭제
+    if not df_card.empty:
+        time_cols = [c for c in df_card.columns if '시간' in str(c) and c != '이용시간']
+        if time_cols:
+            df_card = df_card.drop(columns=time_cols, errors='ignore')
+        for col in ['이용일', '거래일']:
+            if col not in df_card.columns:
+                continue
+            ser = pd.to_datetime(df_card[col], errors='coerce')
+            df_card[col] = ser.dt.strftime('%Y-%m-%d').where(ser.notna(), df_card[col])
+    # 키워드: apply_category_from_merchant에서 매칭된 규칙의 키워드 저장. 없으면 빈 문자열.
+    if '키워드' not in df_card.columns:
+        df_card['키워드'] = ''
+    else:
+        df_card['키워드'] = df_card['키워드'].fillna('').astype(str).str.strip()
+    # 현금처리: 입금액/출금액 구조에서는 별도 변환 없음 (이미 입금액/출금액으로 저장됨)
+    # 구분: 할부 미사용. '폐업'만 유지, 그 외는 공백 (card_before 구분 그대로 반영)
+    if not df_card.empty and '구분' in df_card.columns:
+        df_card['구분'] = df_card['구분'].apply(
+            lambda v: '폐업' if v is not None and str(v).strip() == '폐업' else ''
+        )
+    # 이용시간 없으면 00:00:00으로 채움 (컬럼 없으면 추가, 값 비어 있으면 00:00:00)
+    if not df_card.empty:
+        if '이용시간' not in df_card.columns:
+            df_card['이용시간'] = '00:00:00'
+        else:
+            def _fill_time(v):
+                if v is None or (isinstance(v, float) and pd.isna(v)): return '00:00:00'
+                s = str(v).strip()
+                return '00:00:00' if not s else s
+            df_card['이용시간'] = df_card['이용시간'].apply(_fill_time)
+        if '취소' not in df_card.columns:
+            df_card['취소'] = ''
+    # 취소 컬럼: 0/NaN → '', "0 취소" 등은 '취소'만 저장 (Excel에 "취소"만 보이도록)
+    if not df_card.empty and '취소' in df_card.columns:
+        def _cancel_str(v):
+            if v is None or (isinstance(v, float) and pd.isna(v)):
+                return ''
+            s = str(v).strip()
+            if s in ('', '0', '0.0', 'nan'):
+                return ''
+            return '취소' if '취소' in s else s
+        df_card['취소'] = df_card['취소'].apply(_cancel_str)
+    # 컬럼 순서: 카드사, 카드번호, 이용일, 이용시간, 입금액, 출금액, 취소, 사업자번호, 구분, 키워드, 카테고리, 가맹점명 (구분은 card_before에서 유지)
+    card_after_cols = ['카드사', '카드번호', '이용일', '이용시간', '입금액', '출금액', '취소', '사업자번호', '구분', '키워드', '카테고리', '가맹점명']
+    existing = [c for c in card_after_cols if c in df_card.columns]
+    extra = [c for c in df_card.columns if c not in card_after_cols]
+    df_card = df_card.reindex(columns=existing + extra)
+    return df_card
+
+
 def _create_card_after(input_df=None):
     """card_before → card_after 생성. 은행거래 ensure_all_bank_files와 동일하게 전처리 화면에서 자동 생성 시 사용.
     input_df가 주어지면 파일 읽기 생략(재생성 시 before 메모리 재활용).
@@ -1765,117 +2178,17 @@ def _create_card_after(input_df=None):
             if df_card is None:
                 df_card = pd.DataFrame()
 
-        df_card.columns = [str(c).strip() for c in df_card.columns]
-        if not df_card.empty and '할부' in df_card.columns and '구분' not in df_card.columns:
-            df_card = df_card.rename(columns={'할부': '구분'})
         Path(CARD_AFTER_PATH).parent.mkdir(parents=True, exist_ok=True)
         had_category_file = Path(CATEGORY_TABLE_PATH).exists()
-
-        # 카드사/카드번호/입금액 또는 출금액이 있으면서 가맹점명이 공란이면 가맹점명에 카드사 저장
-        if not df_card.empty and all(c in df_card.columns for c in ['카드사', '카드번호', '가맹점명']):
-            has_amt = ('입금액' in df_card.columns and df_card['입금액'].notna().any()) or ('출금액' in df_card.columns and df_card['출금액'].notna().any())
-            if has_amt:
-                has_card = (
-                    (df_card['카드사'].fillna('').astype(str).str.strip() != '') &
-                    (df_card['카드번호'].fillna('').astype(str).str.strip() != '') &
-                    (df_card['가맹점명'].fillna('').astype(str).str.strip() == '')
-                )
-                df_card.loc[has_card, '가맹점명'] = df_card.loc[has_card, '카드사']
-            # 신한카드에서 가맹점명이 '신한카드'인 경우(카드론 등): '신한카드_카드론'으로 통일
-            sh_merchant = (
-                df_card['카드사'].fillna('').astype(str).str.strip().str.contains('신한', na=False) &
-                (df_card['가맹점명'].fillna('').astype(str).str.strip() == '신한카드')
-            )
-            if sh_merchant.any():
-                df_card.loc[sh_merchant, '가맹점명'] = '신한카드_카드론'
-
-        # 신한카드/하나카드 + 사업자번호 없음 → 기본값 저장
-        _apply_카드사_사업자번호_기본값(df_card)
-
-        # 입금액 > 0 (환급) → 카테고리 현금처리 (우선 적용)
-        if '카테고리' not in df_card.columns:
-            df_card['카테고리'] = ''
-        if '입금액' in df_card.columns:
-            입금 = pd.to_numeric(df_card['입금액'], errors='coerce').fillna(0) > 0
-            if 입금.any():
-                df_card.loc[입금, '카테고리'] = '현금처리'
-
-        if had_category_file:
-            try:
-                full = load_category_table(CATEGORY_TABLE_PATH, default_empty=True)
-                if full is not None and not full.empty:
-                    df_cat = normalize_category_df(full)
-                    if not df_cat.empty:
-                        df_card = mod.apply_category_from_merchant(df_card, df_cat)
-            except Exception:
-                pass
-
-        # 후처리: 계정과목 분류 끝난 뒤, 저장 전에 수행 (전처리는 card_before 저장 시 이미 적용됨)
-        if hasattr(mod, '_apply_후처리_only_to_columns'):
-            df_card = mod._apply_후처리_only_to_columns(df_card, ['가맹점명', '카드사'])
-
-        # 카테고리 컬럼 없으면 추가, 비어 있거나 공백이면 '미분류' (card_before에 카테고리 없을 수 있음)
-        if '카테고리' not in df_card.columns:
-            df_card['카테고리'] = '미분류'
-        else:
-            empty_cat = df_card['카테고리'].fillna('').astype(str).str.strip() == ''
-            df_card.loc[empty_cat, '카테고리'] = '미분류'
-        # 카드번호 16자 이하 행 제외 후 card_after 저장
-        if not df_card.empty and '카드번호' in df_card.columns:
-            df_card = df_card[df_card['카드번호'].astype(str).str.strip().str.len() > 16]
-        # 시간 제외: 이용시간(승인시간)은 유지, 그 외 '시간' 포함 컬럼 삭제
-        if not df_card.empty:
-            time_cols = [c for c in df_card.columns if '시간' in str(c) and c != '이용시간']
-            if time_cols:
-                df_card = df_card.drop(columns=time_cols, errors='ignore')
-            for col in ['이용일', '거래일']:
-                if col not in df_card.columns:
-                    continue
-                ser = pd.to_datetime(df_card[col], errors='coerce')
-                df_card[col] = ser.dt.strftime('%Y-%m-%d').where(ser.notna(), df_card[col])
-        # 키워드: apply_category_from_merchant에서 매칭된 규칙의 키워드 저장. 없으면 빈 문자열.
-        if '키워드' not in df_card.columns:
-            df_card['키워드'] = ''
-        else:
-            df_card['키워드'] = df_card['키워드'].fillna('').astype(str).str.strip()
-        # 현금처리: 입금액/출금액 구조에서는 별도 변환 없음 (이미 입금액/출금액으로 저장됨)
-        # 구분: 할부 미사용. '폐업'만 유지, 그 외는 공백 (card_before 구분 그대로 반영)
-        if not df_card.empty and '구분' in df_card.columns:
-            df_card['구분'] = df_card['구분'].apply(
-                lambda v: '폐업' if v is not None and str(v).strip() == '폐업' else ''
-            )
-        # 이용시간 없으면 00:00:00으로 채움 (컬럼 없으면 추가, 값 비어 있으면 00:00:00)
-        if not df_card.empty:
-            if '이용시간' not in df_card.columns:
-                df_card['이용시간'] = '00:00:00'
-            else:
-                def _fill_time(v):
-                    if v is None or (isinstance(v, float) and pd.isna(v)): return '00:00:00'
-                    s = str(v).strip()
-                    return '00:00:00' if not s else s
-                df_card['이용시간'] = df_card['이용시간'].apply(_fill_time)
-            if '취소' not in df_card.columns:
-                df_card['취소'] = ''
-        # 취소 컬럼: 0/NaN → '', "0 취소" 등은 '취소'만 저장 (Excel에 "취소"만 보이도록)
-        if not df_card.empty and '취소' in df_card.columns:
-            def _cancel_str(v):
-                if v is None or (isinstance(v, float) and pd.isna(v)):
-                    return ''
-                s = str(v).strip()
-                if s in ('', '0', '0.0', 'nan'):
-                    return ''
-                return '취소' if '취소' in s else s
-            df_card['취소'] = df_card['취소'].apply(_cancel_str)
-        # 컬럼 순서: 카드사, 카드번호, 이용일, 이용시간, 입금액, 출금액, 취소, 사업자번호, 구분, 키워드, 카테고리, 가맹점명 (구분은 card_before에서 유지)
-        card_after_cols = ['카드사', '카드번호', '이용일', '이용시간', '입금액', '출금액', '취소', '사업자번호', '구분', '키워드', '카테고리', '가맹점명']
-        existing = [c for c in card_after_cols if c in df_card.columns]
-        extra = [c for c in df_card.columns if c not in card_after_cols]
-        df_card = df_card.reindex(columns=existing + extra)
+        fingerprint = rules_fingerprint(CATEGORY_TABLE_PATH) if had_category_file else None
+        df_card = _card_after_frame(mod, df_card, apply_categories=had_category_file)
         card_after_path = Path(CARD_AFTER_PATH)
         if safe_write_data_json and str(card_after_path).endswith('.json'):
             safe_write_data_json(str(CARD_AFTER_PATH), df_card)
         else:
             df_card.to_excel(str(CARD_AFTER_PATH), index=False, engine='openpyxl')
+        # 증분 재분류 기준: 이 after 를 만든 규칙 세트 지문 (미분류 저장이면 없음)
+        record_after_rules(CARD_AFTER_PATH, fingerprint)
 
         if not had_category_file:
             try:
@@ -1895,7 +2208,9 @@ def _create_card_after(input_df=None):
 @ensure_working_directory
 def generate_category():
     """card_before → card_after 생성. category_table(신용카드) 규칙으로 카테고리(계정과목 등) 적용 후 저장."""
-    success, error, count = _create_card_after()
+    # 감시 재생성과 겹치지 않게 after 를 다시 만든다
+    with source_watcher.exclusive():
+        success, error, count = _create_card_after()
     if success:
         had_category_file = Path(CATEGORY_TABLE_PATH).exists()
         return jsonify({
@@ -2036,6 +2351,9 @@ def print_analysis():
 # category_table(신용카드) 섹션 없으면 기본 규칙으로 생성 (모듈 로드 시 한 번)
 _ensure_card_category_file()
 
+# .source/Card 감시 등록 (app.py 가 MYINFO_SOURCE_WATCH=1 일 때 감시 시작)
+source_watcher.register('card', SOURCE_CARD_DIR, _rebuild_from_source_watch, outputs=(CARD_BEFORE_PATH, CARD_AFTER_PATH))
+
 if __name__ == '__main__':
     # 현재 디렉토리를 스크립트 위치로 변경
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -19,14 +19,13 @@ process_card_data.py — 카드 전용. source → 전처리 → before / before
 - 계정과목: 가맹점명 기반 키워드 매칭으로 카테고리 부여
 .source는 .xls, .xlsx만 취급.
 """
+import hashlib
 import numpy as np
 import pandas as pd
 import os
 import re
 import sys
-import unicodedata
 import time
-from datetime import datetime, timedelta
 from pathlib import Path
 
 # Windows 콘솔 인코딩 설정 (한글 출력을 위한 UTF-8 설정)
@@ -55,6 +54,12 @@ CARD_BEFORE_COLUMNS = [
     '카드사', '카드번호', '이용일', '이용시간', '입금액', '출금액', '취소', '가맹점명', '사업자번호', '구분'
 ]
 EXCEL_EXTENSIONS = ('*.xls', '*.xlsx')
+# 겹치는 내보내기(기간 중복·다시 받은 파일) 중복 판단 키 (추출 컬럼 기준)
+DEDUP_KEY_COLUMNS = ['카드사', '카드번호', '이용일', '이용시간', '이용금액', '가맹점명', '취소여부']
+# 업로드 파일을 기존 card_before 에 반영할 때 중복 판단 키 (card_before 컬럼 기준)
+BEFORE_DEDUP_KEY_COLUMNS = ['카드사', '카드번호', '이용일', '이용시간', '입금액', '출금액', '취소', '가맹점명']
+# 마지막 integrate_card_excel 에서 앞선 파일과 겹쳐 제거한 행 수 {파일명: 건수}
+LAST_INTEGRATE_DUPLICATES = {}
 SEARCH_COLUMNS = ['적요', '내용', '거래점', '송금메모', '가맹점명']
 # .source 헤더명 → card_before.xlsx 표준 컬럼 (카테고리는 category_table 신용카드 규칙으로 분류)
 # 헤더 행에서 인덱스를 취득하고, 다음 헤더 행이 나올 때까지 해당 인덱스로 매핑
@@ -73,6 +78,25 @@ HEADER_TO_STANDARD = {
 # 금액 컬럼으로 간주할 헤더 키워드 (포함 시 숫자로 변환)
 AMOUNT_COLUMN_KEYWORDS = ('금액', '입금', '출금', '잔액')
 
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+from column_kernels import (
+    business_number_column,
+    clean_amount,
+    clean_amount_column,
+    datetime_split_column,
+    fullwidth_column,
+    map_unique,
+    normalize_business_number as _normalize_business_number,
+    normalize_date_value as _normalize_date_value,
+    normalize_fullwidth as _normalize_fullwidth,
+    normalize_time_value as _normalize_time_value,
+    safe_str,
+    safe_str_column,
+    split_datetime_value as _split_datetime_value,
+)
+from row_dedup import drop_overlapping_rows
+
 try:
     from excel_io import safe_write_excel
 except ImportError:
@@ -90,40 +114,6 @@ except ImportError:
         return val
 
 
-def safe_str(value):
-    """NaN 값 처리 및 안전한 문자열 변환. 전처리/후처리 매칭용으로 주식회사·㈜ → (주) 통일."""
-    if pd.isna(value) or value is None:
-        return ""
-    val = str(value).strip()
-    if val.lower() in ['nan', 'na', 'n', 'none', '']:
-        return ""
-    val = normalize_주식회사_for_match(val)
-    val = val.replace('((', '(')
-    val = val.replace('))', ')')
-    val = val.replace('__', '_')
-    val = val.replace('{}', '')
-    val = val.replace('[]', '')
-    if val.count('(') != val.count(')'):
-        if val.count('(') > val.count(')'):
-            val = val.replace('(', '')
-        elif val.count(')') > val.count('('):
-            val = val.replace(')', '')
-    return val
-
-def clean_amount(value):
-    """금액 데이터 정리 (쉼표 제거, 숫자 변환)."""
-    if pd.isna(value) or value == '' or value == 0:
-        return 0
-    if isinstance(value, (int, float)):
-        return float(value)
-    value_str = str(value).replace(',', '').strip()
-    if value_str == '' or value_str == '-':
-        return 0
-    try:
-        return float(value_str)
-    except (ValueError, TypeError):
-        return 0
-
 if safe_write_excel is None:
     def safe_write_excel(df, filepath, max_retries=3):
         import time as _t
@@ -172,34 +162,6 @@ def remove_numbers(text):
     return re.sub(r'\d+', '', text)
 
 
-def _business_number_digits(value):
-    """사업자번호 셀 값에서 숫자만 추출(10자리). Excel 숫자형(1234567890.0)·9자리(앞 0 제거) 보정."""
-    if pd.isna(value) or value == '':
-        return None
-    if isinstance(value, (int, float)) and not isinstance(value, bool):
-        n = int(float(value))
-        if n < 0 or n >= 10 ** 10:
-            return None
-        return str(n).zfill(10) if n < 10 ** 9 else str(n)
-    s = str(value).strip()
-    digits = re.sub(r'\D', '', s)
-    if len(digits) == 8:
-        return digits.zfill(10)
-    if len(digits) == 9:
-        return digits.zfill(10)
-    if len(digits) == 10:
-        return digits
-    return None
-
-
-def _normalize_business_number(value):
-    """사업자번호를 000-00-00000 형식으로만 정규화. card_before에는 이 형식만 저장(신한 숫자형·9자리 보정)."""
-    digits = _business_number_digits(value)
-    if digits is None:
-        return ''
-    return f'{digits[:3]}-{digits[3:5]}-{digits[5:]}'
-
-
 def _normalize_구분(val):
     """구분(할부)을 숫자(int) 또는 일시불('')로 정규화. 0/일시불 → '', 3/6/12 등 → int. '3개월' 등에서 숫자만 추출."""
     if val is None or (isinstance(val, float) and pd.isna(val)):
@@ -233,7 +195,7 @@ def _amount_columns_to_numeric(df):
     """컬럼명에 금액·입금·출금·잔액이 포함된 컬럼을 숫자형으로 변환."""
     for col in df.columns:
         if any(kw in str(col) for kw in AMOUNT_COLUMN_KEYWORDS):
-            df[col] = df[col].map(clean_amount)
+            df[col] = clean_amount_column(df[col])
     return df
 
 
@@ -287,24 +249,48 @@ def _get_header_like_strings():
     return s
 
 
+_HEADER_CELL_MATCHER = None
+_header_cell_memo = {}
+_HEADER_CELL_MEMO_MAX = 100000
+
+
+def _get_header_cell_matcher():
+    """헤더 문자열 매처: (헤더 문자열 하나라도 포함하는지 보는 정규식, 헤더 문자열의 모든 부분 문자열 집합)."""
+    global _HEADER_CELL_MATCHER
+    if _HEADER_CELL_MATCHER is None:
+        header_set = _get_header_like_strings()
+        pattern = re.compile('|'.join(re.escape(kw) for kw in sorted(header_set, key=len, reverse=True) if kw))
+        subs = {kw[i:j] for kw in header_set for i in range(len(kw)) for j in range(i + 1, len(kw) + 1)}
+        _HEADER_CELL_MATCHER = (pattern, subs)
+    return _HEADER_CELL_MATCHER
+
+
+def _is_header_like_cell(cell):
+    """셀 문자열이 헤더 문자열을 포함하거나 헤더 문자열의 일부인지 (kw in cell or cell in kw). 셀 값별 메모."""
+    hit = _header_cell_memo.get(cell)
+    if hit is None:
+        pattern, subs = _get_header_cell_matcher()
+        hit = cell in subs or pattern.search(cell) is not None
+        if len(_header_cell_memo) >= _HEADER_CELL_MEMO_MAX:
+            _header_cell_memo.clear()
+        _header_cell_memo[cell] = hit
+    return hit
+
+
 def _looks_like_header_row(row, columns):
     """행이 헤더 행인지 판별. columns: 검사할 컬럼 인덱스/키 iterable (source_columns 또는 range(num_cols))."""
-    header_set = _get_header_like_strings()
     match_count = 0
     non_empty = 0
     for c in columns:
         val = row.get(c, row.get(str(c)))
-        if pd.isna(val) or str(val).strip() == '':
+        if pd.isna(val):
             continue
-        non_empty += 1
         cell = str(val).strip()
-        if cell in header_set:
+        if cell == '':
+            continue
+        non_empty += 1
+        if _is_header_like_cell(cell):
             match_count += 1
-        else:
-            for kw in header_set:
-                if kw in cell or cell in kw:
-                    match_count += 1
-                    break
     if non_empty == 0:
         return False
     return match_count >= 2 and match_count >= non_empty * 0.5
@@ -332,30 +318,74 @@ def _build_mapping_from_header_row(row):
     return (idx_to_std, idx_과세유형)
 
 
-def _row_as_dict(row_tuple, num_cols):
-    """itertuples() 결과를 row.get(i)/row.index 호환 dict로 변환. header=None이면 _0,_1,_2,… (0-based)."""
-    d = {}
-    for i in range(num_cols):
-        v = getattr(row_tuple, '_' + str(i), None)
-        if v is None:
-            v = getattr(row_tuple, '_' + str(i + 1), None)
-        d[i] = v
-    d['index'] = list(range(num_cols))
+# 헤더 레이아웃 캐시: (카드사, 정규화 헤더 tuple) → (idx_to_std, idx_과세유형).
+# 같은 카드사 내보내기는 헤더 레이아웃이 같으므로 한 번 만든 매핑을 재사용한다.
+_LAYOUT_CACHE = {}
+# 헤더로 판별한 행 (카드사, 셀 값 tuple) → 레이아웃 키. 반복되는 헤더 행은 판별 없이 매핑
+_HEADER_ROW_CACHE = {}
+_HEADER_ROW_CACHE_MAX = 10000
+
+
+def _header_layout_key(row, card_company_from_file):
+    """헤더 레이아웃 키: (카드사, 셀별 정규화 헤더 문자열 tuple). 끝쪽 빈 칸은 제외."""
+    sig = [_normalize_header_string(row.get(i)) for i in row.index]
+    while sig and not sig[-1]:
+        sig.pop()
+    return (card_company_from_file, tuple(sig))
 
-    class RowLike:
-        __slots__ = ('_d', 'index')
 
-        def get(self, i, default=None):
-            return self._d.get(i, self._d.get(str(i), default))
+def _header_mapping_for_row(row, card_company_from_file):
+    """헤더 행 → (idx_to_std 복사본, idx_과세유형). 알려진 레이아웃이면 캐시된 매핑 사용."""
+    key = _header_layout_key(row, card_company_from_file)
+    cached = _LAYOUT_CACHE.get(key)
+    if cached is None:
+        cached = _build_mapping_from_header_row(row)
+        _LAYOUT_CACHE[key] = cached
+    return dict(cached[0]), cached[1]
 
-    r = RowLike()
-    r._d = d
-    r.index = d['index']
-    return r
 
+def _known_header_row(values, card_company_from_file):
+    """이미 헤더로 판별한 행과 값이 같으면 그 레이아웃의 (idx_to_std 복사본, idx_과세유형), 아니면 None."""
+    try:
+        key = _HEADER_ROW_CACHE.get((card_company_from_file, values))
+    except TypeError:
+        return None
+    cached = _LAYOUT_CACHE.get(key) if key is not None else None
+    if cached is None:
+        return None
+    return dict(cached[0]), cached[1]
+
+
+def _remember_header_row(values, row, card_company_from_file):
+    if len(_HEADER_ROW_CACHE) >= _HEADER_ROW_CACHE_MAX:
+        _HEADER_ROW_CACHE.clear()
+    try:
+        _HEADER_ROW_CACHE[(card_company_from_file, values)] = _header_layout_key(row, card_company_from_file)
+    except TypeError:
+        pass
 
-def _row_from_mapping(row, idx_to_std, card_company_from_file, idx_과세유형=None):
-    """인덱스 매핑으로 한 행을 추출용 컬럼 dict로 변환. 카드사는 파일명에서. 구분은 할부 미사용, 과세유형 '폐업'일 때만 '폐업' 저장."""
+
+class _SheetRow:
+    """셀 값 tuple 을 row.get(i) / row.index 로 읽는 행 래퍼 (헤더 판별·매핑 함수 공용). 시트마다 하나를 재사용."""
+    __slots__ = ('values', 'index')
+
+    def __init__(self):
+        self.values = ()
+        self.index = range(0)
+
+    def set(self, values):
+        self.values = values
+        self.index = range(len(values))
+
+    def get(self, i, default=None):
+        if type(i) is int and 0 <= i < len(self.values):
+            return self.values[i]
+        return default
+
+
+def _row_from_mapping(row, idx_to_std, card_company_from_file, idx_과세유형=None, normalize=True):
+    """인덱스 매핑으로 한 행을 추출용 컬럼 dict로 변환. 카드사는 파일명에서. 구분은 할부 미사용, 과세유형 '폐업'일 때만 '폐업' 저장.
+    normalize=False 이면 값 정규화(_normalize_row_values) 전 문자열 그대로 (컬럼 단위로 정규화할 때)."""
     new_row = {col: '' for col in _EXTRACT_COLUMNS}
     for i in sorted(idx_to_std.keys()):
         std_col = idx_to_std[i]
@@ -378,15 +408,9 @@ def _row_from_mapping(row, idx_to_std, card_company_from_file, idx_과세유형=
                 new_row['구분'] = '폐업'
     if card_company_from_file:
         new_row['카드사'] = card_company_from_file
-    return _normalize_row_values(new_row)
+    return _normalize_row_values(new_row) if normalize else new_row
 
 
-def _normalize_fullwidth(val):
-    """전각(Fullwidth) 문자 → 반각(Halfwidth) 변환 (예: ＳＫＴ５３２２ → SKT5322)."""
-    if pd.isna(val) or val == '':
-        return val
-    return unicodedata.normalize('NFKC', str(val).strip())
-
 def _normalize_row_values(new_row):
     """표준 행의 이용금액·사업자번호·구분·이용일 값을 정규화."""
     for col in ['카드사', '카드번호', '가맹점명']:
@@ -412,70 +436,6 @@ def _normalize_row_values(new_row):
     return new_row
 
 
-def _normalize_date_value(val):
-    """이용일 값을 YYYY-MM-DD 형식으로 정규화."""
-    if pd.isna(val) or val == '' or (isinstance(val, str) and not str(val).strip()):
-        return str(val).strip() if val else ''
-    try:
-        if hasattr(val, 'strftime'):
-            return val.strftime('%Y-%m-%d')
-        if isinstance(val, (int, float)) and not isinstance(val, bool):
-            n = int(float(val))
-            if n >= 1000:
-                base = datetime(1899, 12, 30)
-                return (base + timedelta(days=n)).strftime('%Y-%m-%d')
-            return str(val).strip()
-        s = str(val).strip()
-        if re.match(r'^\d{4}-\d{2}-\d{2}', s):
-            return s[:10]
-        if '/' in s or '-' in s or ('.' in s and re.match(r'^\d{4}\.\d', s)):
-            parts = re.split(r'[/\-.]', s)
-            if len(parts) >= 3:
-                a, b, c = [x.zfill(2) for x in parts[:3]]
-                if len(a) == 2:
-                    y = int(a)
-                    year = (2000 + y) if y < 50 else (1900 + y)
-                    return f'{year}-{b}-{c}'
-                return f'{a}-{b}-{c}' if len(a) == 4 else s
-        return s
-    except Exception:
-        return str(val).strip()
-
-
-def _split_datetime_value(val):
-    """이용일 컬럼에 'yy/mm/dd'만 있거나 'yy/mm/dd hh:mm:ss' 등이 섞인 경우 날짜/시간 분리.
-    반환: (date_str, time_str). 시간이 없으면 time_str은 ''."""
-    if pd.isna(val) or val == '' or (isinstance(val, str) and not str(val).strip()):
-        return ('', '')
-    s = str(val).strip()
-    if not s:
-        return ('', '')
-    # 공백 또는 T로 구분된 날짜+시간 패턴
-    if ' ' in s:
-        parts = s.split(None, 1)
-        if len(parts) == 2 and re.search(r'\d{1,2}:\d{1,2}', parts[1]):
-            return (parts[0].strip(), parts[1].strip())
-    if 'T' in s and re.search(r'\d{1,2}:\d{1,2}', s):
-        idx = s.index('T')
-        return (s[:idx].strip(), s[idx + 1:].strip())
-    return (s, '')
-
-
-def _normalize_time_value(val):
-    """시간 문자열을 hh:mm 또는 hh:mm:ss 형식으로 정규화."""
-    if pd.isna(val) or val == '' or (isinstance(val, str) and not str(val).strip()):
-        return ''
-    s = str(val).strip()
-    m = re.match(r'^(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?', s)
-    if m:
-        h, mi = m.group(1).zfill(2), m.group(2).zfill(2)
-        sec = m.group(3)
-        if sec is not None:
-            return f'{h}:{mi}:{sec.zfill(2)}'
-        return f'{h}:{mi}:00'
-    return s
-
-
 def _is_date_like_value(val):
     """이용일로 쓸 만한 값인지 판별. 0/1 같은 코드·순번은 False."""
     if pd.isna(val) or val == '':
@@ -518,67 +478,88 @@ def _row_to_standard_columns(row, source_columns):
     return _normalize_row_values(new_row)
 
 
-def _extract_rows_from_sheet(df, card_company_from_file):
-    """시트 DataFrame에서 추출용 행 리스트 추출 (이용금액 포함)."""
-    rows = []
-    num_cols = len(df.columns)
+def _is_blank_cell(v):
+    return v is None or (isinstance(v, str) and not v.strip()) or (isinstance(v, float) and v != v)
+
+
+def _extract_columns_from_rows(rows, card_company_from_file):
+    """시트 행(셀 값 tuple) 스트림 → 추출 컬럼 배열 {컬럼: list} (이용금액 포함).
+    첫 번째 비어 있지 않은 행으로 컬럼 매핑을 만들고, 이후 헤더처럼 보이는 행이 나오면 매핑을 갱신한다.
+    매핑은 헤더 레이아웃 캐시(_LAYOUT_CACHE)에서 가져오고, 이미 본 헤더 행은 판별 없이 바로 매핑한다."""
+    columns = {col: [] for col in _EXTRACT_COLUMNS}
+    row = _SheetRow()
     idx_to_std = None
     idx_과세유형 = None
-    for row_tuple in df.itertuples(index=False):
-        row = _row_as_dict(row_tuple, num_cols)
-        if all(pd.isna(row.get(i, None)) or str(row.get(i, '')).strip() == '' for i in range(num_cols)):
+    for values in rows:
+        if all(_is_blank_cell(v) for v in values):
             continue
+        row.set(values)
         if idx_to_std is None:
-            idx_to_std, idx_과세유형 = _build_mapping_from_header_row(row)
+            idx_to_std, idx_과세유형 = _header_mapping_for_row(row, card_company_from_file)
             continue
-        if _looks_like_header_row(row, range(num_cols)):
-            new_map, new_과세 = _build_mapping_from_header_row(row)
+        header = _known_header_row(values, card_company_from_file)
+        if header is None and _looks_like_header_row(row, row.index):
+            header = _header_mapping_for_row(row, card_company_from_file)
+            _remember_header_row(values, row, card_company_from_file)
+        if header is not None:
+            new_map, new_과세 = header
             for idx, std_col in list(idx_to_std.items()):
                 if idx not in new_map:
                     new_map[idx] = std_col
             idx_to_std = new_map
             idx_과세유형 = new_과세 if new_과세 is not None else idx_과세유형
             continue
-        new_row = _row_from_mapping(row, idx_to_std, card_company_from_file, idx_과세유형)
-        if all(not v or (isinstance(v, str) and not str(v).strip()) for v in new_row.values()):
+        new_row = _row_from_mapping(row, idx_to_std, card_company_from_file, idx_과세유형, normalize=False)
+        if not new_row['카드번호']:
             continue
-        card_no = new_row.get('카드번호', '')
-        if not card_no or (isinstance(card_no, str) and not str(card_no).strip()):
-            continue
-        rows.append(new_row)
-    return rows
+        for col in _EXTRACT_COLUMNS:
+            columns[col].append(new_row[col])
+    return _normalize_extracted_columns(columns)
+
+
+def _normalize_amount_text(v):
+    if v and str(v).replace(',', '').replace('-', '').strip():
+        return clean_amount(v)
+    return v
+
+
+def _normalize_extracted_columns(columns):
+    """_normalize_row_values 의 컬럼 버전: 추출 컬럼 배열을 고유값 단위로 정규화하고 카드번호 없는 행 제거."""
+    n = len(columns['카드번호'])
+    if not n:
+        return columns
+    out = {}
+    for col in ('카드사', '카드번호', '가맹점명'):
+        out[col] = fullwidth_column(columns[col])
+    out['이용금액'] = map_unique(columns['이용금액'], _normalize_amount_text)
+    out['사업자번호'] = business_number_column(columns['사업자번호'])
+    out['구분'] = map_unique(columns['구분'], lambda v: v if str(v).strip() == '폐업' else '')
+    out['취소여부'] = columns['취소여부']
+    dates, times = datetime_split_column(columns['이용일'])
+    use_time = [bool(t) and not str(cur).strip() for t, cur in zip(times, columns['이용시간'])]
+    out['이용일'] = dates
+    out['이용시간'] = np.where(use_time, times, np.asarray(columns['이용시간'], dtype=object))
+    card_no = out['카드번호']
+    keep = [bool(v) and not (isinstance(v, str) and not v.strip()) for v in card_no]
+    if all(keep):
+        return {col: list(out[col]) for col in _EXTRACT_COLUMNS}
+    return {col: [v for v, k in zip(out[col], keep) if k] for col in _EXTRACT_COLUMNS}
 
 
 def _load_prepost_rules(category_path=None):
-    """category_table.json에서 전처리/후처리 규칙만 로드. 반환: (전처리_list, 후처리_list), 각 항목은 {'키워드': str, '카테고리': str}."""
+    """category_table.json에서 전처리/후처리 규칙만 로드. 반환: (전처리_list, 후처리_list), 각 항목은 {'키워드': str, '카테고리': str}.
+    파일 내용이 같으면 category_rules 캐시의 규칙을 재사용."""
     path = Path(category_path or os.path.join(PROJECT_ROOT, '.source', 'category_table.json'))
     if not path.exists():
         return [], []
     try:
-        from category_table_io import load_category_table, normalize_category_df
-        full = load_category_table(str(path), default_empty=True)
-        if full is None or full.empty:
-            return [], []
-        full = normalize_category_df(full).fillna('')
-        full.columns = [str(c).strip() for c in full.columns]
-        if '분류' not in full.columns or '키워드' not in full.columns or '카테고리' not in full.columns:
+        from category_rules import get_rule_set
+        rule_set = get_rule_set(str(path))
+        if rule_set is None or rule_set.df.empty:
             return [], []
-        전처리 = []
-        후처리 = []
-        for _, row in full.iterrows():
-            분류 = str(row.get('분류', '')).strip()
-            키워드 = str(row.get('키워드', '')).strip()
-            카테고리 = str(row.get('카테고리', '')).strip()
-            if not 키워드:
-                continue
-            if 분류 == '전처리':
-                전처리.append({'키워드': 키워드, '카테고리': 카테고리})
-            elif 분류 == '후처리':
-                후처리.append({'키워드': 키워드, '카테고리': 카테고리})
         # 긴 키워드 먼저 적용 (부분 치환 방지)
-        전처리.sort(key=lambda x: len(x['키워드']), reverse=True)
-        후처리.sort(key=lambda x: len(x['키워드']), reverse=True)
-        return 전처리, 후처리
+        전처리, 후처리 = rule_set.card_prepost_rules()
+        return list(전처리), list(후처리)
     except Exception as e:
         print(f"전처리/후처리 규칙 로드 실패: {e}", flush=True)
         return [], []
@@ -592,19 +573,26 @@ def _apply_rules_to_columns(df, columns_to_apply, rule_list):
     for col in columns_to_apply:
         if col not in df.columns:
             continue
-        df[col] = df[col].fillna('').astype(str).apply(lambda v: safe_str(v))
+        df[col] = safe_str_column(df[col].fillna('').astype(str))
+    rules = []
+    for rule in rule_list:
+        kw = rule['키워드']
+        cat = rule['카테고리']
+        if not kw:
+            continue
+        kw_norm = normalize_주식회사_for_match(kw)
+        if not kw_norm:
+            continue
+        rules.append((kw_norm, cat))
+    if not rules:
+        return df
+    # 규칙 전체를 한 번 컴파일(긴 키워드 우선, 문자열 그대로 치환) → 컬럼당 한 번 스캔
+    from category_rewriter import compile_keyword_rules
+    rewriter = compile_keyword_rules(tuple(rules), template=False)
     for col in columns_to_apply:
         if col not in df.columns:
             continue
-        for rule in rule_list:
-            kw = rule['키워드']
-            cat = rule['카테고리']
-            if not kw:
-                continue
-            kw_norm = normalize_주식회사_for_match(kw)
-            if not kw_norm:
-                continue
-            df[col] = df[col].fillna('').astype(str).str.replace(kw_norm, cat, regex=False)
+        df[col] = rewriter.rewrite_series(df[col].fillna('').astype(str))
     return df
 
 
@@ -641,42 +629,100 @@ def _postprocess_combined_df(df):
         df.loc[sh_mask, '가맹점명'] = '신한카드_카드론'
     # 구분: 할부 미사용. 과세유형 '폐업'만 '폐업' 유지, 그 외는 모두 공백
     if '구분' in df.columns:
-        df['구분'] = df['구분'].apply(
-            lambda v: '폐업' if v is not None and str(v).strip() == '폐업' else ''
-        )
+        df['구분'] = map_unique(df['구분'], lambda v: '폐업' if v is not None and str(v).strip() == '폐업' else '')
     return df
 
 
-def integrate_card_excel(output_file=None, base_dir=None, skip_write=False):
+def _read_card_file_columns(file_path):
+    """카드 원본 파일 1개 → 추출 컬럼 배열 {컬럼: list}. Returns: (컬럼 배열, 오류 없이 읽었는지).
+    읽기 실패한 시트의 행은 넣지 않음."""
+    name = file_path.name
+    card_company_from_file = _card_company_from_filename(name)
+    columns = {col: [] for col in _EXTRACT_COLUMNS}
+    ok = True
+    try:
+        from excel_backend import iter_sheet_rows
+        for sheet_name, rows in iter_sheet_rows(file_path):
+            try:
+                sheet_columns = _extract_columns_from_rows(rows, card_company_from_file)
+            except Exception as e:
+                ok = False
+                print(f"오류: {name} 시트 '{sheet_name}' 읽기 실패 - {e}")
+                continue
+            for col in _EXTRACT_COLUMNS:
+                columns[col].extend(sheet_columns[col])
+    except Exception as e:
+        ok = False
+        print(f"오류: {name} 처리 실패 - {e}")
+    return columns, ok
+
+
+def _ingest_cache_version():
+    """파일별 읽기 캐시 버전: 이 모듈·column_kernels·excel_backend 소스 해시 + 엑셀 엔진 설정
+    (추출 코드·열 정규화·엔진이 바뀌면 캐시 전체 무효)."""
+    import column_kernels
+    import excel_backend
+    h = hashlib.sha1()
+    try:
+        for path in (os.path.abspath(__file__), column_kernels.__file__, excel_backend.__file__):
+            with open(path, 'rb') as f:
+                h.update(f.read())
+    except OSError:
+        return None
+    h.update(excel_backend.engine_preference().encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def integrate_card_excel(output_file=None, base_dir=None, skip_write=False, files=None):
     """MyInfo/.source/Card 의 카드 엑셀을 모아 MyCard/card_before.xlsx 생성.
 
     - 테이블 헤더: 카드사, 카드번호, 이용일, 이용시간, 입금액, 출금액, 취소, 가맹점명, 사업자번호, 구분
     - skip_write=True 이면 파일 쓰지 않고 DataFrame만 반환.
+    - files: 지정하면 .source/Card 대신 이 파일들만 읽음 (읽기 캐시 미사용, 업로드 증분 반영용)
 
     base_dir: 무시됨. 원본: .source/Card, 출력: MyCard 폴더.
     """
     source_dir = Path(SOURCE_CARD_DIR)
     output_path = Path(_SCRIPT_DIR) / (output_file or CARD_BEFORE_FILE)
 
-    all_rows = []
-    for file_path in _card_excel_files(source_dir):
-        name = file_path.name
-        suf = file_path.suffix.lower()
-        card_company_from_file = _card_company_from_filename(name)
+    # 이전 실행과 같은 원본 파일(크기·mtime 또는 내용 해시)은 캐시된 추출 컬럼 사용, 새 파일·바뀐 파일만 읽음
+    cache = None
+    if files is None:
         try:
-            engine = 'xlrd' if suf == '.xls' else 'openpyxl'
-            xls = pd.ExcelFile(file_path, engine=engine)
-            for sheet_name in xls.sheet_names:
-                try:
-                    df = pd.read_excel(file_path, sheet_name=sheet_name, header=None, engine=engine)
-                    if df is not None and not df.empty:
-                        all_rows.extend(_extract_rows_from_sheet(df, card_company_from_file))
-                except Exception as e:
-                    print(f"오류: {name} 시트 '{sheet_name}' 읽기 실패 - {e}")
-        except Exception as e:
-            print(f"오류: {name} 처리 실패 - {e}")
-
-    extract_df = pd.DataFrame(all_rows, columns=_EXTRACT_COLUMNS) if all_rows else pd.DataFrame(columns=_EXTRACT_COLUMNS)
+            from ingest_cache import get_ingest_cache
+            version = _ingest_cache_version()
+            cache = get_ingest_cache('card', version, PROJECT_ROOT) if version else None
+        except ImportError:
+            cache = None
+    global LAST_INTEGRATE_DUPLICATES
+    all_columns = {col: [] for col in _EXTRACT_COLUMNS}
+    row_sources = []
+    card_files = _card_excel_files(source_dir) if files is None else [Path(p) for p in files]
+    for file_path in card_files:
+        stamp = None
+        columns = None
+        if cache is not None:
+            hit, columns, stamp = cache.lookup(file_path)
+        if columns is None:
+            columns, ok = _read_card_file_columns(file_path)
+            if cache is not None and ok:
+                cache.store(file_path, stamp, columns)
+        for col in _EXTRACT_COLUMNS:
+            all_columns[col].extend(columns[col])
+        row_sources.extend([file_path.name] * len(columns['카드번호']))
+    if cache is not None:
+        cache.save(card_files)
+
+    if all_columns['카드번호']:
+        extract_df = pd.DataFrame(all_columns, columns=_EXTRACT_COLUMNS)
+    else:
+        extract_df = pd.DataFrame(columns=_EXTRACT_COLUMNS)
+    # 겹치는 원본 중복 행 제거: 파일 읽은 순서 기준, 앞선 파일 행 유지
+    extract_df, LAST_INTEGRATE_DUPLICATES = drop_overlapping_rows(extract_df, DEDUP_KEY_COLUMNS, row_sources)
+    for name, count in LAST_INTEGRATE_DUPLICATES.items():
+        print(f"중복 제거: {name} {count}건 (앞선 원본 파일과 겹침)")
+    if LAST_INTEGRATE_DUPLICATES:
+        extract_df = extract_df.reset_index(drop=True)
     extract_df = _postprocess_combined_df(extract_df)
 
     # 이용금액 → 입금액/출금액/취소 변환 (card_before 저장용)
@@ -720,7 +766,7 @@ def integrate_card_excel(output_file=None, base_dir=None, skip_write=False):
                 if v is None or (isinstance(v, float) and pd.isna(v)): return '00:00:00'
                 s = str(v).strip()
                 return '00:00:00' if not s else s
-            combined_df['이용시간'] = combined_df['이용시간'].apply(_fill_이용시간)
+            combined_df['이용시간'] = map_unique(combined_df['이용시간'], _fill_이용시간)
 
         # 가맹점명 "신한카드_카드론": 출금액(상환)을 입금액으로 옮기고 출금액 0
         if '가맹점명' in combined_df.columns and '입금액' in combined_df.columns and '출금액' in combined_df.columns:
@@ -803,71 +849,72 @@ def create_category_table(df=None, category_filepath=None):
     return category_df
 
 
-def apply_category_from_merchant(df, category_df):
-    """가맹점명을 기초로 category_table(신용카드) 규칙을 적용해 df['카테고리'] 채움.
-    분류=계정과목만 사용. 키워드 길이 긴 순 적용. 기본값 기타거래, 매칭된 행만 계정과목으로 덮어씀."""
-    if df is None or df.empty or category_df is None or category_df.empty:
-        return df
-    if '가맹점명' not in df.columns:
-        return df
-    if '카테고리' not in df.columns:
-        df = df.copy()
-        df['카테고리'] = ''
-    if '키워드' not in df.columns:
-        df['키워드'] = ''
+def build_account_rules(category_df):
+    """계정과목 행 → 정렬된 규칙 ((카테고리, (키워드(주식회사 정규화), ...)), ...). 최대 키워드 길이 내림차순.
+    계정과목 행이 없으면 None."""
+    if category_df is None or category_df.empty:
+        return None
     category_df = category_df.copy()
     category_df.columns = [str(c).strip() for c in category_df.columns]
     need_cols = ['분류', '키워드', '카테고리']
     if not all(c in category_df.columns for c in need_cols):
-        return df
+        return None
     # 계정과목만 사용. 행별 최대 키워드 길이 기준 정렬(긴 것 먼저). 매칭된 키워드가 더 긴 경우에만 덮어씀.
     account_mask = (category_df['분류'].astype(str).str.strip() == '계정과목')
     account_df = category_df.loc[account_mask].copy()
     if account_df.empty:
-        return df
+        return None
     def _max_kw_len(s):
         parts = [k.strip() for k in str(s).split('/') if k.strip()]
         return max(len(k) for k in parts) if parts else 0
     account_df['_max_klen'] = account_df['키워드'].apply(_max_kw_len)
     account_df = account_df.sort_values('_max_klen', ascending=False).drop(columns=['_max_klen'], errors='ignore')
-    df = df.copy()
-    df['카테고리'] = df['카테고리'].astype(object)
-    df['키워드'] = df['키워드'].astype(object)
-    df['카테고리'] = '기타거래'
-    df['키워드'] = ''
-    df['_matched_kw_len'] = 0
-    merchants = df['가맹점명'].fillna('').astype(str).apply(safe_str)
+    rules = []
     for _, cat_row in account_df.iterrows():
         cat_val = safe_str(cat_row.get('카테고리', '')).strip() or '기타거래'
         keywords_str = safe_str(cat_row.get('키워드', ''))
         if not keywords_str:
             continue
         keywords = [k.strip() for k in keywords_str.split('/') if k.strip()]
-        if not keywords:
-            continue
         # 키워드도 주식회사→(주) 정규화해 매칭 (데이터는 이미 safe_str로 정규화됨)
         keywords_norm = [normalize_주식회사_for_match(k) for k in keywords if k]
-        if not keywords_norm:
-            continue
-        rule_match = pd.Series(False, index=df.index)
-        for kw in keywords_norm:
-            if kw:
-                rule_match |= merchants.str.contains(re.escape(kw), regex=False, na=False)
-        # 행별로 매칭된 키워드 중 가장 긴 것의 길이 (정규화된 키워드 기준)
-        def longest_matched(m):
-            matched = [k for k in keywords_norm if k and k in str(m)]
-            return max(matched, key=len) if matched else ''
-        matched_kw = merchants.apply(longest_matched)
-        matched_len = matched_kw.str.len()
-        # 기타거래(초기)이거나, 새로 매칭된 키워드가 기존보다 길 때만 덮어씀
-        fill_mask = rule_match & (
-            (df['카테고리'].fillna('').astype(str) == '기타거래') | (matched_len > df['_matched_kw_len'])
-        )
-        if fill_mask.any():
-            df.loc[fill_mask, '카테고리'] = cat_val
-            df.loc[fill_mask, '키워드'] = matched_kw.loc[fill_mask]
-            df.loc[fill_mask, '_matched_kw_len'] = matched_len.loc[fill_mask]
-    df = df.drop(columns=['_matched_kw_len'], errors='ignore')
+        keywords_norm = [k for k in keywords_norm if k]
+        if keywords_norm:
+            rules.append((cat_val, tuple(keywords_norm)))
+    return tuple(rules)
+
+
+def merchant_search_texts(df):
+    """계정과목 매칭용 가맹점명 (safe_str 정규화)."""
+    return safe_str_column(df['가맹점명'].fillna('').astype(str))
+
+
+def apply_category_from_merchant(df, category_df):
+    """가맹점명을 기초로 category_table(신용카드) 규칙을 적용해 df['카테고리'] 채움.
+    분류=계정과목만 사용. 키워드 길이 긴 순 적용. 기본값 기타거래, 매칭된 행만 계정과목으로 덮어씀."""
+    if df is None or df.empty or category_df is None or category_df.empty:
+        return df
+    if '가맹점명' not in df.columns:
+        return df
+    if '카테고리' not in df.columns:
+        df = df.copy()
+        df['카테고리'] = ''
+    if '키워드' not in df.columns:
+        df['키워드'] = ''
+    rules = build_account_rules(category_df)
+    if rules is None:
+        return df
+    df = df.copy()
+    merchants = merchant_search_texts(df)
+    # 다중 패턴 매처(긴 키워드 우선 덮어쓰기 동일)로 같은 가맹점명은 한 번만 분류
+    from category_matcher import compile_account_rules
+    from classification_memo import get_classification_memo
+    matcher = compile_account_rules(rules)
+    # 이전 실행에서 분류한 가맹점명은 .source 분류 메모에서 재사용
+    cats, kws = matcher.match_series(merchants, memo=get_classification_memo('card', PROJECT_ROOT))
+    kws[pd.isna(kws)] = ''
+    df['카테고리'] = pd.Series(cats.tolist(), index=df.index)
+    df['키워드'] = pd.Series(kws.tolist(), index=df.index)
     return df
 
 
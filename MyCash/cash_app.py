@@ -50,6 +50,7 @@ CATEGORY_TABLE_PATH = str(Path(PROJECT_ROOT) / '.source' / 'category_table.json'
 LINKAGE_TABLE_JSON = str(Path(PROJECT_ROOT) / '.source' / 'linkage_table.json')
 # 원본 업로드용: .source/Cash. after: MyCash 폴더 JSON (cash_before 미사용)
 SOURCE_CASH_DIR = os.path.join(PROJECT_ROOT, '.source', 'Cash')
+UPLOAD_TMP_DIR = os.path.join(PROJECT_ROOT, '.source', 'upload_tmp')
 CASH_AFTER_PATH = os.path.join(SCRIPT_DIR, 'cash_after.json')
 # 금융정보(MyCash): card·cash 테이블 연동만 하지 않음. 은행/카드 데이터 불러와 병합(cash_after 생성)은 진행.
 MYCASH_ONLY_NO_BANK_CARD_LINK = False
@@ -103,6 +104,8 @@ from shared_app_utils import (
     json_safe as _json_safe,
     format_bytes,
 )
+from excel_backend import sheet_names as excel_sheet_names
+import upload_jobs
 ensure_working_directory = make_ensure_working_directory(SCRIPT_DIR)
 
 # ----- 파일·캐시 로드 (원본 목록, 전처리후, cash_after, bank_after, card_after) -----
@@ -126,8 +129,7 @@ def load_source_files():
         }
         
         try:
-            xls = pd.ExcelFile(file_path)
-            for sheet_name in xls.sheet_names:
+            for sheet_name in excel_sheet_names(file_path):
                 file_info['sheets'].append({
                     'name': sheet_name,
                     'filename': file_path.name
@@ -265,107 +267,121 @@ def load_card_after_file():
         print(f"오류: card_after 로드 실패 - {e}", flush=True)
         return pd.DataFrame()
 
-def _safe_keyword(val):
-    """키워드 값을 cash_after에 저장할 때 항상 문자열로 반환 (NaN/None → '')."""
-    if val is None or (isinstance(val, float) and pd.isna(val)):
-        return ''
-    return str(val).strip()
+def _strip_column(values):
+    """값 → 문자열 (NaN/None → '', 그 외 strip). 키워드·위험도키워드·기타거래 등."""
+    return pd.Series(values, dtype=object).fillna('').astype(str).str.strip()
 
 
-def _str_strip(val):
-    """값을 문자열로 정규화 (NaN/None → '', 그 외 strip). 업종코드 등에 사용."""
-    if val is None or (isinstance(val, float) and pd.isna(val)):
-        return ''
-    return str(val).strip()
+def _구분_column(values):
+    """card_after 구분 → cash_after 구분: '폐업'만 유지, 그 외·결측은 ''."""
+    s = _strip_column(values)
+    return s.where(s == '폐업', '')
 
 
-def _safe_구분(val):
-    """card_after 구분 값을 cash_after에 저장할 때 '폐업'만 유지, 그 외·결측은 ''."""
-    if val is None or (isinstance(val, float) and pd.isna(val)):
-        return ''
-    s = str(val).strip()
-    return '폐업' if s == '폐업' else ''
+def _사업자번호_column(values):
+    """사업자번호 → 문자열 ('nan'/'None' → '', float 표기 '.0' 제거)."""
+    s = _strip_column(values)
+    s = s.where(~s.isin(['nan', 'None']), '')
+    return s.where(~s.str.endswith('.0'), s.str[:-2])
 
 
-def _safe_사업자번호(val):
-    """사업자번호/사업자번호를 cash_after에 저장할 때 문자열로 반환 (NaN/float → 적절히 변환)."""
-    if val is None or (isinstance(val, float) and pd.isna(val)):
-        return ''
-    s = str(val).strip()
-    if s in ('', 'nan', 'None'):
-        return ''
-    if s.endswith('.0'):
-        s = s[:-2]
-    return s
+# ----- cash_after 병합: DataFrame 변환·업종분류·위험도 적용·저장 -----
+# 출처별 컬럼 매핑 {cash_after 컬럼: 원본 컬럼 후보}. 행마다 후보 중 값이 있는(참) 첫 값, 없으면 기본값
+# (행 단위 r.get(a) or r.get(b) or 기본값 과 같음: '', 0, None 은 값 없음, NaN 은 값 있음)
+CASH_AFTER_COLUMN_MAPPINGS = {
+    '은행거래': {
+        '금융사': ('은행명',), '계좌번호': ('계좌번호',), '거래일': ('거래일',), '거래시간': ('거래시간',),
+        '입금액': ('입금액',), '출금액': ('출금액',), '취소': ('취소', '구분'), '기타거래': ('기타거래',),
+        '카테고리': ('카테고리',),
+    },
+    '신용카드': {
+        '금융사': ('카드사',), '계좌번호': ('카드번호',), '거래일': ('이용일',), '거래시간': ('이용시간',),
+        '입금액': ('입금액',), '출금액': ('출금액',), '취소': ('취소',), '기타거래': ('가맹점명',),
+        '카테고리': ('카테고리',),
+    },
+}
+# 값 그대로 가져와 변환하는 컬럼 {cash_after 컬럼: (원본 컬럼, 컬럼 변환 함수)}. 매핑에 없는 출처는 ''
+CASH_AFTER_COLUMN_CONVERTERS = {
+    '은행거래': {'키워드': ('키워드', _strip_column)},
+    '신용카드': {
+        '키워드': ('키워드', _strip_column),
+        '사업자번호': ('사업자번호', _사업자번호_column),
+        '구분': ('구분', _구분_column),
+    },
+}
+_CASH_AFTER_DEFAULTS = {'입금액': 0, '출금액': 0}
+
+
+def _truthy_mask(values):
+    return np.fromiter(map(bool, values), dtype=bool, count=len(values))
+
+
+def _column_values(df, col):
+    """컬럼 값 object 배열. 없는 컬럼은 None (행 단위 r.get(col) 과 같음)."""
+    if col not in df.columns:
+        return np.full(len(df), None, dtype=object)
+    return df[col].to_numpy(dtype=object)
+
+
+def _first_present(df, candidates, default):
+    """행마다 candidates 컬럼 중 값이 있는(참) 첫 값, 모두 없으면 default (값 또는 행별 배열). 없는 컬럼은 건너뜀."""
+    out = np.array(default, dtype=object) if isinstance(default, np.ndarray) else np.full(len(df), default, dtype=object)
+    filled = np.zeros(len(df), dtype=bool)
+    for col in candidates:
+        if col not in df.columns:
+            continue
+        values = _column_values(df, col)
+        take = _truthy_mask(values) & ~filled
+        out[take] = values[take]
+        filled |= take
+    return out
+
+
+def _risk_keyword_candidates(df):
+    """위험도키워드 원본 컬럼 후보 (옛 이름 업종키워드·업종코드 호환). 해당 컬럼이 없으면 ()."""
+    first = next((c for c in ('위험도키워드', '업종키워드', '업종코드') if c in df.columns), None)
+    return (first, '업종코드', '업종키워드') if first else ()
+
+
+def _cash_after_source_columns(df, source):
+    """bank_after 또는 card_after → {cash_after 컬럼: 값 목록} (컬럼 단위 매핑·변환)."""
+    n = len(df)
+    cols = {
+        col: _first_present(df, candidates, _CASH_AFTER_DEFAULTS.get(col, ''))
+        for col, candidates in CASH_AFTER_COLUMN_MAPPINGS[source].items()
+    }
+    cols['기타거래'] = _strip_column(cols['기타거래'])
+    for col, (src, convert) in CASH_AFTER_COLUMN_CONVERTERS[source].items():
+        cols[col] = convert(_column_values(df, src))
+    # r.get(a) or r.get('업종코드') or r.get('업종키워드'): 모두 값이 없으면 마지막 후보 값
+    risk_cols = _risk_keyword_candidates(df)
+    if risk_cols:
+        cols['위험도키워드'] = _strip_column(_first_present(df, risk_cols[:-1], _column_values(df, risk_cols[-1])))
+    else:
+        cols['위험도키워드'] = ''
+    cols['출처'] = source
+    out = {}
+    for col in CASH_AFTER_CREATION_COLUMNS:
+        value = cols.get(col, '')
+        out[col] = [value] * n if isinstance(value, str) else list(value)
+    return out
 
 
-# ----- cash_after 병합: DataFrame 변환·업종분류·위험도 적용·저장 -----
 def _dataframe_to_cash_after_creation(df_bank, df_card):
-    """은행거래(bank_after) + 신용카드(card_after)를 병합하여 cash_after 생성용 DataFrame 반환. 키워드는 bank/card에서 반드시 복사."""
-    rows = []
-    def add_bank():
-        if df_bank is None or df_bank.empty:
-            return
-        kw_col = '키워드' if '키워드' in df_bank.columns else None
-        has_위험도키워드 = '위험도키워드' in df_bank.columns or '업종키워드' in df_bank.columns or '업종코드' in df_bank.columns
-        col_code = '위험도키워드' if '위험도키워드' in df_bank.columns else ('업종키워드' if '업종키워드' in df_bank.columns else '업종코드')
-        for _, r in df_bank.iterrows():
-            kw = _safe_keyword(r.get(kw_col) if kw_col else r.get('키워드', ''))
-            rows.append({
-                '금융사': r.get('은행명', '') or '',
-                '계좌번호': r.get('계좌번호', '') or '',
-                '거래일': r.get('거래일', '') or '',
-                '거래시간': r.get('거래시간', '') or '',
-                '입금액': r.get('입금액', 0) or 0,
-                '출금액': r.get('출금액', 0) or 0,
-                '취소': r.get('취소', '') or r.get('구분', '') or '',
-                '기타거래': (r.get('기타거래') or '').strip() or '',  # bank: bank_after 기타거래만 (없으면 "")
-                '키워드': kw,
-                '카테고리': r.get('카테고리', '') or '',
-                '사업자번호': '',
-                '구분': '',  # 구분은 폐업만 저장, 은행은 해당 없음
-                '출처': '은행거래',
-                '위험도키워드': _str_strip(r.get(col_code) or r.get('업종코드') or r.get('업종키워드')) if has_위험도키워드 else '',
-                '위험도분류': '',
-                '위험도': '',
-            })
-    def add_card():
-        if df_card is None or df_card.empty:
-            return
-        kw_col = '키워드' if '키워드' in df_card.columns else None
-        has_code = '위험도키워드' in df_card.columns or '업종키워드' in df_card.columns or '업종코드' in df_card.columns
-        col_c = '위험도키워드' if '위험도키워드' in df_card.columns else ('업종키워드' if '업종키워드' in df_card.columns else '업종코드')
-        for _, r in df_card.iterrows():
-            kw = _safe_keyword(r.get(kw_col) if kw_col else r.get('키워드', ''))
-            rows.append({
-                '금융사': r.get('카드사', '') or '',
-                '계좌번호': r.get('카드번호', '') or '',
-                '거래일': r.get('이용일', '') or '',
-                '거래시간': r.get('이용시간', '') or '',
-                '입금액': r.get('입금액', 0) or 0,
-                '출금액': r.get('출금액', 0) or 0,
-                '취소': r.get('취소', '') or '',
-                '기타거래': (r.get('가맹점명') or '').strip() or '',  # card: 가맹점명만 (없으면 "")
-                '키워드': kw,
-                '카테고리': r.get('카테고리', '') or '',
-                '사업자번호': _safe_사업자번호(r.get('사업자번호')),
-                '구분': _safe_구분(r.get('구분')),  # 폐업만 유지, 그 외 ''
-                '출처': '신용카드',
-                '위험도키워드': _str_strip(r.get(col_c) or r.get('업종코드') or r.get('업종키워드')) if has_code else '',
-                '위험도분류': '',
-                '위험도': '',
-            })
-    add_bank()
-    add_card()
-    if not rows:
+    """은행거래(bank_after) + 신용카드(card_after)를 병합하여 cash_after 생성용 DataFrame 반환. 키워드는 bank/card에서 반드시 복사.
+    CASH_AFTER_COLUMN_MAPPINGS·CONVERTERS 로 출처별 컬럼을 통째로 옮긴 뒤 은행 → 카드 순으로 한 번에 이어 붙인다."""
+    parts = [
+        _cash_after_source_columns(df, source)
+        for df, source in ((df_bank, '은행거래'), (df_card, '신용카드'))
+        if df is not None and not df.empty
+    ]
+    if not parts:
         return pd.DataFrame(columns=CASH_AFTER_CREATION_COLUMNS)
-    out = pd.DataFrame(rows)
-    for c in CASH_AFTER_CREATION_COLUMNS:
-        if c not in out.columns:
-            out[c] = '' if c not in ('입금액', '출금액') else 0
+    # 열마다 값 목록을 이어 붙여 한 번에 DataFrame 생성 (출처를 합친 값으로 dtype 추론)
+    out = pd.DataFrame({col: [v for part in parts for v in part[col]] for col in CASH_AFTER_CREATION_COLUMNS})
     # 키워드 컬럼이 반드시 문자열로 채워지도록 보장 (NaN/결측 없음)
     out['키워드'] = out['키워드'].fillna('').astype(str).str.strip()
-    return out[CASH_AFTER_CREATION_COLUMNS].copy()
+    return out
 
 
 def _apply_업종분류_from_linkage(df):
@@ -375,30 +391,23 @@ def _apply_업종분류_from_linkage(df):
     if df is None or df.empty or code_col not in df.columns:
         return
     try:
-        from linkage_table_io import get_linkage_map_for_apply
-        code_to_업종분류, code_to_리스크 = get_linkage_map_for_apply()
-        n_keys = len(code_to_업종분류) if code_to_업종분류 else 0
-        _log_cash_after("linkage 맵 로드 완료 (%d개 키), 행별 매칭 시작 (%d행)" % (n_keys, len(df)))
-        if not code_to_업종분류:
+        from linkage_table_io import get_linkage_lookup
+        lookup = get_linkage_lookup()
+        _log_cash_after("linkage 조회표 로드 완료 (%d개 키), 매칭 시작 (%d행)" % (len(lookup), len(df)))
+        if not len(lookup):
             return
         # 위험도 컬럼이 병합 시 ''로 채워져 str dtype이면, 0/float 대입 시 오류 나므로 미리 float로 통일
         if '위험도' in df.columns:
             df['위험도'] = pd.to_numeric(df['위험도'], errors='coerce').fillna(0).astype(float)
         codes = df[code_col].fillna('').astype(str).str.strip()
-        for i in df.index:
-            c = codes.at[i] if i in codes.index else ''
-            if c:
-                업종분류_val = code_to_업종분류.get(c, '')
-                리스크_str = code_to_리스크.get(c, '')
-                try:
-                    위험도_val = float(리스크_str) if 리스크_str else (5 if 업종분류_val else 0)
-                except (ValueError, TypeError):
-                    위험도_val = 5 if 업종분류_val else 0
-                df.at[i, 분류_col] = 업종분류_val
-                df.at[i, '위험도'] = 위험도_val
-            else:
-                df.at[i, '위험도'] = 0
-        _log_cash_after("linkage 행별 매칭 완료")
+        has_code = (codes != '').to_numpy()
+        분류, 위험도 = lookup.lookup(codes[has_code])
+        # 코드 있는 행: 조회 결과(없는 코드는 ''·0), 코드 없는 행: 위험도 0·분류 유지
+        df.loc[has_code, 분류_col] = 분류.to_numpy()
+        risk = np.zeros(len(df), dtype=float)
+        risk[has_code] = 위험도.to_numpy()
+        df['위험도'] = risk
+        _log_cash_after("linkage 매칭 완료")
     except Exception as e:
         _log_cash_after("linkage 매칭 예외(무시): %s" % e)
         print(f"위험도분류(linkage) 매칭 적용 중 오류(무시): {e}", flush=True)
@@ -414,49 +423,28 @@ def _apply_risk_category_by_keywords(df):
     if df is None or df.empty:
         return
     try:
-        cat_df = load_category_table(CATEGORY_TABLE_PATH, default_empty=True)
-        if cat_df is None or cat_df.empty or '분류' not in cat_df.columns:
+        from category_rules import get_rule_set
+        from category_matcher import compile_first_rules
+        rule_set = get_rule_set(CATEGORY_TABLE_PATH)
+        if rule_set is None:
             return
-        cat_df = normalize_category_df(cat_df)
-        risk_rows = cat_df[cat_df['분류'].fillna('').astype(str).str.strip().isin(RISK_CATEGORY_CHASU)]
-        if risk_rows.empty:
+        risk_rules = rule_set.keyword_rules(RISK_CATEGORY_CHASU)
+        if not risk_rules:
             return
-        # 컬럼 존재 여부
-        col_기타 = '기타거래' if '기타거래' in df.columns else None
-        col_kw = '키워드' if '키워드' in df.columns else None
-        col_금융 = '금융사' if '금융사' in df.columns else None
-        for i in df.index:
-            parts = []
-            if col_기타:
-                parts.append(str(df.at[i, col_기타] or '').strip())
-            if col_kw:
-                parts.append(str(df.at[i, col_kw] or '').strip())
-            if col_금융:
-                parts.append(str(df.at[i, col_금융] or '').strip())
-            search_text = ' '.join(parts)
-            if not search_text:
-                continue
-            for _, r in risk_rows.iterrows():
-                kw = (r.get('키워드') or '')
-                if isinstance(kw, float) and pd.isna(kw):
-                    kw = ''
-                kw = str(kw).strip()
-                if not kw:
-                    continue
-                cat = (r.get('카테고리') or '')
-                if isinstance(cat, float) and pd.isna(cat):
-                    cat = ''
-                cat = str(cat).strip()
-                for part in kw.replace(' ', '').split('/'):
-                    key = part.strip()
-                    if key and key in search_text:
-                        분류_col = '위험도분류' if '위험도분류' in df.columns else '업종분류'
-                        df.at[i, 분류_col] = cat
-                        df.at[i, '위험도'] = 5.0
-                        break
-                else:
-                    continue
-                break
+        # 검색 텍스트: 기타거래·키워드·금융사 (없는 컬럼 제외) 공백 연결
+        cols = [c for c in ('기타거래', '키워드', '금융사') if c in df.columns]
+        if not cols:
+            return
+        col_parts = [[str(v or '').strip() for v in df[c].tolist()] for c in cols]
+        search_texts = pd.Series([' '.join(p) for p in zip(*col_parts)], index=df.index, dtype=object)
+        # 규칙 전체를 오토마톤 하나로 컴파일, 같은 검색 텍스트는 한 번만 매칭 (키워드가 포함된 첫 번째 규칙의 카테고리)
+        cats = compile_first_rules(tuple(risk_rules)).match_series(search_texts)
+        matched = ~pd.isna(cats)
+        if not matched.any():
+            return
+        분류_col = '위험도분류' if '위험도분류' in df.columns else '업종분류'
+        df.loc[matched, 분류_col] = cats[matched]
+        df.loc[matched, '위험도'] = 5.0
     except Exception as e:
         print(f"고위험 분류(가상자산/증권/금전대부) 매칭 적용 중 오류(무시): {e}", flush=True)
 
@@ -530,19 +518,21 @@ def _load_bank_after_for_merge():
         print(f"오류: bank_after 병합용 로드 실패 - {e}", flush=True)
         return pd.DataFrame()
 
-def merge_bank_card_to_cash_after():
+def merge_bank_card_to_cash_after(reset_first=True):
     """bank_after + card_after를 병합하여 cash_after.json 생성. 둘 중 하나라도 있으면 생성 가능.
     금융정보(MyCash)에는 전처리·계정과목분류·후처리 없음. 은행/카드 after의 키워드·카테고리를 그대로 사용하고,
     업종분류(linkage_table)·위험도만 추가 적용. .bak 생성하지 않음. 성공 시 True.
-    병합 시작 시 금융정보(은행+카드) 병합조회 테이블(cash_after.json)을 초기화한 뒤 병합작업을 진행한다."""
+    병합 시작 시 금융정보(은행+카드) 병합조회 테이블(cash_after.json)을 초기화한 뒤 병합작업을 진행한다.
+    reset_first=False(감시 스레드 재생성): 초기화 없이 병합 끝난 뒤 파일·캐시만 교체."""
     try:
         _log_cash_after("========== cash_after 생성 시작 ==========")
         global _cash_after_cache, _cash_after_cache_mtime
-        _cash_after_cache = None
-        _cash_after_cache_mtime = None
-        _log_cash_after("캐시 초기화 완료")
+        if reset_first:
+            _cash_after_cache = None
+            _cash_after_cache_mtime = None
+            _log_cash_after("캐시 초기화 완료")
         # 금융정보(은행+카드) 병합조회 테이블(cash_after.json) 초기화 후 병합 시작
-        if safe_write_data_json and CASH_AFTER_PATH.endswith('.json'):
+        if reset_first and safe_write_data_json and CASH_AFTER_PATH.endswith('.json'):
             try:
                 safe_write_data_json(CASH_AFTER_PATH, pd.DataFrame())
                 _log_cash_after("cash_after.json 초기화 완료(0건), 병합작업 시작")
@@ -646,6 +636,17 @@ def merge_bank_card_to_cash_after():
         traceback.print_exc()
         return (False, str(e))
 
+def _rebuild_from_source_watch():
+    """source_watcher 콜백 (은행·카드 감시 재생성 후): cash_after 가 이미 있을 때만 다시 병합하고 캐시 교체.
+    처음 병합은 사용자가 병합작업에서 실행한다."""
+    if not os.path.isfile(CASH_AFTER_PATH):
+        return True
+    ok, err = merge_bank_card_to_cash_after(reset_first=False)
+    if not ok:
+        raise RuntimeError(err or 'cash_after 병합 실패')
+    load_category_file()
+    return True
+
 def _delete_cash_after_on_enter():
     """cash_after.json 삭제 및 캐시 초기화. 재생성(merge_bank_card_to_cash_after) 시에만 호출됨."""
     global _cash_after_cache, _cash_after_cache_mtime
@@ -714,6 +715,36 @@ def get_source_files():
             'files': []
         }), 500
 
+def _store_uploaded_source(path, report):
+    """upload_jobs 작업: 업로드 원본을 .source/Cash 로 옮김. 금융정보는 원본을 파싱하지 않음
+    (cash_after 는 bank_after·card_after 병합 → 은행·신용카드 업로드가 새 거래를 반영)."""
+    report('save', 50)
+    # 같은 이름 원본이 있으면 덮어쓰지 않고 다른 이름으로 저장
+    return {'filename': upload_jobs.move_to_source(path, SOURCE_CASH_DIR)}
+
+@app.route('/api/upload', methods=['POST'])
+@ensure_working_directory
+def upload_source_file():
+    """원본 엑셀 업로드 (multipart 'file' 또는 본문 + ?filename=) → .source/Cash 저장. 202 + job_id."""
+    if upload_jobs.content_too_large(request):
+        return jsonify({'ok': False, 'error': upload_jobs.TOO_LARGE_MESSAGE}), 413
+    filename, stream = upload_jobs.request_upload(request)
+    filename = upload_jobs.safe_filename(filename)
+    if not filename:
+        return jsonify({'ok': False, 'error': '.xls 또는 .xlsx 파일명이 필요합니다.'}), 400
+    job = upload_jobs.start_upload('cash', filename, stream, UPLOAD_TMP_DIR, _store_uploaded_source)
+    if job['state'] == 'error':
+        return jsonify({'ok': False, 'error': job['error'], 'job': job}), 413 if job['too_large'] else 500
+    return jsonify({'ok': True, 'job_id': job['id'], 'job': job}), 202
+
+@app.route('/api/upload/<job_id>')
+def get_upload_job(job_id):
+    """업로드 작업 진행 상태."""
+    job = upload_jobs.get_job(job_id)
+    if job is None or job['kind'] != 'cash':
+        return jsonify({'ok': False, 'error': '작업을 찾을 수 없습니다.'}), 404
+    return jsonify(job)
+
 def _df_memory_bytes(df):
     """DataFrame 메모리 바이트 수 (deep=True)."""
     if df is None or not isinstance(df, pd.DataFrame) or df.empty:
@@ -1119,6 +1150,23 @@ def category():
     """카테고리 페이지"""
     return render_template('category.html')
 
+@app.route('/api/category-impact')
+def get_category_impact():
+    """후보 키워드(/ 구분)가 은행·카드·금융정보 after에서 걸리는 행 수·카테고리별 건수·예시 행. 분류 검색 텍스트 n-gram 색인 사용 (첫 요청 때 생성)."""
+    try:
+        from category_impact import default_after_paths, impact_payload
+        paths = default_after_paths(PROJECT_ROOT)
+        paths.update({'bank': str(BANK_AFTER_PATH), 'card': str(CARD_AFTER_PATH), 'cash': CASH_AFTER_PATH})
+        limit = min(max(request.args.get('limit', default=5, type=int) or 5, 1), 50)
+        response = jsonify(impact_payload(request.args.get('keyword', ''), paths, limit=limit))
+        response.headers['Content-Type'] = 'application/json; charset=utf-8'
+        return response
+    except Exception as e:
+        traceback.print_exc()
+        response = jsonify({'error': str(e), 'results': {}})
+        response.headers['Content-Type'] = 'application/json; charset=utf-8'
+        return response, 500
+
 # 카테고리: MyInfo/.source/category_table.json 단일 테이블(구분 없음)
 @app.route('/api/bank_category')
 @ensure_working_directory
@@ -2242,6 +2290,13 @@ def help():
 # 서버 기동 시 로그 파일이 있도록 미리 생성 (경로: MyCash/cash_after_progress.log)
 _ensure_progress_log_file()
 
+# 은행·카드 감시 재생성 후 cash_after 다시 병합 (app.py 가 MYINFO_SOURCE_WATCH=1 일 때 감시 시작)
+try:
+    import source_watcher
+    source_watcher.register('cash', None, _rebuild_from_source_watch, depends_on=('bank', 'card'))
+except ImportError:
+    pass
+
 if __name__ == '__main__':
     # 현재 디렉토리를 스크립트 위치로 변경
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -38,6 +38,7 @@ CATEGORY_TABLE_FILE = os.path.join(os.environ.get('MYINFO_ROOT', PROJECT_ROOT),
 CASH_CATEGORY_LABEL = '금융정보'
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
+from column_kernels import safe_str, safe_str_column
 try:
     from excel_io import safe_write_excel
 except ImportError:
@@ -87,46 +88,12 @@ def ensure_all_cash_files():
     pass
 
 
-def safe_str(value):
-    """NaN 값 처리 및 안전한 문자열 변환. 전처리/후처리 매칭용으로 주식회사·㈜ → (주) 통일."""
-    if pd.isna(value) or value is None:
-        return ""
-    val = str(value).strip()
-    if val.lower() in ['nan', 'na', 'n', 'none', '']:
-        return ""
-    val = normalize_주식회사_for_match(val)
-    val = val.replace('((', '(')
-    val = val.replace('))', ')')
-    val = val.replace('__', '_')
-    val = val.replace('{}', '')
-    val = val.replace('[]', '')
-    if val.count('(') != val.count(')'):
-        if val.count('(') > val.count(')'):
-            val = val.replace('(', '')
-        elif val.count(')') > val.count('('):
-            val = val.replace(')', '')
-    return val
-
 def normalize_text(text):
     """텍스트 정규화 (대소문자 구분)"""
     if not text:
         return ""
     return str(text).strip()
 
-def clean_amount(value):
-    """금액 데이터 정리 (쉼표 제거, 숫자 변환)"""
-    if pd.isna(value) or value == '' or value == 0:
-        return 0
-    if isinstance(value, (int, float)):
-        return float(value)
-    value_str = str(value).replace(',', '').strip()
-    if value_str == '' or value_str == '-':
-        return 0
-    try:
-        return float(value_str)
-    except (ValueError, TypeError):
-        return 0
-
 if safe_write_excel is None:
     def safe_write_excel(df, filepath, max_retries=3):
         for attempt in range(max_retries):
@@ -395,7 +362,7 @@ def classify_and_save(input_file=None, output_file=None):
 
     for col in ['적요', '내용', '거래점', '송금메모']:
         if col in df.columns:
-            df[col] = df[col].apply(lambda v: safe_str(v))
+            df[col] = safe_str_column(df[col])
 
     df["입출금"] = df.apply(classify_1st_category, axis=1)
     if '계정과목' in category_tables:
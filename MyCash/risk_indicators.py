@@ -2,7 +2,7 @@
 """
 cash_after 생성 후 적용하는 위험도 지표 1~10호.
 
-1호를 기본값으로 두고, 2호 → 3호 → … → 10호 순차 적용하며 조건 만족 시 덮어씀.
+1호를 기본값으로 두고, 2호~10호 중 조건을 만족하는 가장 높은 호수를 적용 (2호 → 3호 → … → 10호 순차 덮어쓰기와 같음).
 
 - 1호: 분류제외지표, 0.1 — 2~10호에 해당하지 않은 거래.
 - 2호: 심야폐업지표, 0.5 — 금액 무관, 심야구분이거나 폐업이면 모두 해당. 구분이 폐업이면 2호만 사용.
@@ -10,10 +10,10 @@ cash_after 생성 후 적용하는 위험도 지표 1~10호.
 """
 from __future__ import annotations
 
-import json
 import os
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 
@@ -46,52 +46,6 @@ def _str(val) -> str:
     return str(val).strip()
 
 
-def _search_text(row, cols: List[str]) -> str:
-    parts = []
-    for c in cols:
-        if c not in row.index:
-            continue
-        v = row[c]
-        if v is None or (isinstance(v, float) and pd.isna(v)):
-            continue
-        parts.append(_str(v))
-    return ' '.join(parts)
-
-
-def _search_text_dedup(row, cols: List[str]) -> str:
-    raw = _search_text(row, cols)
-    if not raw:
-        return ''
-    tokens = raw.split()
-    seen = set()
-    unique = []
-    for t in tokens:
-        if t not in seen:
-            seen.add(t)
-            unique.append(t)
-    return ' '.join(unique)
-
-
-def _keyword_match(text: str, keywords: List[str]) -> bool:
-    if not text:
-        return False
-    t = text.lower()
-    for kw in keywords:
-        if kw.lower() in t:
-            return True
-    return False
-
-
-def _matched_keyword(text: str, keywords: List[str]) -> str:
-    if not text:
-        return ''
-    t = text.lower()
-    for kw in keywords:
-        if kw.lower() in t:
-            return kw
-    return ''
-
-
 def _parse_time_to_minutes(t: str) -> Optional[int]:
     """거래시간 문자열을 0~1439(자정 기준 분)로 변환. None이면 인식 불가."""
     if t is None or (isinstance(t, float) and pd.isna(t)):
@@ -113,48 +67,23 @@ def _parse_time_to_minutes(t: str) -> Optional[int]:
         return None
 
 
-def _load_simya_range(category_table_path: Optional[str]) -> Optional[Tuple[int, int]]:
-    """category_table에서 심야구분 키워드(예: 22:00:00/06:00:00) 로드. (시작분, 종료분) 0~1439. 넘침 구간이면 (22*60, 24*60), (0, 6*60) 형태로 (1320, 360) 반환."""
+def _get_rule_set(category_table_path: Optional[str]):
+    """category_rules 캐시에서 규칙 세트 조회. 파일 없거나 모듈 없으면 None."""
     if not category_table_path or not os.path.isfile(category_table_path):
         return None
     try:
-        with open(category_table_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        from category_rules import get_rule_set
+        return get_rule_set(category_table_path)
     except Exception:
         return None
-    if not isinstance(data, list):
+
+
+def _load_simya_range(category_table_path: Optional[str]) -> Optional[Tuple[int, int]]:
+    """category_table에서 심야구분 키워드(예: 22:00:00/06:00:00) 로드. (시작분, 종료분) 0~1439. 넘침 구간이면 (22*60, 24*60), (0, 6*60) 형태로 (1320, 360) 반환."""
+    rule_set = _get_rule_set(category_table_path)
+    if rule_set is None:
         return None
-    for item in data:
-        if not isinstance(item, dict):
-            continue
-        if _str(item.get('분류')) != '심야구분':
-            continue
-        kw = _str(item.get('키워드', ''))
-        if '/' not in kw:
-            continue
-        parts = kw.split('/')
-        if len(parts) != 2:
-            continue
-        start_s = parts[0].strip()
-        end_s = parts[1].strip()
-        # "22:00:00" -> 22*60+0 = 1320, "06:00:00" -> 6*60 = 360
-        def to_min(x):
-            x = x.replace(':', '').replace('.', '')[:4]
-            if len(x) < 4:
-                return None
-            try:
-                h, m = int(x[:2]), int(x[2:4])
-                if 0 <= h <= 23 and 0 <= m <= 59:
-                    return h * 60 + m
-            except ValueError:
-                pass
-            return None
-        start_m = to_min(start_s)
-        end_m = to_min(end_s)
-        if start_m is None or end_m is None:
-            continue
-        return (start_m, end_m)
-    return None
+    return rule_set.simya_range()
 
 
 def _is_simya(거래시간_str, simya_range: Optional[Tuple[int, int]]) -> bool:
@@ -175,43 +104,118 @@ def _load_업종분류_keywords(category_table_path: Optional[str]) -> Dict[str,
     """category_table.json에서 분류='업종분류'인 행만 추려, 카테고리(위험도분류명)별 키워드 리스트 반환.
     키워드 컬럼은 쉼표·슬래시·줄바꿈으로 구분된 문자열로 파싱."""
     result: Dict[str, List[str]] = {cls: [] for cls in RISK_CLASSES_5_10}
-    if not category_table_path or not os.path.isfile(category_table_path):
-        return result
-    try:
-        with open(category_table_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except Exception:
-        return result
-    if not isinstance(data, list):
+    rule_set = _get_rule_set(category_table_path)
+    if rule_set is None:
         return result
-    for item in data:
-        if not isinstance(item, dict):
-            continue
-        if _str(item.get('분류')) != '업종분류':
-            continue
-        cat = _str(item.get('카테고리', ''))
-        if cat not in result:
-            continue
-        kw_raw = item.get('키워드', '')
-        if kw_raw is None or (isinstance(kw_raw, float) and pd.isna(kw_raw)):
-            kw_raw = ''
-        kw_str = str(kw_raw).strip()
-        if not kw_str:
-            continue
-        # 쉼표·슬래시·줄바꿈으로 분리 후 공백 제거. '분류5호' 등 라벨은 검색 키워드에서 제외
-        for sep in (',', '/', '\n', '\r'):
-            kw_str = kw_str.replace(sep, ' ')
-        raw = [t.strip() for t in kw_str.split() if t.strip()]
-        tokens = [t for t in raw if not (len(t) >= 4 and t.startswith('분류') and t.endswith('호'))]
-        if tokens:
-            result[cat] = tokens
+    parsed = rule_set.업종분류_keywords()
+    for cls in RISK_CLASSES_5_10:
+        if cls in parsed:
+            result[cls] = list(parsed[cls])
     return result
 
 
+# 3~10호: 호수 → (위험도분류, 위험도, 출금액 하한). 5~10호 키워드는 위험도분류명으로 category_table 업종분류에서 로드.
+INDICATORS = {
+    3: ('자료소명지표', 1.0, 5_000_000),
+    4: ('비정형지표', 1.5, 1_000_000),
+    5: (CLASS_5호, 2.0, 500_000),
+    6: (CLASS_6호, 2.5, 500_000),
+    7: (CLASS_7호, 3.0, 500_000),
+    8: (CLASS_8호, 3.5, 500_000),
+    9: (CLASS_9호, 4.0, 300_000),
+    10: (CLASS_10호, 5.0, 100_000),
+}
+SEARCH_COLS = ['카테고리', '키워드', '기타거래']
+
+
+def _str_values(df, col) -> np.ndarray:
+    """컬럼 값마다 _str (결측 → '', 앞뒤 공백 제거). 없는 컬럼은 ''."""
+    if col not in df.columns:
+        return np.full(len(df), '', dtype=object)
+    return df[col].fillna('').astype(str).str.strip().to_numpy(dtype=object)
+
+
+def _search_text_codes(df) -> Tuple[np.ndarray, np.ndarray]:
+    """카테고리·키워드·기타거래 검색 텍스트 (토큰 중복 제거, 첫 등장 순서). 5~10호 공용으로 한 번만 만든다.
+    같은 값 조합은 한 번만 나누고 합친다. Returns: (행별 코드, 고유 검색 텍스트)."""
+    parts = [_str_values(df, c) for c in SEARCH_COLS]
+    raw = parts[0]
+    for p in parts[1:]:
+        raw = raw + ' ' + p
+    codes, uniques = pd.factorize(raw)
+    texts = np.array([' '.join(dict.fromkeys(t.split())) for t in uniques], dtype=object)
+    return codes, texts
+
+
+class _KeywordScanner:
+    """5~10호 키워드 목록 전체를 오토마톤 하나로 컴파일 (소문자 기준, 대소문자 무시).
+    scan(text) → 목록마다 text 에 포함된 첫 키워드 (목록 순서), 없으면 ''."""
+
+    def __init__(self, keyword_lists: List[List[str]]):
+        from category_matcher import KeywordAutomaton
+        self._automaton = KeywordAutomaton([kw.lower() for kws in keyword_lists for kw in kws])
+        self._lists = [[(kw, self._automaton.id_of(kw.lower())) for kw in kws] for kws in keyword_lists]
+
+    def scan(self, text: str) -> List[str]:
+        found = self._automaton.find(text.lower()) if text else set()
+        return [next((kw for kw, kid in kws if kid in found), '') for kws in self._lists]
+
+
+def _indicator_masks(df: pd.DataFrame, simya_range, keywords_5_10) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """호수 → (해당 행 마스크, 위험도키워드 값). 2호는 (마스크, None). 3~10호 마스크는 2호 행 제외."""
+    n = len(df)
+    폐업 = _str_values(df, '구분') == '폐업'
+    if simya_range is None:
+        simya = np.zeros(n, dtype=bool)
+    else:
+        simya = np.array([_is_simya(t, simya_range) for t in df['거래시간'].tolist()], dtype=bool)
+    is_2호 = 폐업 | simya
+    open_rows = ~is_2호
+    inp = np.array([_num(v) for v in df['입금액'].tolist()], dtype=float)
+    out = np.array([_num(v) for v in df['출금액'].tolist()], dtype=float)
+    out_only = inp <= 0
+    masks = {2: (is_2호, None)}
+
+    # 3호: 출금 500만 이상. 4호: 출금만 100만 이상 + 같은 키워드 3회 이상. 위험도키워드 = 키워드 또는 기타거래
+    키워드 = _str_values(df, '키워드')
+    row_kw = np.where(키워드 != '', 키워드, _str_values(df, '기타거래'))
+    masks[3] = (open_rows & (out >= INDICATORS[3][2]), row_kw)
+    out_only_1m = (out >= INDICATORS[4][2]) & out_only
+    kw = df['키워드'].fillna('').astype(str).str.strip().to_numpy()
+    counts = pd.Series(kw[out_only_1m]).value_counts()
+    frequent = np.isin(kw, counts.index[counts >= 3].to_numpy())
+    masks[4] = (open_rows & out_only_1m & frequent, row_kw)
+
+    # 5~10호: 출금만 하한 이상 + 업종분류 키워드 포함 (7호는 카테고리에 '가상자산'이 있어도 해당)
+    # 검색 텍스트는 한 번만 만들고, 대상 행의 고유 텍스트마다 한 번 스캔해 6개 목록의 매칭 키워드를 함께 구함
+    nos = range(5, 11)
+    keyword_lists = [keywords_5_10.get(INDICATORS[no][0], []) for no in nos]
+    candidates = open_rows & out_only & (out >= min(INDICATORS[no][2] for no in nos))
+    matched_all = np.full((n, len(keyword_lists)), '', dtype=object)
+    if candidates.any() and any(keyword_lists):
+        codes, texts = _search_text_codes(df)
+        idx = np.flatnonzero(candidates)
+        used, local = np.unique(codes[idx], return_inverse=True)
+        scanner = _KeywordScanner(keyword_lists)
+        hits = np.array([scanner.scan(t) for t in texts[used]], dtype=object).reshape(len(used), len(keyword_lists))
+        matched_all[idx] = hits[local]
+    crypto = np.array(['가상자산' in c for c in _str_values(df, '카테고리')], dtype=bool)
+    for j, no in enumerate(nos):
+        rows = open_rows & out_only & (out >= INDICATORS[no][2])
+        matched = matched_all[:, j]
+        hit = rows & (matched != '')
+        if no == 7:
+            matched = np.where(rows & crypto, '가상자산', matched)
+            hit |= rows & crypto
+        masks[no] = (hit, matched)
+    return masks
+
+
 def apply_risk_indicators(df: pd.DataFrame, category_table_path: Optional[str] = None) -> None:
     """
     cash_after DataFrame에 대해 1~10호 위험도 지표 적용. in-place 수정.
-    1호를 기본값으로 두고, 2호~10호를 순차 적용하며 조건 만족 시 덮어씀.
+    1호를 기본값으로 두고, 2호~10호 조건을 지표별 마스크로 구한 뒤 높은 호수 우선으로 선택
+    (2호→10호 순차 적용하며 조건 만족 시 덮어쓰던 결과와 같음).
     """
     if df is None or df.empty:
         return
@@ -243,15 +247,11 @@ def apply_risk_indicators(df: pd.DataFrame, category_table_path: Optional[str] =
         df['키워드'] = ''
     if '카테고리' not in df.columns:
         df['카테고리'] = ''
-    kw_series = df['키워드'].fillna('').astype(str).str.strip()
-
     sort_1 = [c for c in ['키워드', '거래일'] if c in df.columns]
     if sort_1:
         df.sort_values(by=sort_1, ascending=True, inplace=True, na_position='last')
 
-    # ---------- 2호: 심야폐업지표 0.5 — 금액 무관, 심야구분이거나 폐업이면 모두 2호 ----------
-    # 심야구분: category_table.json에서 분류='심야구분'인 행의 키워드(예: 22:00:00/06:00:00)로 시간 구간 로드.
-    # 폐업: cash_after의 '구분' 컬럼이 '폐업'인 행. 2호 해당 행은 3~10호 조건을 보지 않음.
+    # 2호: 심야구분은 category_table.json 분류='심야구분' 키워드(예: 22:00:00/06:00:00)의 시간 구간, 폐업은 '구분' 컬럼.
     if '거래시간' not in df.columns:
         df['거래시간'] = ''
     if '구분' not in df.columns:
@@ -259,156 +259,29 @@ def apply_risk_indicators(df: pd.DataFrame, category_table_path: Optional[str] =
     simya_range = _load_simya_range(category_table_path)
     keywords_5_10 = _load_업종분류_keywords(category_table_path)
 
-    df['_2호적용'] = False
-    for i in df.index:
-        is_폐업 = _str(df.at[i, '구분']).strip() == '폐업'
-        is_simya = _is_simya(df.at[i, '거래시간'], simya_range)
-        if not is_폐업 and not is_simya:
-            continue
-        df.at[i, '_2호적용'] = True
-        if has_업종:
-            df.at[i, '위험도분류'] = CLASS_2호
-        if has_위험도:
-            df.at[i, '위험도'] = 0.5
-
-    # ---------- 3호: 자료소명지표 1.0 (2호 해당 행은 skip) ----------
-    out_5m = df['출금액'].apply(_num) >= 5_000_000
-    for i in df.index:
-        if df.at[i, '_2호적용']:
-            continue
-        if out_5m[i]:
-            kw_val = _str(df.at[i, '키워드']) or (_str(df.at[i, '기타거래']) if '기타거래' in df.columns else '') or _str(df.at[i, '키워드'])
-            df.at[i, '위험도키워드'] = kw_val
-            if has_업종:
-                df.at[i, '위험도분류'] = '자료소명지표'
-            if has_위험도:
-                df.at[i, '위험도'] = 1.0
-
-    # 4호: 비정형지표 1.5 (기존 2호)
-    out_only_1m = (df['출금액'].apply(_num) >= 1_000_000) & (df['입금액'].apply(_num) <= 0)
-    df['_kw'] = kw_series
-    count_per_kw = df.loc[out_only_1m].groupby('_kw').size()
-    kw_3_or_more = set(count_per_kw[count_per_kw >= 3].index)
-    df['_4호대상'] = df['_kw'].isin(kw_3_or_more) & out_only_1m
-    for i in df.index:
-        if df.at[i, '_2호적용']:
-            continue
-        if df.at[i, '_4호대상']:
-            kw_val = _str(df.at[i, '키워드']) or (_str(df.at[i, '기타거래']) if '기타거래' in df.columns else '') or _str(df.at[i, '키워드'])
-            df.at[i, '위험도키워드'] = kw_val
-            if has_업종:
-                df.at[i, '위험도분류'] = '비정형지표'
-            if has_위험도:
-                df.at[i, '위험도'] = 1.5
-
     sort_2 = [c for c in ['카테고리', '키워드', '거래일'] if c in df.columns]
     if sort_2:
         df.sort_values(by=sort_2, ascending=True, inplace=True, na_position='last')
 
-    SEARCH_COLS = ['카테고리', '키워드', '기타거래']
-
-    # 5호: 투기성지표 2.0 (2호 해당 행은 skip). 키워드는 category_table 분류 '업종분류' 카테고리 '투기성지표'에서 로드.
-    kw5 = keywords_5_10.get(CLASS_5호, [])
-    for i in df.index:
-        if df.at[i, '_2호적용']:
-            continue
-        row = df.loc[i]
-        inp, out = _num(row.get('입금액')), _num(row.get('출금액'))
-        text = _search_text_dedup(row, SEARCH_COLS)
-        if out >= 500_000 and inp <= 0 and kw5 and _keyword_match(text, kw5):
-            df.at[i, '위험도키워드'] = _matched_keyword(text, kw5)
-            if has_업종:
-                df.at[i, '위험도분류'] = CLASS_5호
-            if has_위험도:
-                df.at[i, '위험도'] = 2.0
-
-    # 6호: 사기파산지표 2.5 (2호 해당 행은 skip). 키워드는 category_table 업종분류 '사기파산지표'에서 로드.
-    kw6 = keywords_5_10.get(CLASS_6호, [])
-    for i in df.index:
-        if df.at[i, '_2호적용']:
-            continue
-        row = df.loc[i]
-        inp, out = _num(row.get('입금액')), _num(row.get('출금액'))
-        text = _search_text_dedup(row, SEARCH_COLS)
-        if out >= 500_000 and inp <= 0 and kw6 and _keyword_match(text, kw6):
-            df.at[i, '위험도키워드'] = _matched_keyword(text, kw6)
-            if has_업종:
-                df.at[i, '위험도분류'] = CLASS_6호
-            if has_위험도:
-                df.at[i, '위험도'] = 2.5
-
-    # 7호: 가상자산지표 3.0 (2호 해당 행은 skip). 키워드는 category_table 업종분류 '가상자산지표'에서 로드.
-    kw7 = keywords_5_10.get(CLASS_7호, [])
-    for i in df.index:
-        if df.at[i, '_2호적용']:
-            continue
-        row = df.loc[i]
-        inp, out = _num(row.get('입금액')), _num(row.get('출금액'))
-        if out >= 500_000 and inp <= 0:
-            cat = _str(row.get('카테고리', ''))
-            text = _search_text_dedup(row, SEARCH_COLS)
-            if '가상자산' in cat:
-                df.at[i, '위험도키워드'] = '가상자산'
-                if has_업종:
-                    df.at[i, '위험도분류'] = CLASS_7호
-                if has_위험도:
-                    df.at[i, '위험도'] = 3.0
-            elif kw7 and _keyword_match(text, kw7):
-                df.at[i, '위험도키워드'] = _matched_keyword(text, kw7)
-                if has_업종:
-                    df.at[i, '위험도분류'] = CLASS_7호
-                if has_위험도:
-                    df.at[i, '위험도'] = 3.0
-
-    # 8호: 자산은닉지표 3.5 (2호 해당 행은 skip). 키워드는 category_table 업종분류 '자산은닉지표'에서 로드.
-    kw8 = keywords_5_10.get(CLASS_8호, [])
-    for i in df.index:
-        if df.at[i, '_2호적용']:
-            continue
-        row = df.loc[i]
-        inp, out = _num(row.get('입금액')), _num(row.get('출금액'))
-        text = _search_text_dedup(row, SEARCH_COLS)
-        if out >= 500_000 and inp <= 0 and kw8 and _keyword_match(text, kw8):
-            df.at[i, '위험도키워드'] = _matched_keyword(text, kw8)
-            if has_업종:
-                df.at[i, '위험도분류'] = CLASS_8호
-            if has_위험도:
-                df.at[i, '위험도'] = 3.5
-
-    # 9호: 과소비지표 4.0 (2호 해당 행은 skip). 키워드는 category_table 업종분류 '과소비지표'에서 로드.
-    kw9 = keywords_5_10.get(CLASS_9호, [])
-    for i in df.index:
-        if df.at[i, '_2호적용']:
-            continue
-        row = df.loc[i]
-        inp, out = _num(row.get('입금액')), _num(row.get('출금액'))
-        text = _search_text_dedup(row, SEARCH_COLS)
-        if out >= 300_000 and inp <= 0 and kw9 and _keyword_match(text, kw9):
-            df.at[i, '위험도키워드'] = _matched_keyword(text, kw9)
-            if has_업종:
-                df.at[i, '위험도분류'] = CLASS_9호
-            if has_위험도:
-                df.at[i, '위험도'] = 4.0
-
-    # 10호: 사행성지표 5.0 (2호 해당 행은 skip). 키워드는 category_table 업종분류 '사행성지표'에서 로드.
-    kw10 = keywords_5_10.get(CLASS_10호, [])
-    for i in df.index:
-        if df.at[i, '_2호적용']:
-            continue
-        row = df.loc[i]
-        inp, out = _num(row.get('입금액')), _num(row.get('출금액'))
-        text = _search_text_dedup(row, SEARCH_COLS)
-        if out >= 100_000 and inp <= 0 and kw10 and _keyword_match(text, kw10):
-            df.at[i, '위험도키워드'] = _matched_keyword(text, kw10)
-            if has_업종:
-                df.at[i, '위험도분류'] = CLASS_10호
-            if has_위험도:
-                df.at[i, '위험도'] = 5.0
-
-    df.drop(columns=['_kw', '_4호대상', '_2호적용'], errors='ignore', inplace=True)
-
-    if has_위험도:
-        df['위험도'] = df['위험도'].apply(lambda v: max(DEFAULT_RISK, _num(v, DEFAULT_RISK)))
+    # 지표별 조건 마스크 (정렬 후 행 순서). 2호 해당 행은 3~10호 조건을 보지 않음.
+    ind = _indicator_masks(df, simya_range, keywords_5_10)
+    is_2호 = ind[2][0]
+    # 뒤 지표가 앞 지표를 덮어쓰던 순차 적용 = 높은 호수 우선 선택
+    order = list(range(10, 2, -1))
+    conds = [ind[n][0] for n in order]
+    hit_3_10 = np.logical_or.reduce(conds) if conds else np.zeros(len(df), dtype=bool)
+    if hit_3_10.any():
+        kw_choices = [ind[n][1] for n in order]
+        위험도키워드 = np.select(conds, kw_choices, default='')
+        df.loc[hit_3_10, '위험도키워드'] = 위험도키워드[hit_3_10]
+    applied = hit_3_10 | is_2호
+    if applied.any():
+        conds_all = conds + [is_2호]
+        if has_업종:
+            분류 = np.select(conds_all, [INDICATORS[n][0] for n in order] + [CLASS_2호], default=CLASS_1호).astype(object)
+            df.loc[applied, '위험도분류'] = 분류[applied]
+        if has_위험도:
+            df['위험도'] = np.select(conds_all, [INDICATORS[n][1] for n in order] + [0.5], default=DEFAULT_RISK)
 
 
 def get_risk_indicators_document() -> str:
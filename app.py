@@ -10,6 +10,7 @@ MyInfo 통합 서버 (app.py)
   1. 환경 변수·UTF-8 설정 → Flask 앱 생성 → after_request( charset, gzip )
   2. SUBAPP_CONFIG 기준으로 MyBank, MyCard, MyCash 순서로 load_subapp_routes() 호출
      → 각 서브앱 소스 읽기 → UTF-8 블록 패치 → 메모리에서 모듈 로드 → 라우트를 prefix 붙여 등록
+     → MYINFO_SOURCE_WATCH=1 이면 source_watcher 시작 (.source/Bank·Card 변경 시 before/after 백그라운드 재생성)
   3. /, /help, /bank, /card, /cash, /shutdown, /health 등 메인 라우트 등록
   4. __main__ 시: waitress 서버 기동
 
@@ -444,6 +445,14 @@ for _path, _prefix, _app_file, _name in SUBAPP_CONFIG:
 # 서버 기동 시 캐시·임시파일 초기화 (이전 실행 상태 제거)
 _clear_startup_caches()
 
+# 원본 폴더 감시 (MYINFO_SOURCE_WATCH=1 일 때만): .source/Bank·Card 변경 시 before/after/cash 백그라운드 재생성
+try:
+    import source_watcher
+    if source_watcher.start():
+        print("[source_watcher] .source/Bank, .source/Card 감시 시작", flush=True)
+except Exception as e:
+    print(f"[source_watcher] 감시 시작 실패: {e}", flush=True)
+
 # ----- 7. 메인 라우트 (리다이렉트, 홈, 도움말, 종료, 헬스, 404) -----
 @app.route('/bank')
 def redirect_bank():
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""은행 거래내역 엑셀 형식 등록부. (MyBank 통합·원본 조회 공용)
+
+은행마다 읽기 함수를 따로 두지 않고 BANK_FORMATS 에 선언만 한다:
+  - filename: 파일명에 포함되면 이 은행 (등록 순서대로 먼저 맞는 것)
+  - extensions: 읽을 확장자 (그 외 확장자 파일은 건너뜀)
+  - header_anchors: 첫 열에 이 문자열이 들어간 첫 행(앞 header_rows 행 안)이 헤더
+  - date / time / columns: 결과 컬럼별 원본 헤더 찾기
+      names: 헤더가 정확히 같은 것 (순서대로) → contains: 헤더(소문자)에 포함 → positions: 열 번호
+    거래일 컬럼 헤더에 '일시'가 들어 있으면 '날짜 시간' 값을 나눠 거래일·거래시간으로 쓴다
+  - skip_dates: 거래일 칸이 이 값이면 데이터 행 아님 (합계 행 등)
+  - account: 상단 rows 행에서 markers 포함 셀의 pattern(그룹 1), 없으면 파일 경로에서 찾음
+새 은행은 항목 하나만 추가하면 된다. 형식마다 BankFormat 으로 한 번 컴파일하고(정규식·기본값),
+헤더 행(헤더 이름 tuple)별 원본 열 위치는 한 번 계산해 재사용한다. 데이터는 컬럼 단위로만 처리.
+"""
+import re
+from pathlib import Path
+
+import pandas as pd
+
+from excel_backend import grid_frame, read_sheet_grids
+
+# 읽기 결과 컬럼 (거래일 다음, 순서 = 결과 DataFrame 컬럼 순서) → 원본에 없을 때 값
+OUTPUT_COLUMNS = (
+    ('거래시간', ''), ('적요', ''), ('출금액', 0), ('입금액', 0), ('잔액', 0), ('거래점', ''),
+    ('취소', ''), ('내용', ''), ('송금메모', ''), ('메모', ''),
+)
+# 빈 칸(NaN)을 ''로 채우는 컬럼
+FILL_EMPTY_COLUMNS = frozenset(('거래시간', '내용', '송금메모', '메모'))
+
+BANK_FORMATS = [
+    {
+        'bank': '국민은행',
+        'filename': ('국민은행',),
+        'extensions': ('.xlsx',),  # 국민은행 .xls 미지원
+        'header_anchors': ('거래일시', '거래일자'),
+        'date': {'contains': ('거래일시', '거래일자')},
+        'skip_dates': ('합계',),
+        'account': {'rows': 10, 'markers': ('계좌번호', '285102'), 'pattern': r'(\d{6}-\d{2}-\d{6})'},
+        'columns': {
+            '적요': {'names': ('적요',)},
+            '출금액': {'names': ('출금액',)},
+            '입금액': {'names': ('입금액',)},
+            '잔액': {'names': ('잔액',)},
+            '거래점': {'names': ('거래점',)},
+            '취소': {'names': ('구분', '취소')},
+            '내용': {'contains': ('보낸분', '받는분', '내용')},
+            '송금메모': {'names': ('송금메모',)},
+            '메모': {'names': ('메모',)},
+        },
+    },
+    {
+        'bank': '신한은행',
+        'filename': ('신한은행',),
+        'extensions': ('.xls', '.xlsx'),
+        'header_anchors': ('거래일자',),
+        'date': {'names': ('거래일자',)},
+        'time': {'names': ('거래시간',)},
+        'account': {'rows': 5, 'markers': ('계좌번호', '110-478'), 'pattern': r'(\d{3}-\d{3}-\d{6})'},
+        'columns': {
+            '적요': {'names': ('적요',)},
+            '출금액': {'names': ('출금(원)', '출금액')},
+            '입금액': {'names': ('입금(원)', '입금액')},
+            '잔액': {'names': ('잔액(원)', '잔액')},
+            '거래점': {'names': ('거래점',)},
+            '내용': {
+                'names': ('내용',),
+                'contains': ('내용', '거래처', '상대방', '받는분', '보낸분', '거래상대방'),
+                'positions': (5, 4),
+            },
+            '메모': {'names': ('메모',)},
+        },
+    },
+    {
+        'bank': '하나은행',
+        'filename': ('하나은행',),
+        'extensions': ('.xls', '.xlsx'),
+        'header_anchors': ('거래일시', '거래일'),
+        'date': {'names': ('거래일시',)},
+        'account': {'rows': 5, 'markers': ('계좌번호', '433-910'), 'pattern': r'(\d{3}-\d{6}-\d{5})'},
+        'columns': {
+            '적요': {'names': ('적요',)},
+            '출금액': {'names': ('출금액',)},
+            '입금액': {'names': ('입금액',)},
+            '잔액': {'names': ('잔액',)},
+            '거래점': {'names': ('거래점',)},
+            '내용': {'names': ('내용',)},
+        },
+    },
+]
+
+
+def _resolve(headers, lowered, rule):
+    """rule(names/contains/positions)에 맞는 원본 열 위치. 없으면 None."""
+    if not rule:
+        return None
+    for name in rule.get('names', ()):
+        if name in headers:
+            return headers.index(name)
+    keywords = [k.lower() for k in rule.get('contains', ())]
+    if keywords:
+        for i, h in enumerate(lowered):
+            if any(k in h for k in keywords):
+                return i
+    for pos in rule.get('positions', ()):
+        if len(headers) > pos:
+            return pos
+    return None
+
+
+class BankFormat:
+    """BANK_FORMATS 항목 하나를 컴파일한 읽기 객체."""
+
+    def __init__(self, spec):
+        self.bank = spec['bank']
+        self.filename_keywords = tuple(spec['filename'])
+        self.extensions = tuple(e.lower() for e in spec.get('extensions', ('.xls', '.xlsx')))
+        self.header_anchors = tuple(spec['header_anchors'])
+        self.header_rows = spec.get('header_rows', 15)
+        self.skip_dates = tuple(spec.get('skip_dates', ()))
+        account = spec.get('account') or {}
+        self.account_rows = account.get('rows', 5)
+        self.account_markers = tuple(account.get('markers', ()))
+        self.account_re = re.compile(account['pattern']) if account.get('pattern') else None
+        self._date_rule = spec['date']
+        self._time_rule = spec.get('time')
+        columns = spec.get('columns', {})
+        self._column_rules = [(name, default, columns.get(name)) for name, default in OUTPUT_COLUMNS[1:]]
+        self._layouts = {}
+
+    def matches(self, filename):
+        """파일명이 이 은행 형식인지."""
+        return any(k in filename for k in self.filename_keywords)
+
+    def supports(self, path):
+        """읽을 수 있는 확장자인지."""
+        return Path(path).suffix.lower() in self.extensions
+
+    def header_row(self, rows):
+        """첫 열에 header_anchors 중 하나가 들어간 첫 행 번호 (앞 header_rows 행 안). 없으면 None."""
+        for idx, row in enumerate(rows[:self.header_rows]):
+            cell = row[0] if row else ''
+            if pd.notna(cell) and any(label in str(cell) for label in self.header_anchors):
+                return idx
+        return None
+
+    def account_number(self, rows, file_path):
+        """상단 account_rows 행에서 markers 포함 셀의 계좌번호. 없으면 파일 경로에서 찾음."""
+        if self.account_re is None:
+            return None
+        for row in rows[:self.account_rows]:
+            for cell in row:
+                value = str(cell)
+                if any(marker in value for marker in self.account_markers):
+                    m = self.account_re.search(value)
+                    if m:
+                        return m.group(1)
+                    break
+        m = self.account_re.search(str(file_path))
+        return m.group(1) if m else None
+
+    def layout(self, headers):
+        """헤더 이름 tuple → (거래일 열, 일시 나누기 여부, 거래시간 열, [(결과 컬럼, 기본값, 열)]). 헤더별 한 번 계산."""
+        cached = self._layouts.get(headers)
+        if cached is None:
+            lowered = [h.lower() for h in headers]
+            date_idx = _resolve(headers, lowered, self._date_rule)
+            split = date_idx is not None and '일시' in headers[date_idx]
+            time_idx = None if split else _resolve(headers, lowered, self._time_rule)
+            columns = [(name, default, _resolve(headers, lowered, rule)) for name, default, rule in self._column_rules]
+            cached = (date_idx, split, time_idx, columns)
+            self._layouts[headers] = cached
+        return cached
+
+    def extract(self, rows, file_path):
+        """시트 셀 값 행 → 거래 DataFrame (거래일, OUTPUT_COLUMNS, 은행명, 계좌번호). 헤더·거래일 열이 없으면 None."""
+        header_row = self.header_row(rows)
+        if header_row is None:
+            return None
+        df = grid_frame(rows, header=header_row)
+        date_idx, split, time_idx, columns = self.layout(tuple(str(c) for c in df.columns))
+        if date_idx is None:
+            return None
+        date = df.iloc[:, date_idx]
+        date_text = date.astype(str)
+        keep = date.notna() & (date_text.str.strip() != '')
+        if self.skip_dates:
+            keep &= ~date_text.isin(self.skip_dates)
+        df = df[keep]
+        date_text = date_text[keep]
+        out = {}
+        if split:
+            parts = date_text.str.split(' ')
+            out['거래일'] = parts.str[0]
+            out['거래시간'] = parts.str[1].fillna('')
+        else:
+            out['거래일'] = date_text
+            out['거래시간'] = df.iloc[:, time_idx].fillna('') if time_idx is not None else ''
+        for name, default, idx in columns:
+            if idx is None:
+                out[name] = default
+            else:
+                col = df.iloc[:, idx]
+                out[name] = col.fillna('') if name in FILL_EMPTY_COLUMNS else col
+        result = pd.DataFrame(out, index=df.index)
+        result['은행명'] = self.bank
+        result['계좌번호'] = self.account_number(rows, file_path)
+        dates = result['거래일']
+        return result[dates.notna() & (dates.astype(str).str.strip() != '')]
+
+    def read(self, file_path):
+        """파일의 모든 시트를 읽어 합친 DataFrame. 거래 시트가 없으면 None."""
+        frames = []
+        for _sheet_name, rows in read_sheet_grids(file_path):
+            df = self.extract(rows, file_path)
+            if df is not None:
+                frames.append(df)
+        return pd.concat(frames, ignore_index=True) if frames else None
+
+
+_compiled = None
+
+
+def get_bank_formats():
+    """BANK_FORMATS 컴파일 결과 (처음 한 번만 컴파일)."""
+    global _compiled
+    if _compiled is None:
+        _compiled = [BankFormat(spec) for spec in BANK_FORMATS]
+    return _compiled
+
+
+def find_bank_format(filename):
+    """파일명에 맞는 BankFormat. 없으면 None."""
+    name = Path(str(filename)).name
+    for fmt in get_bank_formats():
+        if fmt.matches(name):
+            return fmt
+    return None
+
+
+def bank_name_for_file(filename):
+    """파일명으로 은행명. 등록되지 않은 은행이면 None."""
+    fmt = find_bank_format(filename)
+    return fmt.bank if fmt else None
+
+
+def bank_names():
+    """등록된 은행명 (등록 순서)."""
+    return [fmt.bank for fmt in get_bank_formats()]
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""셀 정리 컬럼 커널 벤치마크: column_kernels 의 *_column 과 스칼라 함수 Series.apply 비교.
+
+python bench_column_kernels.py [--rows N] [--unique U] [--repeat R]
+
+bank_before / card_before 값을 섞어 N 행(고유값 약 U 개) 컬럼을 만들고, 커널마다 R 회 반복 최소 시간과
+결과 일치 여부('=' 또는 'DIFF')를 출력한다. before 파일이 없으면 예시 값만 사용.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import unicodedata
+
+os.environ.setdefault("MYINFO_ROOT", os.path.dirname(os.path.abspath(__file__)))
+_root = os.environ["MYINFO_ROOT"]
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import pandas as pd  # noqa: E402
+
+import column_kernels as ck  # noqa: E402
+
+_SAMPLE = {
+    'amount': ['1,234', '-5,000', '', '-', 0, 12000, 3500.0, None, '12,000원', '7,800'],
+    'text': ['주식회사 가나다', '㈜라마바', '(주)(주)사아', '스타벅스((강남))', '[]편의점{}', 'nan', None, 'ＧＳ２５', '쿠팡(주'],
+    'business_number': ['123-45-67890', 1234567890, 123456789.0, '12345678', '', None, 'abc'],
+    'datetime': ['25/12/09', '2024.01.02 10:11', '2024-01-02T10:11:12', '2025-03-04 9:5:1', 45000, '', '2023/1/2'],
+}
+
+
+def _before_values(path, columns):
+    try:
+        from data_json_io import safe_read_data_json
+        df = safe_read_data_json(path, default_empty=True)
+    except Exception:
+        return []
+    if df is None or df.empty:
+        return []
+    return [v for c in columns if c in df.columns for v in df[c].tolist()]
+
+
+def _column(kind, rows, unique, seed):
+    """kind 예시 값 + before 파일 값에서 고유값 unique 개를 골라 rows 행으로 펼친 object Series."""
+    values = list(_SAMPLE[kind])
+    bank = os.path.join(_root, 'MyBank', 'bank_before.json')
+    card = os.path.join(_root, 'MyCard', 'card_before.json')
+    if kind == 'amount':
+        values += _before_values(bank, ['입금액', '출금액', '잔액']) + _before_values(card, ['입금액', '출금액'])
+    elif kind == 'text':
+        values += _before_values(bank, ['적요', '내용', '송금메모']) + _before_values(card, ['가맹점명'])
+    elif kind == 'business_number':
+        values += _before_values(card, ['사업자번호'])
+    elif kind == 'datetime':
+        values += _before_values(bank, ['거래일']) + _before_values(card, ['이용일'])
+    rnd = random.Random(seed)
+    distinct = list(dict.fromkeys(v for v in values if isinstance(v, (str, int, float)) or v is None))
+    rnd.shuffle(distinct)
+    pool = distinct[:max(1, unique)]
+    return pd.Series([rnd.choice(pool) for _ in range(rows)], dtype=object)
+
+
+def _datetime_scalar(series):
+    out = []
+    for v in series:
+        date_part, time_part = ck.split_datetime_value(v)
+        date = ck.normalize_date_value(date_part) if date_part else ck.normalize_date_value(v)
+        out.append((date, ck.normalize_time_value(time_part) if time_part else ''))
+    return out
+
+
+def _datetime_kernel(series):
+    dates, times = ck.datetime_split_column(series)
+    return list(zip(dates, times))
+
+
+def _cases(cols):
+    text = cols['text']
+    return [
+        ('clean_amount', cols['amount'],
+         lambda s: s.apply(ck.clean_amount).tolist(), lambda s: ck.clean_amount_column(s).tolist()),
+        ('clean_amount(float)', pd.to_numeric(cols['amount'], errors='coerce'),
+         lambda s: s.apply(ck.clean_amount).tolist(), lambda s: ck.clean_amount_column(s).tolist()),
+        ('safe_str', text,
+         lambda s: s.apply(ck.safe_str).tolist(), lambda s: ck.safe_str_column(s).tolist()),
+        ('normalize_fullwidth', text,
+         lambda s: [ck.normalize_fullwidth(v) for v in s], lambda s: list(ck.fullwidth_column(s))),
+        ('NFKC text', text,
+         lambda s: s.fillna('').astype(str).apply(lambda v: unicodedata.normalize('NFKC', v) if v else '').tolist(),
+         lambda s: ck.nfkc_text_column(s).tolist()),
+        ('normalize_business_number', cols['business_number'],
+         lambda s: [ck.normalize_business_number(v) for v in s], lambda s: list(ck.business_number_column(s))),
+        ('date/time split', cols['datetime'], _datetime_scalar, _datetime_kernel),
+    ]
+
+
+def _best_time(func, arg, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func(arg)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _same(a, b):
+    key = lambda x: (type(x).__name__, 'nan' if isinstance(x, float) and x != x else repr(x))  # noqa: E731
+    return [key(x) for x in a] == [key(x) for x in b]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000, help='컬럼 행 수')
+    parser.add_argument('--unique', type=int, default=2000, help='고유값 수 (상한)')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (최소 시간 사용)')
+    args = parser.parse_args()
+    cols = {kind: _column(kind, args.rows, args.unique, seed=i) for i, kind in enumerate(_SAMPLE)}
+    print(f"행 {args.rows:,} / 고유값 최대 {args.unique:,} / 반복 {args.repeat}")
+    print(f"{'커널':<28}{'스칼라 apply':>14}{'컬럼 커널':>14}{'배속':>8}  결과")
+    print('-' * 72)
+    for name, series, scalar, kernel in _cases(cols):
+        t_scalar, expected = _best_time(scalar, series, args.repeat)
+        t_kernel, got = _best_time(kernel, series, args.repeat)
+        speedup = t_scalar / t_kernel if t_kernel else float('inf')
+        mark = '=' if _same(expected, got) else 'DIFF'
+        print(f"{name:<28}{t_scalar * 1000:>12.1f}ms{t_kernel * 1000:>12.1f}ms{speedup:>7.1f}x  {mark}")
+
+
+if __name__ == '__main__':
+    main()
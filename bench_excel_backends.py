@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""엑셀 읽기 백엔드 비교: .source/Bank, .source/Card 원본을 엔진별로 읽어 시간과 결과 일치 여부 출력.
+
+python bench_excel_backends.py [--repeat N] [--dir 폴더 ...]
+
+엔진별로 (1) 시트 격자 읽기(은행 읽기 경로, read_sheet_grids) (2) 행 스트리밍(카드 추출 경로, iter_sheet_rows)을
+파일마다 N회 반복해 최소 시간을 잰다. 결과는 기본 엔진(openpyxl/xlrd) 결과와 비교해 같으면 '=', 다르면 'DIFF'.
+calamine 은 python-calamine 이 설치되어 있을 때만 측정한다. .xls 는 auto 에서 calamine 을 쓰지 않으므로
+(하나은행 BIFF 코드페이지 문제) .xls 의 calamine 결과 DIFF 는 참고용.
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("MYINFO_ROOT", os.path.dirname(os.path.abspath(__file__)))
+_root = os.environ["MYINFO_ROOT"]
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import excel_backend  # noqa: E402
+
+
+def _best_time(func, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _grids(path, engine):
+    return excel_backend.read_sheet_grids(path, preference=engine)
+
+
+def _rstrip_none(row):
+    n = len(row)
+    while n and row[n - 1] is None:
+        n -= 1
+    return row[:n]
+
+
+def _stream(path, engine):
+    # 행 끝 빈 칸 수는 엔진마다 다름 (openpyxl read_only 는 행마다 잘림) → 비교 전 제거
+    return [(name, [_rstrip_none(r) for r in rows])
+            for name, rows in excel_backend.iter_sheet_rows(path, preference=engine)]
+
+
+def _engines():
+    engines = ['openpyxl']
+    if excel_backend.calamine_available():
+        engines.append('calamine')
+    return engines
+
+
+def _source_files(dirs):
+    files = []
+    for d in dirs:
+        if not os.path.isdir(d):
+            continue
+        for name in sorted(os.listdir(d)):
+            if name.lower().endswith(('.xls', '.xlsx')):
+                files.append(os.path.join(d, name))
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='파일당 반복 횟수 (최소 시간 사용)')
+    parser.add_argument('--dir', action='append', help='원본 폴더 (기본: .source/Bank, .source/Card)')
+    args = parser.parse_args()
+    dirs = args.dir or [os.path.join(_root, '.source', 'Bank'), os.path.join(_root, '.source', 'Card')]
+    files = _source_files(dirs)
+    if not files:
+        print('원본 파일 없음:', ', '.join(dirs))
+        return
+    engines = _engines()
+    if 'calamine' not in engines:
+        print('python-calamine 미설치: openpyxl/xlrd 만 측정 (pip install python-calamine)')
+    totals = {(mode, e): 0.0 for mode in ('grid', 'stream') for e in engines}
+    header = f"{'파일':<44}" + ''.join(f"{mode + ':' + e:>20}" for mode in ('grid', 'stream') for e in engines)
+    print(header)
+    print('-' * len(header))
+    for path in files:
+        cells = []
+        for mode, func in (('grid', _grids), ('stream', _stream)):
+            base = None
+            for engine in engines:
+                try:
+                    elapsed, result = _best_time(lambda: func(path, engine), args.repeat)
+                except Exception as e:
+                    cells.append(f"{'오류 ' + type(e).__name__:>20}")
+                    continue
+                if engine == 'openpyxl':
+                    base = result
+                mark = '' if engine == 'openpyxl' else (' =' if result == base else ' DIFF')
+                totals[(mode, engine)] += elapsed
+                cells.append(f"{elapsed * 1000:>15.1f}ms{mark:<3}"[-20:].rjust(20))
+        print(f"{os.path.basename(path)[:44]:<44}" + ''.join(cells))
+    print('-' * len(header))
+    print(f"{'합계':<44}" + ''.join(f"{totals[(mode, e)] * 1000:>18.1f}ms" for mode in ('grid', 'stream') for e in engines))
+    print(f"자동 선택 엔진: .xlsx → {excel_backend.excel_engine('x.xlsx')}, .xls → {excel_backend.excel_engine('x.xls')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""키워드 영향 미리보기 (은행·카드·금융정보 공용).
+
+후보 키워드가 bank_after / card_after / cash_after 에서 몇 행에 걸리는지와 예시 행을 돌려준다.
+첫 미리보기 요청 때 검색 텍스트 고유값으로 n-gram(1~3글자) 역색인을 만들어 두고, 질의는
+키워드 n-gram 게시 목록의 교집합 → 후보 텍스트만 포함 여부 확인으로 처리한다 (전체 행 스캔 없음).
+색인은 after (bank/card는 before도) 파일 (mtime, 크기, inode)가 바뀌면 다음 요청 때 다시 만든다.
+
+검색 텍스트 (분류기가 매칭하는 텍스트와 같음):
+  - bank: bank_before의 create_before_text (취소·적요·내용·송금메모·거래점 '#' 연결, 후처리 전)
+  - card: card_before 중 after에 남는 행의 merchant_search_texts (가맹점명 보정 후, 후처리 전)
+  - cash: cash_after 기타거래·키워드·금융사 공백 연결 (업종분류 고위험 매칭과 같음)
+bank/card 텍스트는 각 앱이 register_text_source로 등록한 색인 생성 함수(증분 재분류와 같은 색인)로 만든다.
+출처가 등록되지 않은 kind(해당 앱이 로드되지 않은 프로세스)는 결과 None.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+NGRAM_MAX = 3
+DEFAULT_SAMPLE_LIMIT = 5
+
+# kind → (after 검색 텍스트 컬럼, 구분자, 예시 행 컬럼). 검색 텍스트 컬럼 None = register_text_source 출처 사용
+AFTER_SPECS = {
+    'bank': (None, '#',
+             ('거래일', '은행명', '적요', '내용', '송금메모', '입금액', '출금액', '카테고리', '키워드')),
+    'card': (None, '',
+             ('이용일', '카드사', '가맹점명', '입금액', '출금액', '카테고리', '키워드')),
+    'cash': (('기타거래', '키워드', '금융사'), ' ',
+             ('거래일', '금융사', '기타거래', '입금액', '출금액', '카테고리', '위험도분류')),
+}
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+# kind → (before 경로, TextRowIndex 생성 함수)
+_text_sources = {}
+
+
+def register_text_source(kind, before_path, build):
+    """kind의 분류 검색 텍스트 출처 등록 (앱 import 시).
+    build() → after 행 순서의 category_incremental.TextRowIndex (만들 수 없으면 None). get_row_index 캐시를 같이 쓴다."""
+    _text_sources[kind] = (os.path.normpath(os.path.abspath(str(before_path))), build)
+
+
+def default_after_paths(project_root=None):
+    """프로젝트 루트 기준 after 파일 경로 {kind: path}."""
+    root = project_root or os.environ.get('MYINFO_ROOT') or os.path.dirname(os.path.abspath(__file__))
+    return {
+        'bank': os.path.join(root, 'MyBank', 'bank_after.json'),
+        'card': os.path.join(root, 'MyCard', 'card_after.json'),
+        'cash': os.path.join(root, 'MyCash', 'cash_after.json'),
+    }
+
+
+class NgramIndex:
+    """텍스트 목록의 1~n글자 n-gram 역색인. find(키워드) → 키워드를 포함하는 텍스트 id 집합."""
+
+    def __init__(self, texts, n=NGRAM_MAX):
+        self.n = n
+        self.texts = texts
+        postings = {}
+        for tid, text in enumerate(texts):
+            grams = set()
+            for k in range(1, n + 1):
+                for i in range(len(text) - k + 1):
+                    grams.add(text[i:i + k])
+            for g in grams:
+                ids = postings.get(g)
+                if ids is None:
+                    postings[g] = {tid}
+                else:
+                    ids.add(tid)
+        self._postings = postings
+
+    def find(self, keyword):
+        if not keyword:
+            return set()
+        k = min(self.n, len(keyword))
+        grams = {keyword[i:i + k] for i in range(len(keyword) - k + 1)}
+        lists = []
+        for g in grams:
+            ids = self._postings.get(g)
+            if not ids:
+                return set()
+            lists.append(ids)
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for ids in lists[1:]:
+            candidates &= ids
+            if not candidates:
+                return candidates
+        if len(keyword) <= self.n:
+            return candidates
+        return {tid for tid in candidates if keyword in self.texts[tid]}
+
+
+def _file_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _cell_str(v):
+    if v is None or (isinstance(v, float) and v != v):
+        return ''
+    return str(v).strip()
+
+
+class AfterIndex:
+    """after DataFrame 한 개의 검색 텍스트 색인 + 예시 행용 컬럼.
+    text_index(TextRowIndex)가 있으면 그 텍스트를, 없으면 AFTER_SPECS의 after 컬럼을 검색 텍스트로 쓴다."""
+
+    def __init__(self, kind, df, text_index=None):
+        text_cols, sep, sample_cols = AFTER_SPECS[kind]
+        self.kind = kind
+        if text_index is not None:
+            codes, uniques = text_index.codes, text_index.texts
+        else:
+            cols = [c for c in (text_cols or ()) if c in df.columns]
+            col_parts = [[_cell_str(v) for v in df[c].tolist()] for c in cols]
+            if sep == ' ':
+                texts = [sep.join(p) for p in zip(*col_parts)]
+            else:
+                texts = [sep.join(x for x in p if x) for p in zip(*col_parts)]
+            if not cols:
+                texts = [''] * len(df)
+            codes, uniques = pd.factorize(pd.Series(texts, dtype=object))
+        self.codes = codes
+        self.ngrams = NgramIndex(list(uniques))
+        self.rows = df[[c for c in sample_cols if c in df.columns]].reset_index(drop=True)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def query(self, keywords, limit=DEFAULT_SAMPLE_LIMIT):
+        """keywords 중 하나라도 포함하는 행 수, 현재 카테고리별 건수, 앞쪽 예시 행."""
+        uids = set()
+        for kw in keywords:
+            uids |= self.ngrams.find(kw)
+        if uids:
+            hit = np.isin(self.codes, np.fromiter(uids, dtype=np.intp, count=len(uids)))
+            rows = np.flatnonzero(hit)
+        else:
+            rows = np.empty(0, dtype=np.intp)
+        result = {'count': int(len(rows)), 'total': len(self), 'categories': {}, 'samples': []}
+        if len(rows):
+            if '카테고리' in self.rows.columns:
+                counts = self.rows['카테고리'].iloc[rows].fillna('').astype(str).value_counts()
+                result['categories'] = {str(k): int(v) for k, v in counts.head(10).items()}
+            sample = self.rows.iloc[rows[:limit]].astype(object)
+            result['samples'] = sample.where(sample.notna(), '').to_dict('records')
+        return result
+
+
+def _read_after(path):
+    try:
+        from data_json_io import safe_read_data_json
+    except ImportError:
+        return None
+    df = safe_read_data_json(path, default_empty=True)
+    if df is not None and not df.empty:
+        df.columns = [str(c).strip().lstrip('\ufeff') for c in df.columns]
+    return df
+
+
+def get_after_index(kind, path):
+    """kind의 AfterIndex. 파일이 그대로면 캐시, 바뀌었으면 파일을 읽어 새로 만든다.
+    after 파일이 없거나, 검색 텍스트 출처가 없거나, before/after 행 수가 다르면 None."""
+    if kind not in AFTER_SPECS:
+        return None
+    path = os.path.normpath(os.path.abspath(str(path)))
+    source = _text_sources.get(kind)
+    if source is None and AFTER_SPECS[kind][0] is None:
+        return None
+    key = (_file_key(path), _file_key(source[0]) if source is not None else None)
+    if key[0] is None:
+        return None
+    with _indexes_lock:
+        cached = _indexes.get(kind)
+        if cached is not None and cached[0] == path and cached[1] == key:
+            return cached[2]
+    df = _read_after(path)
+    if df is None:
+        return None
+    text_index = None
+    if source is not None:
+        from category_incremental import get_row_index
+        text_index = get_row_index(kind, source[0], path, source[1])
+        if text_index is None or len(text_index) != len(df):
+            return None
+    index = AfterIndex(kind, df, text_index)
+    with _indexes_lock:
+        _indexes[kind] = (path, key, index)
+    return index
+
+
+def split_keywords(keyword):
+    """후보 키워드 문자열 → 키워드 list ('/' 구분, 앞뒤 공백 제거, 중복 제거)."""
+    out = []
+    for k in str(keyword or '').split('/'):
+        k = k.strip()
+        if k and k not in out:
+            out.append(k)
+    return out
+
+
+def preview_keyword(keyword, paths=None, limit=DEFAULT_SAMPLE_LIMIT):
+    """후보 키워드의 bank/card/cash after 영향 {kind: {count, total, categories, samples} 또는 None(파일 없음)}."""
+    keywords = split_keywords(keyword)
+    paths = paths or default_after_paths()
+    results = {}
+    for kind in ('bank', 'card', 'cash'):
+        path = paths.get(kind)
+        index = get_after_index(kind, path) if path else None
+        results[kind] = index.query(keywords, limit=limit) if index is not None and keywords else None
+    return keywords, results
+
+
+def impact_payload(keyword, paths=None, limit=DEFAULT_SAMPLE_LIMIT):
+    """/api/category-impact 응답 dict."""
+    t0 = time.perf_counter()
+    keywords, results = preview_keyword(keyword, paths=paths, limit=limit)
+    return {
+        'keyword': keyword,
+        'keywords': keywords,
+        'results': results,
+        'elapsed_ms': round((time.perf_counter() - t0) * 1000, 2),
+    }
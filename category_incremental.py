@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""계정과목 규칙 편집 후 after 파일 증분 재분류. (은행·카드 공용)
+
+규칙 1건 입력·수정·삭제 시 after 전체를 다시 만들지 않고, 바뀐 규칙의 키워드(이전·새)를 포함하는 행만 다시 분류한다.
+  - 편집 전/후 정렬된 계정과목 규칙을 비교해 바뀐 규칙만 추린다. 최대 키워드 길이 정렬이 불안정해 상대 순서가
+    바뀐 규칙도 바뀐 규칙으로 본다 (편집 전/후 공통 규칙 중 최장 순서 유지 부분 밖의 규칙).
+  - 검색 텍스트 고유값마다 포함 키워드를 역색인(키워드 → 고유 텍스트 id)으로 보관하고, 영향 행만 새 매처로 재분류.
+바뀐 규칙 키워드를 포함하지 않는 텍스트는 발동하는 규칙과 그 순서가 편집 전과 같으므로 결과도 같다.
+후처리 변경·계정과목 없음·규칙 중복 등 증분으로 보장할 수 없는 경우는 None → 전체 재생성.
+after 파일을 만들거나 고칠 때 어느 규칙 세트(지문)로 분류했는지 옆 파일(.<after 이름>.rules)에 남긴다.
+편집 전 규칙 세트와 지문이 다르면(다른 앱 편집·증분 불가 편집 뒤 재생성 안 됨 등) 증분 대상이 아니다.
+"""
+import bisect
+import json
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from category_matcher import KeywordAutomaton
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _moved_rules(old_seq, new_seq):
+    """같은 규칙 집합의 두 순서 → 상대 순서를 유지하지 못한 규칙 집합 (최장 증가 부분수열 밖의 규칙)."""
+    pos = {r: i for i, r in enumerate(new_seq)}
+    seq = [pos[r] for r in old_seq]
+    tails, tails_idx, prev = [], [], [-1] * len(seq)
+    for i, p in enumerate(seq):
+        k = bisect.bisect_left(tails, p)
+        if k == len(tails):
+            tails.append(p)
+            tails_idx.append(i)
+        else:
+            tails[k] = p
+            tails_idx[k] = i
+        prev[i] = tails_idx[k - 1] if k else -1
+    keep = set()
+    i = tails_idx[-1] if tails_idx else -1
+    while i >= 0:
+        keep.add(old_seq[i])
+        i = prev[i]
+    return {r for r in old_seq if r not in keep}
+
+
+def changed_account_keywords(old_rules, new_rules):
+    """정렬된 계정과목 규칙 ((카테고리, (키워드, ...)), ...) 편집 전/후 → 영향 키워드 집합.
+    바뀐 규칙과 상대 순서가 바뀐 규칙(정렬 불안정)의 키워드, 그 발동 문자열(re.escape)을 돌려준다.
+    같은 규칙이 중복되어 순서를 특정할 수 없으면 None."""
+    changed = set(old_rules) ^ set(new_rules)
+    old_seq = [r for r in old_rules if r not in changed]
+    new_seq = [r for r in new_rules if r not in changed]
+    if old_seq != new_seq:
+        if len(set(old_seq)) != len(old_seq) or len(set(new_seq)) != len(new_seq):
+            return None
+        changed |= _moved_rules(old_seq, new_seq)
+    keywords = set()
+    for _, kws in changed:
+        for kw in kws:
+            if kw:
+                keywords.add(kw)
+                keywords.add(re.escape(kw))
+    return keywords
+
+
+class TextRowIndex:
+    """검색 텍스트(after 행 순서) 역색인. 키워드 → 그 키워드를 포함하는 고유 텍스트 id.
+
+    fallback_keywords: 미매칭 행에 남길 키워드(행 순서). 없으면 ''.
+    """
+
+    def __init__(self, texts, fallback_keywords=None):
+        codes, uniques = pd.factorize(pd.Series(texts, dtype=object).fillna('').astype(str))
+        self.codes = codes
+        self.texts = list(uniques)
+        self.fallback = None if fallback_keywords is None else np.asarray(fallback_keywords, dtype=object)
+        self._postings = {}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def add_keywords(self, keywords):
+        """아직 색인하지 않은 키워드를 고유 텍스트 한 번 스캔으로 색인."""
+        new = [k for k in set(keywords) if k and k not in self._postings]
+        if not new:
+            return
+        automaton = KeywordAutomaton(new)
+        hits = [[] for _ in automaton.keywords]
+        for uid, text in enumerate(self.texts):
+            for kid in automaton.find(text):
+                hits[kid].append(uid)
+        for kid, kw in enumerate(automaton.keywords):
+            self._postings[kw] = np.asarray(hits[kid], dtype=np.intp)
+
+    def unique_ids_containing(self, keywords):
+        keywords = [k for k in keywords if k]
+        if not keywords:
+            return np.empty(0, dtype=np.intp)
+        self.add_keywords(keywords)
+        return np.unique(np.concatenate([self._postings[k] for k in keywords]))
+
+    def reclassify(self, matcher, keywords):
+        """keywords 중 하나라도 포함하는 행만 matcher로 재분류.
+        Returns: (행 위치 ndarray, 카테고리 ndarray, 키워드 ndarray). 고유 텍스트당 match 1회."""
+        uids = self.unique_ids_containing(keywords)
+        if not len(uids):
+            empty = np.empty(0, dtype=object)
+            return np.empty(0, dtype=np.intp), empty, empty
+        cats_u = np.empty(len(uids), dtype=object)
+        kws_u = np.empty(len(uids), dtype=object)
+        for i, uid in enumerate(uids):
+            cat, kw, _ = matcher.match(self.texts[uid])
+            cats_u[i], kws_u[i] = cat, kw
+        rows = np.flatnonzero(np.isin(self.codes, uids))
+        pos = np.searchsorted(uids, self.codes[rows])
+        cats, kws = cats_u[pos], kws_u[pos]
+        unmatched = pd.isna(kws)
+        if unmatched.any():
+            kws[unmatched] = self.fallback[rows[unmatched]] if self.fallback is not None else ''
+        return rows, cats, kws
+
+
+def _file_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def get_row_index(kind, before_path, after_path, build):
+    """(kind, after 경로)의 TextRowIndex. before/after 파일이 그대로면 캐시 재사용, 아니면 build() 로 새로 만든다.
+    build() 는 TextRowIndex 또는 None(색인 불가)을 반환."""
+    key = (kind, os.path.abspath(after_path))
+    files = (_file_key(before_path), _file_key(after_path))
+    with _indexes_lock:
+        cached = _indexes.get(key)
+        if cached is not None and cached[0] == files:
+            return cached[1]
+    index = build()
+    if index is not None:
+        with _indexes_lock:
+            _indexes[key] = (files, index)
+    return index
+
+
+def remember_row_index(kind, before_path, after_path, index):
+    """after 파일을 증분 갱신해 다시 쓴 뒤 호출. 현재 파일 상태로 색인 캐시 키를 갱신."""
+    key = (kind, os.path.abspath(after_path))
+    with _indexes_lock:
+        _indexes[key] = ((_file_key(before_path), _file_key(after_path)), index)
+
+
+def patch_after_rows(df, rows, cats, kws):
+    """after DataFrame의 카테고리·키워드를 행 위치(rows) 기준으로 덮어쓴다. 바뀐 행 수 반환."""
+    if not len(rows):
+        return 0
+    cat_col = df.columns.get_loc('카테고리')
+    kw_col = df.columns.get_loc('키워드')
+    old_cats = df.iloc[rows, cat_col].to_numpy(dtype=object)
+    old_kws = df.iloc[rows, kw_col].to_numpy(dtype=object)
+    changed = (old_cats != cats) | (old_kws != kws)
+    if not changed.any():
+        return 0
+    for col in ('카테고리', '키워드'):
+        if df[col].dtype != object:
+            df[col] = df[col].astype(object)
+    df.iloc[rows[changed], cat_col] = cats[changed]
+    df.iloc[rows[changed], kw_col] = kws[changed]
+    return int(changed.sum())
+
+
+def _rules_stamp_path(after_path):
+    after_path = os.path.abspath(after_path)
+    return os.path.join(os.path.dirname(after_path), '.' + os.path.basename(after_path) + '.rules')
+
+
+def record_after_rules(after_path, fingerprint):
+    """after 파일을 쓴 직후 호출: 분류에 쓴 규칙 세트 지문과 현재 after 파일 상태를 기록. fingerprint None이면 기록 삭제."""
+    stamp = _rules_stamp_path(after_path)
+    key = _file_key(after_path)
+    if fingerprint is None or key is None:
+        try:
+            os.unlink(stamp)
+        except OSError:
+            pass
+        return
+    tmp = stamp + '.tmp'
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint, 'after': list(key)}, f)
+        os.replace(tmp, stamp)
+    except OSError:
+        pass
+
+
+def after_rules_fingerprint(after_path):
+    """after 파일이 기록 이후 그대로면 분류에 쓴 규칙 세트 지문. 기록 없음·after가 다른 경로로 바뀜이면 None."""
+    key = _file_key(after_path)
+    if key is None:
+        return None
+    try:
+        with open(_rules_stamp_path(after_path), 'r', encoding='utf-8') as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(stamp, dict) or tuple(stamp.get('after') or ()) != key:
+        return None
+    return stamp.get('fingerprint')
+
+
+def rules_fingerprint(category_path):
+    """category_table 규칙 세트 지문 (분류 전에 읽어 두고 after 저장 후 record_after_rules 에 넘김). 없으면 None."""
+    try:
+        from category_rules import get_rule_set
+        rule_set = get_rule_set(category_path)
+    except Exception:
+        return None
+    return rule_set.fingerprint if rule_set is not None else None
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""계정과목 키워드 다중 패턴 매칭. (Aho-Corasick, 은행/카드 공용)
+
+규칙 × 키워드 × 행마다 str.contains 를 돌리던 방식 대신, category_table 계정과목 규칙을
+한 번 오토마톤으로 컴파일하고 텍스트당 한 번만 스캔한다.
+결과는 기존 '긴 키워드 우선' 순차 적용과 동일:
+  - 규칙 순서: 최대 키워드 길이 내림차순 정렬 결과 그대로
+  - 규칙 발동: re.escape(키워드)가 텍스트에 포함될 때 (기존 str.contains(re.escape(kw), regex=False))
+  - 매칭 키워드: 규칙 키워드 중 텍스트에 포함된 가장 긴 것 (동일 길이는 앞선 것)
+  - 덮어쓰기: 현재 카테고리가 기타거래이거나 매칭 키워드가 기존보다 길 때
+FirstRuleMatcher 는 '앞선 규칙 우선'(키워드 하나라도 포함된 첫 규칙) 용. (금융정보 고위험 분류)
+"""
+import hashlib
+import re
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CATEGORY = '기타거래'
+
+
+class KeywordAutomaton:
+    """Aho-Corasick 오토마톤. find(text) → 텍스트에 포함된 키워드 id 집합."""
+
+    def __init__(self, keywords):
+        self.keywords = []
+        self._ids = {}
+        goto = [{}]
+        out = [[]]
+        for kw in keywords:
+            if not kw or kw in self._ids:
+                continue
+            kid = len(self.keywords)
+            self._ids[kw] = kid
+            self.keywords.append(kw)
+            node = 0
+            for ch in kw:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append(kid)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt].extend(out[fail[nxt]])
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(o) for o in out]
+
+    def id_of(self, kw):
+        """키워드 id. 미등록이면 None."""
+        return self._ids.get(kw)
+
+    def find(self, text):
+        """text에 한 번 이상 나타나는 키워드 id 집합."""
+        found = set()
+        if not text:
+            return found
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+class AccountRuleMatcher:
+    """정렬된 계정과목 규칙 [(카테고리, [키워드...]), ...] 을 컴파일한 매처.
+
+    match(text) → (카테고리, 키워드 또는 None, 키워드 길이). 키워드 None은 어떤 규칙도 덮어쓰지 않음(기존 값 유지).
+    """
+
+    def __init__(self, rules):
+        self.rules = [(cat, list(kws)) for cat, kws in rules if kws]
+        patterns = []
+        for _, kws in self.rules:
+            for kw in kws:
+                patterns.append(kw)
+                patterns.append(re.escape(kw))
+        self._automaton = KeywordAutomaton(patterns)
+        ac = self._automaton
+        self._rule_kws = []
+        trigger_rules = {}
+        for ri, (_, kws) in enumerate(self.rules):
+            self._rule_kws.append(tuple((kw, ac.id_of(kw)) for kw in kws))
+            for kw in kws:
+                trigger_rules.setdefault(ac.id_of(re.escape(kw)), set()).add(ri)
+        self._trigger_rules = {tid: tuple(sorted(ris)) for tid, ris in trigger_rules.items()}
+        # 규칙 내용 지문 (분류 메모 키)
+        self.fingerprint = hashlib.sha1(repr(self.rules).encode('utf-8')).hexdigest()
+
+    def match(self, text):
+        found = self._automaton.find(text)
+        cat, kw, klen = DEFAULT_CATEGORY, None, 0
+        if not found:
+            return cat, kw, klen
+        candidates = set()
+        for tid in found:
+            ris = self._trigger_rules.get(tid)
+            if ris:
+                candidates.update(ris)
+        for ri in sorted(candidates):
+            best = ''
+            for k, kid in self._rule_kws[ri]:
+                if kid in found and len(k) > len(best):
+                    best = k
+            if cat == DEFAULT_CATEGORY or len(best) > klen:
+                cat, kw, klen = self.rules[ri][0], best, len(best)
+        return cat, kw, klen
+
+    def match_series(self, texts, memo=None):
+        """문자열 Series → (카테고리 ndarray, 키워드 ndarray). 고유 텍스트마다 한 번만 match 후 코드로 펼침.
+        키워드 None은 미매칭(기존 값 유지) 행. memo(ClassificationMemo)가 있으면 이전 결과 재사용 후 새 결과 저장.
+        결측(None/NaN)은 빈 문자열로 본다 (factorize 코드 -1 이 마지막 고유값을 가리키지 않게)."""
+        codes, uniques = pd.factorize(pd.Series(texts, dtype=object).fillna('').astype(str))
+        known = memo.lookup(self.fingerprint) if memo is not None else {}
+        new = {}
+        cats_u = np.empty(len(uniques), dtype=object)
+        kws_u = np.empty(len(uniques), dtype=object)
+        for i, text in enumerate(uniques):
+            hit = known.get(text)
+            if hit is None:
+                cat, kw, _ = self.match(text)
+                new[text] = (cat, kw)
+            else:
+                cat, kw = hit
+            cats_u[i], kws_u[i] = cat, kw
+        if memo is not None:
+            memo.store(self.fingerprint, new)
+        return cats_u[codes], kws_u[codes]
+
+
+@lru_cache(maxsize=16)
+def compile_account_rules(rules):
+    """((카테고리, (키워드, ...)), ...) → AccountRuleMatcher. 같은 규칙이면 컴파일 결과 재사용."""
+    return AccountRuleMatcher(rules)
+
+
+class FirstRuleMatcher:
+    """[(카테고리, (키워드, ...)), ...] 규칙을 컴파일한 매처. 키워드가 하나라도 텍스트에 포함된 첫 규칙의 카테고리.
+
+    match(text) → 카테고리 또는 None (어떤 규칙도 맞지 않음).
+    """
+
+    def __init__(self, rules):
+        self.rules = [(cat, tuple(kws)) for cat, kws in rules if kws]
+        self._automaton = KeywordAutomaton([kw for _, kws in self.rules for kw in kws])
+        # 키워드 id → 그 키워드를 가진 가장 앞선 규칙 번호
+        first_rule = {}
+        for ri, (_, kws) in enumerate(self.rules):
+            for kw in kws:
+                first_rule.setdefault(self._automaton.id_of(kw), ri)
+        self._first_rule = first_rule
+
+    def match(self, text):
+        found = self._automaton.find(text)
+        if not found:
+            return None
+        return self.rules[min(self._first_rule[kid] for kid in found)][0]
+
+    def match_series(self, texts):
+        """문자열 Series → 카테고리 ndarray (미매칭 None). 고유 텍스트마다 한 번만 match 후 코드로 펼침. 결측은 빈 문자열."""
+        codes, uniques = pd.factorize(pd.Series(texts, dtype=object).fillna('').astype(str))
+        cats_u = np.empty(len(uniques), dtype=object)
+        for i, text in enumerate(uniques):
+            cats_u[i] = self.match(text)
+        return cats_u[codes]
+
+
+@lru_cache(maxsize=16)
+def compile_first_rules(rules):
+    """((카테고리, (키워드, ...)), ...) → FirstRuleMatcher. 같은 규칙이면 컴파일 결과 재사용."""
+    return FirstRuleMatcher(rules)
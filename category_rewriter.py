@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""전처리/후처리 키워드 치환 엔진. (규칙 1회 컴파일 → 셀당 한 번 스캔)
+
+규칙(키워드→카테고리)을 긴 키워드 우선 순서 그대로 '단계'로 묶는다. 한 단계 안의 규칙끼리는
+서로 간섭하지 않으므로(키워드 겹침 없음, 앞 규칙 치환 결과가 뒤 키워드를 만들지 않음) 하나의 교대(|) 정규식으로
+한 번에 치환해도 규칙을 하나씩 순차 적용한 결과와 같다. 간섭하는 규칙이 나오면 새 단계를 시작한다.
+
+- 전처리(은행): 키워드 글자 사이 공백 허용, NFC 정규화, 변경 없으면 원래 셀 값 유지.
+- 후처리(은행): 키워드 그대로 매칭, 카테고리는 re 치환 템플릿 (str.replace(re.escape(kw), cat, regex=True)).
+- 전처리/후처리(카드): 키워드·카테고리 모두 문자열 그대로 (str.replace(kw, cat, regex=False)).
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+import pandas as pd
+
+# NFC 결합·재배열이 일어나지 않는 문자만으로 된 텍스트 (ASCII·라틴1, 한글 음절·호환 자모, 한자, 전각 등)
+_NFC_INERT = re.compile(
+    r'[\u0000-\u02ff\u2010-\u2027\u2030-\u205e\u3000-\u3029\u3030-\u303f'
+    r'\u3131-\u318e\u4e00-\u9fff\uac00-\ud7a3\uff01-\uff9d\uffa0-\uffef]*'
+)
+_WS = re.compile(r'\s+')
+
+
+def _is_nfc_inert(text):
+    return _NFC_INERT.fullmatch(text) is not None
+
+
+def _overlaps(a, b):
+    """a, b 중 하나가 다른 것을 포함하거나, 한쪽 끝과 다른 쪽 시작이 겹치면 True."""
+    if not a or not b:
+        return False
+    if a in b or b in a:
+        return True
+    for k in range(1, min(len(a), len(b))):
+        if a.endswith(b[:k]) or b.endswith(a[:k]):
+            return True
+    return False
+
+
+def _spaced_pattern(keyword):
+    return r'\s*'.join(re.escape(c) for c in keyword)
+
+
+def _spaced_replace_one(cell_val, keyword, category):
+    """한 셀 값에서 키워드(공백 허용)를 카테고리로 치환. 셀 내 모든 매칭 치환. NFC 정규화. (규칙 1개 순차 적용 기준)"""
+    if cell_val is None or (isinstance(cell_val, float) and cell_val != cell_val):
+        return cell_val
+    s = unicodedata.normalize('NFC', str(cell_val))
+    if not keyword or keyword not in _WS.sub('', s):
+        return cell_val
+    out = re.sub(_spaced_pattern(keyword), category, s)
+    return out if out != s else cell_val
+
+
+class _Stage:
+    """서로 간섭하지 않는 규칙 묶음. 규칙 1개짜리 단계는 카테고리를 re 치환 템플릿으로 그대로 사용."""
+
+    def __init__(self, patterns, replacements, template=None):
+        if template is not None:
+            self._regex = re.compile(patterns[0])
+            self._repl = template
+        else:
+            self._regex = re.compile('|'.join('(' + p + ')' for p in patterns))
+            self._repl = lambda m: replacements[m.lastindex - 1]
+
+    def sub(self, text):
+        return self._regex.sub(self._repl, text)
+
+
+class _StagedRewriter:
+    """규칙 [(키워드, 카테고리)] (적용 순서대로)를 단계로 묶어 컴파일. 하위 클래스가 패턴·비교 문자열 규칙을 정함."""
+
+    # True면 카테고리를 re 치환 템플릿으로 해석 (역슬래시 포함 규칙은 단독 단계)
+    template = True
+
+    def _pattern(self, kw):
+        return re.escape(kw)
+
+    def _overlap_text(self, text):
+        return text
+
+    def _build_stages(self):
+        self._stages = []
+        cur_patterns, cur_repls, cur_kws, cur_exps = [], [], [], []
+
+        def flush():
+            if cur_patterns:
+                self._stages.append(_Stage(list(cur_patterns), list(cur_repls)))
+                for lst in (cur_patterns, cur_repls, cur_kws, cur_exps):
+                    lst.clear()
+
+        for kw, cat in self.rules:
+            pattern = self._pattern(kw)
+            if self.template and '\\' in cat:
+                # 치환 템플릿(역슬래시 이스케이프·그룹 참조)은 단독 단계에서 re.sub 그대로 사용
+                flush()
+                self._stages.append(_Stage([pattern], None, template=cat))
+                continue
+            kw_cmp = self._overlap_text(kw)
+            exp = self._overlap_text(cat)
+            # 앞 규칙과 키워드가 겹치거나, 앞 규칙 치환 결과가 이 키워드를 만들 수 있으면(빈 치환 포함) 새 단계
+            conflict = any(
+                _overlaps(k, kw_cmp) or _overlaps(e, kw_cmp) or not e
+                for k, e in zip(cur_kws, cur_exps)
+            )
+            if conflict:
+                flush()
+            cur_patterns.append(pattern)
+            cur_repls.append(cat)
+            cur_kws.append(kw_cmp)
+            cur_exps.append(exp)
+        flush()
+
+    def _rewrite_text(self, s):
+        for stage in self._stages:
+            s = stage.sub(s)
+        return s
+
+
+class KeywordRewriter(_StagedRewriter):
+    """키워드 그대로 매칭하는 치환 규칙 컴파일 결과. 문자열 셀 전용.
+
+    template=True: 규칙마다 str.replace(re.escape(kw), cat, regex=True) 순차 적용과 같음 (은행 후처리).
+    template=False: 규칙마다 str.replace(kw, cat, regex=False) 순차 적용과 같음 (카드 전처리/후처리).
+    """
+
+    def __init__(self, rules, template=True):
+        self.template = template
+        self.rules = [(kw, cat) for kw, cat in rules if kw]
+        self._build_stages()
+
+    def rewrite(self, text):
+        return self._rewrite_text(text)
+
+    def rewrite_series(self, series):
+        """문자열 Series 각 셀에 rewrite 적용(같은 값은 한 번만). dtype·index 유지."""
+        if not self.rules:
+            return series
+        memo = {}
+        values = []
+        for v in series.tolist():
+            out = memo.get(v)
+            if out is None:
+                out = memo[v] = self.rewrite(v)
+            values.append(out)
+        return pd.Series(values, index=series.index, name=series.name, dtype=series.dtype)
+
+
+class SpacedKeywordRewriter(_StagedRewriter):
+    """은행 전처리 규칙 [(키워드, 카테고리)] (긴 키워드 먼저) 컴파일 결과.
+
+    rewrite(cell) 은 규칙마다 _spaced_replace_one 을 순서대로 적용한 것과 같은 값을 돌려준다.
+    """
+
+    def __init__(self, rules):
+        # 키워드에 공백이 있으면 공백 제거 텍스트에 포함될 수 없어 적용되지 않음 → 제외
+        self.rules = [(kw, cat) for kw, cat in rules if kw and not _WS.search(kw)]
+        self._stages = []
+        # 카테고리가 NFC 결합을 일으킬 수 있으면 단계 묶음 없이 규칙별 순차 적용
+        self._inert = all(
+            unicodedata.is_normalized('NFC', cat) and _is_nfc_inert(cat) for _, cat in self.rules
+        )
+        if self._inert:
+            self._build_stages()
+
+    def _pattern(self, kw):
+        return _spaced_pattern(kw)
+
+    def _overlap_text(self, text):
+        return _WS.sub('', text)
+
+    def rewrite(self, cell_val):
+        if cell_val is None or (isinstance(cell_val, float) and cell_val != cell_val):
+            return cell_val
+        if not self.rules:
+            return cell_val
+        s = unicodedata.normalize('NFC', str(cell_val))
+        if not self._inert or not _is_nfc_inert(s):
+            for kw, cat in self.rules:
+                cell_val = _spaced_replace_one(cell_val, kw, cat)
+            return cell_val
+        changed = False
+        for stage in self._stages:
+            out = stage.sub(s)
+            if out != s:
+                s = out
+                changed = True
+        return s if changed else cell_val
+
+    def rewrite_series(self, series):
+        """Series 각 셀에 rewrite 적용. 같은 값은 한 번만 계산."""
+        memo = {}
+
+        def _one(v):
+            key = (type(v), v)
+            try:
+                return memo[key]
+            except KeyError:
+                out = memo[key] = self.rewrite(v)
+                return out
+            except TypeError:
+                return self.rewrite(v)
+
+        return series.apply(_one)
+
+
+@lru_cache(maxsize=16)
+def compile_spaced_rules(rules):
+    """((키워드, 카테고리), ...) → SpacedKeywordRewriter. 같은 규칙이면 컴파일 결과 재사용."""
+    return SpacedKeywordRewriter(rules)
+
+
+@lru_cache(maxsize=32)
+def compile_keyword_rules(rules, template=True):
+    """((키워드, 카테고리), ...) → KeywordRewriter. 같은 규칙이면 컴파일 결과 재사용."""
+    return KeywordRewriter(rules, template=template)
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""category_table.json → 분류별 컴파일 규칙 세트 (은행·카드·금융정보 공용).
+
+파일 (mtime, 크기, inode)가 같으면 캐시된 규칙 세트를 그대로 반환하고, 바뀌었으면 내용 해시(sha1)를 비교해
+내용이 같을 때만 재사용한다. 내용이 바뀐 경우에만 load_category_table로 다시 읽고 분류별 규칙을 다시 만든다.
+규칙 세트 로드는 파일을 쓰지 않는다 (업종분류 5~10호 행 보강 없이 파일 내용 그대로 사용).
+편집(apply_category_action)·복구(ensure_prepost_in_table)는 모두 파일을 교체하므로 다음 호출에서 자동 갱신된다.
+"""
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+from category_table_io import (
+    _json_path,
+    ensure_prepost_in_table,
+    get_category_table_path,
+    load_category_table,
+    normalize_category_df,
+    normalize_주식회사_for_match,
+)
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _str(val):
+    if val is None or (isinstance(val, float) and pd.isna(val)):
+        return ''
+    return str(val).strip()
+
+
+def _simya_minutes(x):
+    """'22:00:00' → 1320. 잘못된 형식이면 None."""
+    x = x.replace(':', '').replace('.', '')[:4]
+    if len(x) < 4:
+        return None
+    try:
+        h, m = int(x[:2]), int(x[2:4])
+        if 0 <= h <= 23 and 0 <= m <= 59:
+            return h * 60 + m
+    except ValueError:
+        pass
+    return None
+
+
+class CategoryRuleSet:
+    """한 버전의 category_table에서 만든 분류별 규칙. 지연 생성 후 보관(읽기 전용으로 사용)."""
+
+    def __init__(self, path, df, fingerprint):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.df = df
+        self._memo = {}
+        self._lock = threading.RLock()
+
+    def _get(self, key, build):
+        with self._lock:
+            if key not in self._memo:
+                self._memo[key] = build()
+            return self._memo[key]
+
+    def has_prepost(self):
+        """전처리·후처리 행이 모두 있는지."""
+        if self.df.empty or '분류' not in self.df.columns:
+            return False
+        분류_str = self.df['분류'].astype(str).str.strip()
+        return bool((분류_str == '전처리').any() and (분류_str == '후처리').any())
+
+    def tables(self):
+        """분류명 → DataFrame dict (은행 get_category_tables 형식). 호출마다 복사본 반환."""
+        tables = self._get('tables', self._build_tables)
+        return {k: v.copy() for k, v in tables.items()}
+
+    def _build_tables(self):
+        category_df = self.df.copy()
+        category_df.columns = [str(c).strip() for c in category_df.columns]
+        if '구분' in category_df.columns:
+            category_df = category_df.drop(columns=['구분'], errors='ignore')
+        category_tables = {}
+        분류_컬럼명 = '분류' if '분류' in category_df.columns else '차수'
+        차수_분류_매핑 = {'1차': '입출금', '2차': '전처리', '6차': '기타거래'}
+        for 값 in category_df[분류_컬럼명].unique():
+            if pd.notna(값):
+                값_str = str(값).strip()
+                if 분류_컬럼명 == '차수' and 값_str in 차수_분류_매핑:
+                    분류명 = 차수_분류_매핑[값_str]
+                else:
+                    분류명 = 값_str
+                category_tables[분류명] = category_df[category_df[분류_컬럼명] == 값].copy()
+        return category_tables
+
+    def bank_전처리_rules(self):
+        """은행 전처리 [(키워드(주식회사 정규화), 카테고리)]. 키워드==카테고리 제외, 긴 키워드 먼저."""
+        return self._get('bank_전처리', self._build_bank_전처리)
+
+    def _build_bank_전처리(self):
+        tbl = self._get('tables', self._build_tables).get('전처리')
+        if tbl is None:
+            return []
+        rules = []
+        for _, row in tbl.iterrows():
+            kw = str(row.get('키워드', '') or '').strip()
+            cat = str(row.get('카테고리', '') or '').strip()
+            if not kw or pd.isna(row.get('카테고리')):
+                continue
+            if kw == cat:
+                continue
+            kw_norm = normalize_주식회사_for_match(kw)
+            if kw_norm:
+                rules.append((kw_norm, cat))
+        rules.sort(key=lambda x: len(x[0]), reverse=True)
+        return rules
+
+    def card_prepost_rules(self):
+        """카드 (전처리_list, 후처리_list). 각 항목 {'키워드', '카테고리'}, 긴 키워드 먼저."""
+        return self._get('card_prepost', self._build_card_prepost)
+
+    def _build_card_prepost(self):
+        full = self.df.copy()
+        full.columns = [str(c).strip() for c in full.columns]
+        if '분류' not in full.columns or '키워드' not in full.columns or '카테고리' not in full.columns:
+            return [], []
+        전처리 = []
+        후처리 = []
+        for _, row in full.iterrows():
+            분류 = str(row.get('분류', '')).strip()
+            키워드 = str(row.get('키워드', '')).strip()
+            카테고리 = str(row.get('카테고리', '')).strip()
+            if not 키워드:
+                continue
+            if 분류 == '전처리':
+                전처리.append({'키워드': 키워드, '카테고리': 카테고리})
+            elif 분류 == '후처리':
+                후처리.append({'키워드': 키워드, '카테고리': 카테고리})
+        전처리.sort(key=lambda x: len(x['키워드']), reverse=True)
+        후처리.sort(key=lambda x: len(x['키워드']), reverse=True)
+        return 전처리, 후처리
+
+    def simya_range(self):
+        """심야구분 첫 유효 행 (시작분, 종료분). 없으면 None."""
+        return self._get('simya', self._build_simya)
+
+    def _build_simya(self):
+        for _, row in self.df.iterrows():
+            if _str(row.get('분류')) != '심야구분':
+                continue
+            kw = _str(row.get('키워드', ''))
+            if '/' not in kw:
+                continue
+            parts = kw.split('/')
+            if len(parts) != 2:
+                continue
+            start_m = _simya_minutes(parts[0].strip())
+            end_m = _simya_minutes(parts[1].strip())
+            if start_m is None or end_m is None:
+                continue
+            return (start_m, end_m)
+        return None
+
+    def 업종분류_keywords(self):
+        """업종분류 카테고리 → 키워드 토큰 list (쉼표·슬래시·줄바꿈·공백 구분, '분류N호' 라벨 제외). 뒤 행 우선."""
+        return self._get('업종분류', self._build_업종분류)
+
+    def _build_업종분류(self):
+        result = {}
+        for _, row in self.df.iterrows():
+            if _str(row.get('분류')) != '업종분류':
+                continue
+            cat = _str(row.get('카테고리', ''))
+            kw_str = _str(row.get('키워드', ''))
+            if not kw_str:
+                continue
+            for sep in (',', '/', '\n', '\r'):
+                kw_str = kw_str.replace(sep, ' ')
+            raw = [t.strip() for t in kw_str.split() if t.strip()]
+            tokens = [t for t in raw if not (len(t) >= 4 and t.startswith('분류') and t.endswith('호'))]
+            if tokens:
+                result[cat] = tokens
+        return result
+
+    def keyword_rules(self, 분류들):
+        """분류가 분류들 중 하나인 행을 테이블 순서대로 [(카테고리, (키워드, ...))]. 키워드는 공백 제거 후 '/' 분리."""
+        key = ('keyword_rules', tuple(분류들))
+        return self._get(key, lambda: self._build_keyword_rules(분류들))
+
+    def _build_keyword_rules(self, 분류들):
+        if self.df.empty or '분류' not in self.df.columns:
+            return []
+        rows = self.df[self.df['분류'].fillna('').astype(str).str.strip().isin(분류들)]
+        rules = []
+        for _, r in rows.iterrows():
+            kw = _str(r.get('키워드') or '')
+            if not kw:
+                continue
+            cat = _str(r.get('카테고리') or '')
+            keys = tuple(k for k in (p.strip() for p in kw.replace(' ', '').split('/')) if k)
+            rules.append((cat, keys))
+        return rules
+
+
+def _file_key(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _load_rule_set(path):
+    if not os.path.exists(path):
+        _cache.pop(path, None)
+        return None
+    key = _file_key(path)
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with open(path, 'rb') as f:
+        fingerprint = hashlib.sha1(f.read()).hexdigest()
+    if cached is not None and cached[1].fingerprint == fingerprint:
+        _cache[path] = (key, cached[1])
+        return cached[1]
+    # 읽기 전용: 업종분류 행 보강(파일 쓰기)은 하지 않음 → 읽기가 파일을 바꿔 캐시를 무효화하지 않게
+    df = load_category_table(path, default_empty=True, ensure_risk_rows=False)
+    df = normalize_category_df(df).fillna('')
+    rule_set = CategoryRuleSet(path, df, fingerprint)
+    _cache[path] = (key, rule_set)
+    return rule_set
+
+
+def get_rule_set(path=None, ensure_prepost=False):
+    """category_table.json(path, 생략 시 기본 경로)의 CategoryRuleSet. 파일 없으면 None.
+    ensure_prepost=True면 전처리/후처리 행이 없을 때 ensure_prepost_in_table로 기본 규칙 보강 후 반환."""
+    path = _json_path(path or get_category_table_path())
+    if not path:
+        return None
+    with _cache_lock:
+        rule_set = _load_rule_set(path)
+        if ensure_prepost and rule_set is not None and not rule_set.df.empty and not rule_set.has_prepost():
+            ensure_prepost_in_table(path)
+            rule_set = _load_rule_set(path)
+        return rule_set
+
+
+def clear_rule_set_cache():
+    """캐시 전체 비우기 (테스트·강제 재로드용)."""
+    with _cache_lock:
+        _cache.clear()
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 """category_table.json 읽기/쓰기. load/get, apply_action, safe_write, normalize_category_df.
 
-캐시 미적용: 코드에서 table은 캐시를 사용하지 않는다. category_table, linkage_table 모두 매 요청 시 파일에서 읽음.
+캐시 미적용: 이 모듈의 load/get은 캐시를 사용하지 않는다. category_table, linkage_table 모두 매 요청 시 파일에서 읽음.
+분류별 컴파일 규칙은 category_rules.get_rule_set()이 파일 내용 해시 기준으로 캐시한다.
 """
 import json
 import os
@@ -84,8 +85,9 @@ def _ensure_업종분류_risk_rows(path, df):
     return df
 
 
-def load_category_table(path, default_empty=True):
-    """JSON 안전 읽기. xlsx면 json 경로로 변환. 없/손상 시 빈 DataFrame 또는 None."""
+def load_category_table(path, default_empty=True, ensure_risk_rows=True):
+    """JSON 안전 읽기. xlsx면 json 경로로 변환. 없/손상 시 빈 DataFrame 또는 None.
+    ensure_risk_rows=False면 업종분류 5~10호 행 보강(변경 시 파일 저장)을 하지 않고 파일 내용 그대로 읽음."""
     path = _json_path(path)
     if not path:
         return pd.DataFrame(columns=CATEGORY_TABLE_COLUMNS) if default_empty else None
@@ -114,7 +116,8 @@ def load_category_table(path, default_empty=True):
         for c in CATEGORY_TABLE_COLUMNS:
             if c not in df.columns:
                 df[c] = ''
-        df = _ensure_업종분류_risk_rows(path, df)
+        if ensure_risk_rows:
+            df = _ensure_업종분류_risk_rows(path, df)
         return df
     except (json.JSONDecodeError, TypeError, IOError):
         return pd.DataFrame(columns=CATEGORY_TABLE_COLUMNS) if default_empty else None
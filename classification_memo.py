@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""계정과목 분류 결과 디스크 메모. (.source/classification_memo.sqlite, 은행·카드 공용)
+
+키: (구분 bank/card, 규칙 지문, 정규화된 검색 텍스트) → 값: (카테고리, 키워드).
+규칙 지문은 컴파일된 계정과목 규칙 내용의 해시이므로 규칙이 바뀌면 자동으로 다른 키가 된다.
+after 재생성 시 이전 실행에서 본 텍스트는 다시 분류하지 않고, 새로 들어온 텍스트만 분류한다.
+구분별로 최근 사용한 지문 _MAX_FINGERPRINTS개만 남기고 나머지는 삭제.
+메모 읽기/쓰기 실패(잠김·권한 등)는 무시하고 일반 분류로 진행. MYINFO_CLASSIFY_MEMO=0 이면 사용 안 함.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+MEMO_FILENAME = 'classification_memo.sqlite'
+_MAX_FINGERPRINTS = 4
+_lock = threading.Lock()
+
+
+def get_memo_path(project_root=None):
+    """프로젝트 루트 기준 .source/classification_memo.sqlite 경로."""
+    root = project_root or os.environ.get('MYINFO_ROOT') or os.path.dirname(os.path.abspath(__file__))
+    return os.path.normpath(os.path.join(root, '.source', MEMO_FILENAME))
+
+
+class ClassificationMemo:
+    """한 구분(kind)의 분류 메모. lookup/store 는 실패 시 빈 결과·무시."""
+
+    def __init__(self, path, kind):
+        self.path = path
+        self.kind = kind
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS memo ('
+            'kind TEXT NOT NULL, fingerprint TEXT NOT NULL, text TEXT NOT NULL, '
+            'category TEXT, keyword TEXT, PRIMARY KEY (kind, fingerprint, text))'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS fingerprints ('
+            'kind TEXT NOT NULL, fingerprint TEXT NOT NULL, last_used REAL, PRIMARY KEY (kind, fingerprint))'
+        )
+        return conn
+
+    def lookup(self, fingerprint):
+        """지문에 해당하는 메모 전체 {텍스트: (카테고리, 키워드)}."""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with _lock:
+                conn = self._connect()
+                try:
+                    rows = conn.execute(
+                        'SELECT text, category, keyword FROM memo WHERE kind = ? AND fingerprint = ?',
+                        (self.kind, fingerprint),
+                    ).fetchall()
+                finally:
+                    conn.close()
+        except (sqlite3.Error, OSError):
+            return {}
+        return {text: (cat, kw) for text, cat, kw in rows}
+
+    def store(self, fingerprint, results):
+        """새로 분류한 결과 {텍스트: (카테고리, 키워드)} 저장 후 오래된 지문 정리."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with _lock:
+                conn = self._connect()
+                try:
+                    with conn:
+                        if results:
+                            conn.executemany(
+                                'INSERT OR REPLACE INTO memo (kind, fingerprint, text, category, keyword) '
+                                'VALUES (?, ?, ?, ?, ?)',
+                                [(self.kind, fingerprint, t, c, k) for t, (c, k) in results.items()],
+                            )
+                        conn.execute(
+                            'INSERT OR REPLACE INTO fingerprints (kind, fingerprint, last_used) VALUES (?, ?, ?)',
+                            (self.kind, fingerprint, time.time()),
+                        )
+                        stale = [r[0] for r in conn.execute(
+                            'SELECT fingerprint FROM fingerprints WHERE kind = ? ORDER BY last_used DESC LIMIT -1 OFFSET ?',
+                            (self.kind, _MAX_FINGERPRINTS),
+                        ).fetchall()]
+                        for fp in stale:
+                            conn.execute('DELETE FROM memo WHERE kind = ? AND fingerprint = ?', (self.kind, fp))
+                            conn.execute('DELETE FROM fingerprints WHERE kind = ? AND fingerprint = ?', (self.kind, fp))
+                finally:
+                    conn.close()
+        except (sqlite3.Error, OSError):
+            pass
+
+
+def get_classification_memo(kind, project_root=None):
+    """kind('bank' | 'card') 메모. MYINFO_CLASSIFY_MEMO=0 이면 None."""
+    if os.environ.get('MYINFO_CLASSIFY_MEMO', '1').strip() == '0':
+        return None
+    return ClassificationMemo(get_memo_path(project_root), kind)
@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""셀 값 정리 함수와 컬럼 커널. (은행·카드·금융정보 공용)
+
+스칼라 함수: clean_amount, safe_str, normalize_fullwidth, normalize_business_number,
+  normalize_date_value, split_datetime_value, normalize_time_value (셀 하나 정리, process_* 모듈 공용 정의)
+컬럼 커널(*_column): 같은 결과를 컬럼 단위로 계산.
+  - 고유값마다 한 번만 계산해 행에 펼친다 (map_unique). 같은 값 판정은 타입까지 같을 때만 (1, 1.0, True 는 다른 값)
+  - 숫자 dtype 금액 컬럼은 numpy 로, safe_str 은 고유값에 pandas 문자열 연산으로 처리
+결과·dtype 은 Series.apply(스칼라 함수) 와 같다.
+"""
+import re
+import unicodedata
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+try:
+    from category_table_io import normalize_주식회사_for_match
+except ImportError:
+    def normalize_주식회사_for_match(text):
+        if text is None or (isinstance(text, str) and not str(text).strip()):
+            return '' if text is None else str(text).strip()
+        val = str(text).strip()
+        val = re.sub(r'[\s/]*주식회사[\s/]*', '(주)', val)
+        val = re.sub(r'[\s/]*㈜[\s/]*', '(주)', val)
+        val = re.sub(r'(\(주\)[\s/]*)+', '(주)', val)
+        return val
+
+# safe_str 에서 지우는 빈 괄호 (은행은 '{}' 만)
+SAFE_STR_REMOVE = ('{}', '[]')
+_SAFE_STR_EMPTY = ('nan', 'na', 'n', 'none', '')
+# factorize 로 고유값을 묶어도 되는 (한 가지 타입만 있는) 값 종류
+_HOMOGENEOUS_KINDS = ('string', 'empty', 'floating', 'integer', 'boolean')
+_TIME_PATTERN = re.compile(r'^(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?')
+_HAS_TIME = re.compile(r'\d{1,2}:\d{1,2}')
+_ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}')
+_DOTTED_DATE = re.compile(r'^\d{4}\.\d')
+_NON_DIGIT = re.compile(r'\D')
+
+
+# ----- 스칼라 함수 -----
+
+def clean_amount(value):
+    """금액 데이터 정리 (쉼표 제거, 숫자 변환)."""
+    if pd.isna(value) or value == '' or value == 0:
+        return 0
+    if isinstance(value, (int, float)):
+        return float(value)
+    value_str = str(value).replace(',', '').strip()
+    if value_str == '' or value_str == '-':
+        return 0
+    try:
+        return float(value_str)
+    except (ValueError, TypeError):
+        return 0
+
+
+def safe_str(value, remove=SAFE_STR_REMOVE):
+    """NaN 값 처리 및 안전한 문자열 변환. 전처리/후처리 매칭용으로 주식회사·㈜ → (주) 통일.
+    remove: 지울 빈 괄호 문자열 (기본 '{}', '[]')."""
+    if pd.isna(value) or value is None:
+        return ""
+    val = str(value).strip()
+    if val.lower() in _SAFE_STR_EMPTY:
+        return ""
+    val = normalize_주식회사_for_match(val)
+    val = val.replace('((', '(')
+    val = val.replace('))', ')')
+    val = val.replace('__', '_')
+    for s in remove:
+        val = val.replace(s, '')
+    if val.count('(') != val.count(')'):
+        if val.count('(') > val.count(')'):
+            val = val.replace('(', '')
+        elif val.count(')') > val.count('('):
+            val = val.replace(')', '')
+    return val
+
+
+def normalize_fullwidth(val):
+    """전각(Fullwidth) 문자 → 반각(Halfwidth) 변환 (예: ＳＫＴ５３２２ → SKT5322)."""
+    if pd.isna(val) or val == '':
+        return val
+    return unicodedata.normalize('NFKC', str(val).strip())
+
+
+def business_number_digits(value):
+    """사업자번호 셀 값에서 숫자만 추출(10자리). Excel 숫자형(1234567890.0)·9자리(앞 0 제거) 보정."""
+    if pd.isna(value) or value == '':
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        n = int(float(value))
+        if n < 0 or n >= 10 ** 10:
+            return None
+        return str(n).zfill(10) if n < 10 ** 9 else str(n)
+    s = str(value).strip()
+    digits = _NON_DIGIT.sub('', s)
+    if len(digits) == 8:
+        return digits.zfill(10)
+    if len(digits) == 9:
+        return digits.zfill(10)
+    if len(digits) == 10:
+        return digits
+    return None
+
+
+def normalize_business_number(value):
+    """사업자번호를 000-00-00000 형식으로만 정규화 (숫자형·9자리 보정). 사업자번호가 아니면 ''."""
+    digits = business_number_digits(value)
+    if digits is None:
+        return ''
+    return f'{digits[:3]}-{digits[3:5]}-{digits[5:]}'
+
+
+def normalize_date_value(val):
+    """날짜 값을 YYYY-MM-DD 형식으로 정규화."""
+    if pd.isna(val) or val == '' or (isinstance(val, str) and not str(val).strip()):
+        return str(val).strip() if val else ''
+    try:
+        if hasattr(val, 'strftime'):
+            return val.strftime('%Y-%m-%d')
+        if isinstance(val, (int, float)) and not isinstance(val, bool):
+            n = int(float(val))
+            if n >= 1000:
+                base = datetime(1899, 12, 30)
+                return (base + timedelta(days=n)).strftime('%Y-%m-%d')
+            return str(val).strip()
+        s = str(val).strip()
+        if _ISO_DATE.match(s):
+            return s[:10]
+        if '/' in s or '-' in s or ('.' in s and _DOTTED_DATE.match(s)):
+            parts = re.split(r'[/\-.]', s)
+            if len(parts) >= 3:
+                a, b, c = [x.zfill(2) for x in parts[:3]]
+                if len(a) == 2:
+                    y = int(a)
+                    year = (2000 + y) if y < 50 else (1900 + y)
+                    return f'{year}-{b}-{c}'
+                return f'{a}-{b}-{c}' if len(a) == 4 else s
+        return s
+    except Exception:
+        return str(val).strip()
+
+
+def split_datetime_value(val):
+    """'yy/mm/dd'만 있거나 'yy/mm/dd hh:mm:ss' 등이 섞인 값을 날짜/시간으로 분리.
+    반환: (date_str, time_str). 시간이 없으면 time_str은 ''."""
+    if pd.isna(val) or val == '' or (isinstance(val, str) and not str(val).strip()):
+        return ('', '')
+    s = str(val).strip()
+    if not s:
+        return ('', '')
+    # 공백 또는 T로 구분된 날짜+시간 패턴
+    if ' ' in s:
+        parts = s.split(None, 1)
+        if len(parts) == 2 and _HAS_TIME.search(parts[1]):
+            return (parts[0].strip(), parts[1].strip())
+    if 'T' in s and _HAS_TIME.search(s):
+        idx = s.index('T')
+        return (s[:idx].strip(), s[idx + 1:].strip())
+    return (s, '')
+
+
+def normalize_time_value(val):
+    """시간 문자열을 hh:mm 또는 hh:mm:ss 형식으로 정규화."""
+    if pd.isna(val) or val == '' or (isinstance(val, str) and not str(val).strip()):
+        return ''
+    s = str(val).strip()
+    m = _TIME_PATTERN.match(s)
+    if m:
+        h, mi = m.group(1).zfill(2), m.group(2).zfill(2)
+        sec = m.group(3)
+        if sec is not None:
+            return f'{h}:{mi}:{sec.zfill(2)}'
+        return f'{h}:{mi}:00'
+    return s
+
+
+# ----- 컬럼 커널 -----
+
+def _object_array(values):
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype=object)
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = list(values)
+    return arr
+
+
+def _wrap(result, values):
+    if isinstance(values, pd.Series):
+        return pd.Series(result, index=values.index, dtype=object)
+    return result
+
+
+def map_unique(values, func):
+    """values(Series·list·ndarray)에 func 적용. 같은 값(같은 타입이고 ==)은 한 번만 계산해 펼친다.
+    결측(None·NaN·NaT)은 타입별로 한 번. Returns: Series 입력이면 같은 index 의 object Series, 아니면 object ndarray."""
+    arr = _object_array(values)
+    n = len(arr)
+    out = np.empty(n, dtype=object)
+    if not n:
+        return _wrap(out, values)
+    codes, uniques = pd.factorize(arr)
+    if pd.api.types.infer_dtype(arr, skipna=True) in _HOMOGENEOUS_KINDS and (codes >= 0).all():
+        results = np.empty(len(uniques), dtype=object)
+        for k, u in enumerate(uniques):
+            results[k] = func(u)
+        out[:] = results[codes]
+        return _wrap(out, values)
+    # 타입이 섞였거나 결측이 있으면 (값 코드, 타입 코드) 쌍으로 다시 묶는다 (1, 1.0, True 구분)
+    type_codes, type_uniques = pd.factorize(np.fromiter(map(type, arr), dtype=object, count=n))
+    keys = np.where(codes < 0, len(uniques), codes).astype(np.int64) * len(type_uniques) + type_codes
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    results = np.empty(len(first), dtype=object)
+    for k, i in enumerate(first):
+        results[k] = func(arr[i])
+    out[:] = results[inverse.ravel()]
+    return _wrap(out, values)
+
+
+def _like_apply(series, result):
+    """object 결과 → Series.apply 와 같은 dtype 추론."""
+    return pd.Series(result, index=series.index, dtype=object).infer_objects()
+
+
+def clean_amount_column(series):
+    """series.apply(clean_amount) 와 같은 결과. 숫자 dtype 은 numpy, 그 외는 고유값별 계산."""
+    if not isinstance(series, pd.Series):
+        series = pd.Series(_object_array(series), dtype=object)
+    if not len(series):
+        return series.apply(clean_amount)
+    values = series.to_numpy()
+    if values.dtype.kind in 'iuf':
+        vals = values.astype(float)
+        zero = np.isnan(vals) | (vals == 0)
+        if zero.all():
+            return pd.Series(np.zeros(len(vals), dtype=np.int64), index=series.index)
+        return pd.Series(np.where(zero, 0.0, vals), index=series.index)
+    return _like_apply(series, map_unique(series, clean_amount).to_numpy())
+
+
+def _safe_str_strings(out, remove):
+    """safe_str 의 문자열 단계 (str 변환·strip 끝난 Series)."""
+    out = out.where(~out.str.lower().isin(_SAFE_STR_EMPTY), '')
+    # normalize_주식회사_for_match
+    out = out.str.replace(r'[\s/]*주식회사[\s/]*', '(주)', regex=True)
+    out = out.str.replace(r'[\s/]*㈜[\s/]*', '(주)', regex=True)
+    out = out.str.replace(r'(\(주\)[\s/]*)+', '(주)', regex=True)
+    out = out.str.replace('((', '(', regex=False).str.replace('))', ')', regex=False)
+    out = out.str.replace('__', '_', regex=False)
+    for s in remove:
+        out = out.str.replace(s, '', regex=False)
+    opens = out.str.count(r'\(')
+    closes = out.str.count(r'\)')
+    more_open = (opens > closes).to_numpy()
+    more_close = (closes > opens).to_numpy()
+    if more_open.any():
+        out[more_open] = out[more_open].str.replace('(', '', regex=False)
+    if more_close.any():
+        out[more_close] = out[more_close].str.replace(')', '', regex=False)
+    return out
+
+
+def safe_str_column(series, remove=SAFE_STR_REMOVE):
+    """series.apply(safe_str) 와 같은 값 (object Series). 고유 문자열에만 pandas 문자열 연산 적용."""
+    if not isinstance(series, pd.Series):
+        series = pd.Series(_object_array(series), dtype=object)
+    na = series.isna().to_numpy()
+    text = series.astype(object).where(~na, '').astype(str).str.strip()
+    codes, uniques = pd.factorize(text.to_numpy(dtype=object))
+    if not len(uniques):
+        return pd.Series('', index=series.index, dtype=object)
+    cleaned = _safe_str_strings(pd.Series(uniques, dtype=object), remove).to_numpy(dtype=object)
+    return pd.Series(cleaned[codes], index=series.index, dtype=object)
+
+
+def fullwidth_column(values):
+    """normalize_fullwidth 컬럼 버전 (NFKC, 고유값별)."""
+    return map_unique(values, normalize_fullwidth)
+
+
+def nfkc_text_column(series):
+    """문자열 컬럼 → 빈 칸은 '', 그 외 NFKC (strip 없음). fillna('').astype(str) 후 적용 (고유값별)."""
+    text = series.fillna('').astype(str)
+    return map_unique(text, lambda s: unicodedata.normalize('NFKC', s) if s else '')
+
+
+def business_number_column(values):
+    """normalize_business_number 컬럼 버전 (고유값별)."""
+    return map_unique(values, normalize_business_number)
+
+
+def datetime_split_column(values):
+    """날짜+시간이 섞인 컬럼 → (정규화 날짜 배열, 정규화 시간 배열). 시간이 없는 값의 시간은 ''.
+    날짜는 분리한 날짜 부분(없으면 원래 값)을 normalize_date_value, 시간은 normalize_time_value (고유값별)."""
+    def split(v):
+        date_part, time_part = split_datetime_value(v)
+        date = normalize_date_value(date_part) if date_part else normalize_date_value(v)
+        return date, (normalize_time_value(time_part) if time_part else '')
+    pairs = map_unique(values, split)
+    if isinstance(pairs, pd.Series):
+        pairs = pairs.to_numpy()
+    dates = np.empty(len(pairs), dtype=object)
+    times = np.empty(len(pairs), dtype=object)
+    for i, (d, t) in enumerate(pairs):
+        dates[i] = d
+        times[i] = t
+    return dates, times
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""원본 엑셀(.source) 읽기 백엔드. (은행·카드·금융정보 공용)
+
+엔진 선택 (MYINFO_EXCEL_ENGINE: auto | calamine | openpyxl, 기본 auto):
+  - .xlsx: python-calamine 이 설치되어 있으면 calamine (pandas engine='calamine'), 없으면 openpyxl
+  - .xls: xlrd. calamine 은 일부 BIFF 파일(하나은행 내보내기)의 코드페이지를 잘못 읽어 글자가 깨지므로
+    MYINFO_EXCEL_ENGINE=calamine 일 때만 사용
+  - MYINFO_EXCEL_ENGINE=openpyxl: calamine 을 쓰지 않음 (.xlsx openpyxl, .xls xlrd)
+calamine 으로 열기·읽기에 실패하면 기본 엔진(openpyxl/xlrd)으로 다시 읽는다.
+
+셀 값은 엔진과 관계없이 openpyxl/xlrd 로 pd.read_excel 한 것과 같게 맞춘다
+(정수 값 숫자 → int, 날짜 → datetime, 오류 → 빈 칸, openpyxl 처럼 끝쪽 빈 행·빈 칸 제거).
+"""
+import math
+import os
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+
+ENGINE_ENV = 'MYINFO_EXCEL_ENGINE'
+
+# pd.read_excel 기본 NA 문자열 (iter_sheet_rows 에서 이 값의 문자열 셀은 빈 칸으로 봄)
+CELL_NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+
+_calamine_available = None
+
+
+def calamine_available():
+    """python-calamine 설치 여부."""
+    global _calamine_available
+    if _calamine_available is None:
+        try:
+            import python_calamine  # noqa: F401
+            _calamine_available = True
+        except ImportError:
+            _calamine_available = False
+    return _calamine_available
+
+
+def engine_preference():
+    """엔진 선택을 정하는 설정 (MYINFO_EXCEL_ENGINE 값·calamine 설치 여부) 문자열. 읽기 캐시 버전에 포함."""
+    pref = (os.environ.get(ENGINE_ENV) or 'auto').strip().lower()
+    return f'{pref}|calamine={int(calamine_available())}'
+
+
+def default_engine(path):
+    """파일 확장자 기본 엔진. .xls → xlrd, 그 외 → openpyxl"""
+    return 'xlrd' if Path(path).suffix.lower() == '.xls' else 'openpyxl'
+
+
+def excel_engine(path, preference=None):
+    """path 를 읽을 엔진. preference 생략 시 MYINFO_EXCEL_ENGINE (auto | calamine | openpyxl)."""
+    pref = (preference or os.environ.get(ENGINE_ENV) or 'auto').strip().lower()
+    if pref in ('calamine', 'auto') and calamine_available():
+        if pref == 'calamine' or Path(path).suffix.lower() != '.xls':
+            return 'calamine'
+    return default_engine(path)
+
+
+def _with_fallback(path, read, preference=None):
+    """read(engine) 실행. calamine 실패 시 기본 엔진으로 다시 실행."""
+    engine = excel_engine(path, preference)
+    if engine != 'calamine':
+        return read(engine)
+    try:
+        return read(engine)
+    except Exception:
+        return read(default_engine(path))
+
+
+def sheet_names(path, preference=None):
+    """워크시트 이름 list."""
+    def read(engine):
+        with pd.ExcelFile(path, engine=engine) as xls:
+            return list(xls.sheet_names)
+    return _with_fallback(path, read, preference)
+
+
+def _trim_rows(rows):
+    """openpyxl 읽기와 같게: 행 끝 빈 칸('') 제거, 끝쪽 빈 행 제거 후 가장 긴 행 길이로 '' 채움."""
+    trimmed = []
+    last = -1
+    for i, row in enumerate(rows):
+        n = len(row)
+        while n and row[n - 1] == '':
+            n -= 1
+        if n:
+            last = i
+        trimmed.append(row[:n])
+    trimmed = trimmed[:last + 1]
+    if trimmed:
+        width = max(len(r) for r in trimmed)
+        trimmed = [r + [''] * (width - len(r)) if len(r) < width else r for r in trimmed]
+    return trimmed
+
+
+def read_sheet_grids(path, preference=None):
+    """시트마다 변환 없는 셀 값 행 (빈 칸 ''). pd.read_excel(header=None, dtype=object, na_filter=False) 값과 같다.
+    Returns: [(시트명, 행 list)]."""
+    def read(engine):
+        grids = []
+        with pd.ExcelFile(path, engine=engine) as xls:
+            for name in xls.sheet_names:
+                raw = xls.parse(name, header=None, dtype=object, na_filter=False)
+                rows = raw.values.tolist()
+                grids.append((name, _trim_rows(rows) if engine == 'calamine' else rows))
+        return grids
+    return _with_fallback(path, read, preference)
+
+
+def grid_frame(rows, header=None):
+    """read_sheet_grids 의 셀 값 행 → DataFrame. pd.read_excel(header=header) 와 같은 타입 추론(TextParser) 적용."""
+    from pandas.errors import EmptyDataError
+    from pandas.io.parsers import TextParser
+    try:
+        return TextParser([list(r) for r in rows], header=header, skip_blank_lines=False).read()
+    except EmptyDataError:
+        return pd.DataFrame()
+
+
+def read_sheet_frames(path, header=None, preference=None):
+    """시트마다 pd.read_excel(sheet_name=시트, header=header) 와 같은 DataFrame. 파일은 한 번만 연다.
+    Returns: [(시트명, DataFrame)]."""
+    return [(name, grid_frame(rows, header)) for name, rows in read_sheet_grids(path, preference)]
+
+
+def _openpyxl_cell_value(cell):
+    v = cell.value
+    if v is None or cell.data_type == 'e':
+        return None
+    if cell.data_type == 'n':
+        iv = int(v)
+        return iv if iv == v else float(v)
+    if isinstance(v, str) and v in CELL_NA_STRINGS:
+        return None
+    return v
+
+
+def _xlrd_cell_value(v, ctype, datemode):
+    import xlrd
+    if ctype == xlrd.XL_CELL_DATE:
+        try:
+            d = xlrd.xldate.xldate_as_datetime(v, datemode)
+        except OverflowError:
+            return v
+        if d.timetuple()[0:3] == ((1904, 1, 1) if datemode else (1899, 12, 31)):
+            return d.time()
+        return d
+    if ctype == xlrd.XL_CELL_ERROR:
+        return None
+    if ctype == xlrd.XL_CELL_BOOLEAN:
+        return bool(v)
+    if ctype == xlrd.XL_CELL_NUMBER:
+        if math.isfinite(v):
+            iv = int(v)
+            if iv == v:
+                return iv
+        return v
+    if isinstance(v, str) and v in CELL_NA_STRINGS:
+        return None
+    return v
+
+
+def _calamine_cell_value(v):
+    if isinstance(v, float):
+        if math.isfinite(v):
+            iv = int(v)
+            if iv == v:
+                return iv
+        return v
+    if isinstance(v, str):
+        return None if v in CELL_NA_STRINGS else v
+    if isinstance(v, date) and not isinstance(v, datetime):
+        return datetime(v.year, v.month, v.day)
+    return v
+
+
+def _iter_openpyxl(path):
+    from openpyxl import load_workbook
+    book = load_workbook(str(path), read_only=True, data_only=True, keep_links=False)
+    try:
+        for ws in book.worksheets:
+            ws.reset_dimensions()
+            yield ws.title, (tuple(_openpyxl_cell_value(c) for c in cells) for cells in ws.rows)
+    finally:
+        book.close()
+
+
+def _iter_xlrd(path):
+    import xlrd
+    book = xlrd.open_workbook(str(path), on_demand=True)
+    try:
+        datemode = book.datemode
+        for idx, name in enumerate(book.sheet_names()):
+            sheet = book.sheet_by_index(idx)
+            yield name, (
+                tuple(_xlrd_cell_value(v, t, datemode) for v, t in zip(sheet.row_values(r), sheet.row_types(r)))
+                for r in range(sheet.nrows)
+            )
+            book.unload_sheet(idx)
+    finally:
+        book.release_resources()
+
+
+def _iter_calamine(book):
+    from python_calamine import SheetTypeEnum
+    try:
+        for meta in book.sheets_metadata:
+            if meta.typ != SheetTypeEnum.WorkSheet:
+                continue
+            sheet = book.get_sheet_by_name(meta.name)
+            yield meta.name, (tuple(_calamine_cell_value(v) for v in row) for row in sheet.iter_rows())
+    finally:
+        book.close()
+
+
+def iter_sheet_rows(path, preference=None):
+    """시트별 (시트명, 행 iterator) 스트리밍. 행은 셀 값 tuple (빈 칸·오류·NA 문자열은 None).
+    openpyxl read_only / xlrd on_demand / calamine 중 excel_engine 이 고른 것 사용 (시트 단위 로드).
+    calamine 으로 열지 못하면 기본 엔진으로 읽는다. 시트 행은 다음 시트로 넘어가기 전에 소비할 것."""
+    engine = excel_engine(path, preference)
+    if engine == 'calamine':
+        try:
+            from python_calamine import CalamineWorkbook
+            book = CalamineWorkbook.from_path(str(path))
+        except Exception:
+            engine = default_engine(path)
+        else:
+            return _iter_calamine(book)
+    if engine == 'xlrd':
+        return _iter_xlrd(path)
+    return _iter_openpyxl(path)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""원본 엑셀 파일별 읽기 결과 캐시. (.source/ingest_cache, 은행·카드 공용)
+
+매니페스트(kind_manifest.json): 원본 경로 → (크기, mtime, 내용 해시, 캐시 파일).
+캐시 파일: 파일 하나를 읽어 정규화한 결과(은행: DataFrame, 카드: 추출 컬럼 배열)를 pickle 로 저장.
+  - 크기·mtime 이 같으면 해시 계산 없이 캐시 사용
+  - 크기·mtime 이 달라도 내용 해시가 같으면(복사·touch) 캐시 사용 후 매니페스트만 갱신
+  - 새 파일·내용이 바뀐 파일만 다시 읽음. 원본이 없어진 항목은 save() 때 삭제
+pickle 은 object 컬럼(문자·숫자 혼합)과 dtype 을 그대로 보존한다 (parquet 은 pyarrow 필요·혼합 컬럼 불가).
+version 이 다르면(읽기 코드 변경) 전체 무효. 캐시 읽기/쓰기 실패는 무시하고 원본을 읽는다.
+MYINFO_INGEST_CACHE=0 이면 사용 안 함.
+"""
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+
+CACHE_DIRNAME = 'ingest_cache'
+_lock = threading.Lock()
+
+
+def get_cache_dir(project_root=None):
+    """프로젝트 루트 기준 .source/ingest_cache 경로."""
+    root = project_root or os.environ.get('MYINFO_ROOT') or os.path.dirname(os.path.abspath(__file__))
+    return os.path.normpath(os.path.join(root, '.source', CACHE_DIRNAME))
+
+
+def _file_hash(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _atomic_write(path, data):
+    fd, tmp = tempfile.mkstemp(prefix='.tmp_', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class IngestCache:
+    """한 구분(kind)의 파일별 읽기 결과 캐시.
+
+    hit, payload, stamp = cache.lookup(path)
+    if not hit: payload = 읽기(path); cache.store(path, stamp, payload)
+    cache.save(현재 원본 경로 목록)
+    """
+
+    def __init__(self, cache_dir, kind, version):
+        self.cache_dir = cache_dir
+        self.kind = kind
+        self.version = str(version)
+        self.manifest_path = os.path.join(cache_dir, f'{kind}_manifest.json')
+        self._entries = self._load_manifest()
+        self._dirty = False
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != self.version:
+            return {}
+        entries = data.get('files')
+        return entries if isinstance(entries, dict) else {}
+
+    def _frame_path(self, key):
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+        return os.path.join(self.cache_dir, f'{self.kind}_{name}.pkl')
+
+    def lookup(self, path):
+        """Returns: (적중 여부, 캐시된 결과, stamp). 미적중이면 읽은 결과를 stamp 와 함께 store 로 넘긴다.
+        stamp 는 읽기 전 파일 상태이므로, 읽는 도중 파일이 바뀌면 다음 실행에서 다시 읽는다."""
+        key = os.path.normpath(os.path.abspath(str(path)))
+        try:
+            st = os.stat(key)
+        except OSError:
+            return False, None, None
+        stamp = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha1': None}
+        entry = self._entries.get(key)
+        touched = False
+        if entry is None or (entry.get('size'), entry.get('mtime_ns')) != (st.st_size, st.st_mtime_ns):
+            try:
+                stamp['sha1'] = _file_hash(key)
+            except OSError:
+                return False, None, None
+            if entry is None or entry.get('sha1') != stamp['sha1']:
+                return False, None, stamp
+            touched = True
+        try:
+            with open(self._frame_path(key), 'rb') as f:
+                payload = pickle.load(f)
+        except Exception:
+            self._entries.pop(key, None)
+            self._dirty = True
+            return self.lookup(key)
+        if touched:
+            entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+            self._dirty = True
+        return True, payload, stamp
+
+    def store(self, path, stamp, payload):
+        """새로 읽은 결과 저장. stamp 는 lookup 이 돌려준 값 (None 이면 저장 안 함)."""
+        if stamp is None or not stamp.get('sha1'):
+            return
+        key = os.path.normpath(os.path.abspath(str(path)))
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _atomic_write(self._frame_path(key), pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return
+        self._entries[key] = dict(stamp)
+        self._dirty = True
+
+    def save(self, current_paths=None):
+        """매니페스트 저장. current_paths 가 있으면 그 밖의 항목과 캐시 파일은 삭제."""
+        if current_paths is not None:
+            keep = {os.path.normpath(os.path.abspath(str(p))) for p in current_paths}
+            for key in [k for k in self._entries if k not in keep]:
+                del self._entries[key]
+                try:
+                    os.remove(self._frame_path(key))
+                except OSError:
+                    pass
+                self._dirty = True
+        if not self._dirty:
+            return
+        data = {'version': self.version, 'files': self._entries}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with _lock:
+                _atomic_write(self.manifest_path, json.dumps(data, ensure_ascii=False, indent=1).encode('utf-8'))
+            self._dirty = False
+        except OSError:
+            pass
+
+
+def get_ingest_cache(kind, version, project_root=None):
+    """kind('bank' | 'card') 캐시. MYINFO_INGEST_CACHE=0 이면 None."""
+    if os.environ.get('MYINFO_INGEST_CACHE', '1').strip() == '0':
+        return None
+    return IngestCache(get_cache_dir(project_root), kind, version)
@@ -180,6 +180,43 @@ def get_linkage_map_for_apply():
     return code_to_업종분류, code_to_리스크
 
 
+def _risk_float(리스크_str, 업종분류):
+    """업종리스크 문자열 → 위험도. 비었거나 숫자가 아니면 업종분류가 있을 때 5, 없으면 0."""
+    try:
+        return float(리스크_str) if 리스크_str else (5.0 if 업종분류 else 0.0)
+    except (ValueError, TypeError):
+        return 5.0 if 업종분류 else 0.0
+
+
+class LinkageLookup:
+    """업종코드 → 업종분류(str)·위험도(float) 조회표. 리스크 문자열은 만들 때 한 번만 숫자로 바꾼다.
+
+    lookup(codes): 코드 Series 를 map 한 번으로 (업종분류 Series, 위험도 Series). 표에 없는 코드는 ('', 0.0).
+    """
+
+    def __init__(self, code_to_업종분류, code_to_리스크):
+        codes = list(code_to_업종분류)
+        self.업종분류 = pd.Series([code_to_업종분류[c] for c in codes], index=codes, dtype=object)
+        self.위험도 = pd.Series(
+            [_risk_float(code_to_리스크.get(c, ''), code_to_업종분류[c]) for c in codes], index=codes, dtype=float
+        )
+
+    def __len__(self):
+        return len(self.업종분류)
+
+    def lookup(self, codes):
+        """codes: 앞뒤 공백 제거한 업종코드 Series → (업종분류, 위험도) Series (codes 와 같은 index)."""
+        found = codes.isin(self.업종분류.index)
+        분류 = codes.map(self.업종분류).where(found, '')
+        위험도 = codes.map(self.위험도).where(found, 0.0).astype(float)
+        return 분류, 위험도
+
+
+def get_linkage_lookup():
+    """cash_after 적용용 조회표 (LinkageLookup). 매 호출 시 linkage_table.json 에서 새로 만든다."""
+    return LinkageLookup(*get_linkage_map_for_apply())
+
+
 def export_linkage_table_to_xlsx(json_path=None, xlsx_path=None):
     """
     linkage_table.json 내용을 xlsx로 내보냄. 백업·엑셀 편집용.
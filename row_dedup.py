@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""겹치는 원본 내보내기의 중복 행 제거. (은행·카드 통합 공용)
+
+같은 기간이 겹치는 파일(예: 2021-2025 와 2023-2024)·다시 받은 파일에 들어 있는 같은 거래를 한 번만 남긴다.
+행 지문 = 키 컬럼 값(금액은 숫자로 통일, 문자는 앞뒤 공백 제거) 조합. 해시 색인(groupby/duplicated)으로 O(n).
+같은 파일 안의 같은 지문 행은 실제 거래(같은 날 같은 금액 통행료 등)일 수 있으므로 지우지 않는다:
+파일 안에서 k 번째로 나온 지문은 앞선 파일에 같은 지문이 k 번 이상 있었을 때만 중복
+(= 지문마다 가장 많이 나온 파일의 횟수만큼 남김). 앞선 파일(읽은 순서) 행을 남긴다.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _key_values(series):
+    """지문용 값: 숫자로 바뀌는 값은 float, 그 외는 앞뒤 공백 제거한 문자열 (None/NaN → '')."""
+    values = series.to_numpy(dtype=object)
+    numeric = pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+    is_num = ~np.isnan(numeric)
+    out = np.empty(len(values), dtype=object)
+    out[is_num] = numeric[is_num]
+    rest = ~is_num
+    if rest.any():
+        text = pd.Series(values[rest], dtype=object)
+        out[rest] = text.where(text.notna(), '').astype(str).str.strip().to_numpy(dtype=object)
+    return out
+
+
+def row_fingerprints(df, key_columns):
+    """행마다 지문 번호 (같은 키 값 조합 = 같은 번호). 없는 키 컬럼은 빈 값으로 본다."""
+    keys = pd.DataFrame(
+        {i: (_key_values(df[c]) if c in df.columns else '') for i, c in enumerate(key_columns)},
+        index=pd.RangeIndex(len(df)),
+    )
+    return keys.groupby(list(keys.columns), sort=False, dropna=False).ngroup().to_numpy()
+
+
+def duplicate_mask(df, key_columns, sources):
+    """앞선 원본 파일과 겹쳐 지울 행 True. sources: 행별 원본 이름 (df 와 같은 길이, 읽은 순서)."""
+    if len(df) == 0:
+        return np.zeros(0, dtype=bool)
+    fingerprint = row_fingerprints(df, key_columns)
+    source_codes = pd.factorize(pd.Series(sources, dtype=object), sort=False)[0]
+    occurrence = pd.DataFrame({'s': source_codes, 'f': fingerprint}).groupby(['s', 'f'], sort=False).cumcount()
+    return pd.DataFrame({'f': fingerprint, 'o': occurrence.to_numpy()}).duplicated().to_numpy()
+
+
+def drop_overlapping_rows(df, key_columns, sources):
+    """겹치는 원본 행 제거. Returns: (제거 후 DataFrame, {원본 이름: 제거 행 수}) — 제거 행이 있는 원본만."""
+    mask = duplicate_mask(df, key_columns, sources)
+    if not mask.any():
+        return df, {}
+    dropped = pd.Series(np.asarray(sources, dtype=object)[mask]).value_counts(sort=False)
+    return df[~mask], {str(k): int(v) for k, v in dropped.items()}
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""원본 폴더(.source/Bank, .source/Card) 감시 → before/after/cash 파일 백그라운드 재생성. (app.py 기동 시 선택 사용)
+
+MYINFO_SOURCE_WATCH=1 일 때만 start() 가 감시 스레드를 띄운다 (기본 끔).
+  - 폴링: MYINFO_SOURCE_WATCH_INTERVAL 초마다 (기본 2) 폴더의 .xls/.xlsx 목록·크기·mtime 비교 (엑셀 잠금 파일 ~$ 제외)
+  - 디바운스: 마지막 변경 후 MYINFO_SOURCE_WATCH_DEBOUNCE 초 (기본 3) 동안 그대로일 때만 재생성 (복사 중 파일 제외)
+  - 기동 시 결과 파일이 없거나 원본보다 오래되었으면 바로 재생성
+재생성 함수(build)는 서브앱이 register() 로 넘긴다. 감시 스레드에서 하나씩 실행하며, 파일 쓰기·캐시 교체는 build 가 한다.
+depends_on 으로 등록한 항목(금융정보 병합)은 의존 항목 재생성 성공 후, 의존 항목이 모두 끝났을 때 한 번 실행.
+요청 경로에서는 wait_idle() 로 진행 중 재생성을 기다려 같은 원본을 두 번 읽지 않게 할 수 있다.
+업로드처럼 before/after 를 직접 갱신하는 작업은 exclusive() 안에서 실행하고 acknowledge() 로 넣은 원본을 알린다.
+"""
+import os
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+WATCH_ENV = 'MYINFO_SOURCE_WATCH'
+INTERVAL_ENV = 'MYINFO_SOURCE_WATCH_INTERVAL'
+DEBOUNCE_ENV = 'MYINFO_SOURCE_WATCH_DEBOUNCE'
+SOURCE_EXTENSIONS = ('.xls', '.xlsx')
+
+_cond = threading.Condition()
+_poll_lock = threading.Lock()  # 재생성은 한 번에 하나 (기동 직후 재생성과 폴링 스레드 겹침 방지)
+_targets = {}  # kind -> _Target (등록 순서 = 실행 순서)
+_thread = None
+_stop = threading.Event()
+
+
+class _Target:
+    def __init__(self, kind, directory, build, outputs, depends_on):
+        self.kind = kind
+        self.directory = directory
+        self.build = build
+        self.outputs = tuple(outputs or ())
+        self.depends_on = tuple(depends_on or ())
+        self.snapshot = None
+        self.dirty = False
+        self.changed_at = 0.0
+        self.building = False
+        self.last_error = None
+        self.last_built = None
+
+
+def enabled():
+    """MYINFO_SOURCE_WATCH 가 1/true/yes/on 이면 True."""
+    return (os.environ.get(WATCH_ENV) or '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _env_seconds(name, default):
+    try:
+        value = float(os.environ.get(name) or default)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def _snapshot(directory):
+    """폴더의 원본 엑셀 {이름: (크기, mtime_ns)}. 폴더가 없으면 빈 dict."""
+    snap = {}
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return snap
+    for entry in entries:
+        name = entry.name
+        if name.startswith('~$') or not name.lower().endswith(SOURCE_EXTENSIONS):
+            continue
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        if entry.is_file():
+            snap[name] = (st.st_size, st.st_mtime_ns)
+    return snap
+
+
+def _outputs_stale(target):
+    """결과 파일이 없거나 가장 오래된 결과 파일이 최신 원본보다 오래되었으면 True. 원본이 없으면 False."""
+    if not target.snapshot or not target.outputs:
+        return False
+    newest_source = max(mtime for _, mtime in target.snapshot.values())
+    for path in target.outputs:
+        try:
+            if os.stat(path).st_mtime_ns < newest_source:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def register(kind, directory, build, outputs=(), depends_on=()):
+    """감시 항목 등록 (같은 kind 는 교체).
+
+    directory: 원본 폴더 (None 이면 폴더 감시 없이 depends_on 재생성 후에만 실행)
+    build: 인자 없는 재생성 함수. 예외 또는 False 반환 → 실패 기록(다음 변경 때 다시 시도)
+    outputs: 결과 파일 경로. 기동 시 원본보다 오래되었거나 없으면 재생성
+    """
+    with _cond:
+        target = _Target(kind, directory, build, outputs, depends_on)
+        if directory:
+            target.snapshot = _snapshot(directory)
+        _targets[kind] = target
+
+
+def _dependents(kind):
+    return [t for t in _targets.values() if kind in t.depends_on]
+
+
+def _ready(target, now, debounce):
+    if not target.dirty or target.building:
+        return False
+    if target.directory and now - target.changed_at < debounce:
+        return False
+    # 의존 항목이 아직 재생성 대기·진행 중이면 끝난 뒤 한 번만 실행
+    return not any(
+        _targets[k].dirty or _targets[k].building for k in target.depends_on if k in _targets
+    )
+
+
+def _run(target):
+    t0 = time.perf_counter()
+    ok = False
+    try:
+        result = target.build()
+        ok = result is not False
+        target.last_error = None if ok else '재생성 실패'
+    except Exception as e:
+        target.last_error = str(e)
+        print(f"[source_watcher] {target.kind} 재생성 오류: {e}", flush=True)
+        traceback.print_exc()
+    with _cond:
+        target.building = False
+        if ok:
+            target.last_built = time.time()
+            for dep in _dependents(target.kind):
+                dep.dirty = True
+        _cond.notify_all()
+    if ok:
+        print(f"[source_watcher] {target.kind} 재생성 완료 ({time.perf_counter() - t0:.1f}초)", flush=True)
+    return ok
+
+
+def poll_once(now=None, debounce=None):
+    """원본 폴더 한 번 확인 후 재생성할 항목을 순서대로 실행. 실행한 kind 목록 반환."""
+    debounce = _env_seconds(DEBOUNCE_ENV, 3.0) if debounce is None else debounce
+    with _poll_lock:
+        return _poll_locked(now, debounce)
+
+
+def _poll_locked(now, debounce):
+    with _cond:
+        for target in _targets.values():
+            if not target.directory:
+                continue
+            snap = _snapshot(target.directory)
+            if snap != target.snapshot:
+                target.snapshot = snap
+                target.dirty = True
+                target.changed_at = time.monotonic() if now is None else now
+    ran = []
+    while True:
+        with _cond:
+            current = time.monotonic() if now is None else now
+            target = next((t for t in _targets.values() if _ready(t, current, debounce)), None)
+            if target is None:
+                return ran
+            target.dirty = False
+            target.building = True
+        _run(target)
+        ran.append(target.kind)
+
+
+def _loop(interval):
+    while not _stop.wait(interval):
+        try:
+            poll_once()
+        except Exception as e:
+            print(f"[source_watcher] 감시 오류: {e}", flush=True)
+
+
+def start(force=False):
+    """감시 스레드 시작 (MYINFO_SOURCE_WATCH 꺼져 있으면 force=True 일 때만). 시작했으면 True."""
+    global _thread
+    if not (force or enabled()):
+        return False
+    with _cond:
+        if _thread is not None and _thread.is_alive():
+            return True
+        for target in _targets.values():
+            if target.directory and _outputs_stale(target):
+                target.dirty = True
+                target.changed_at = float('-inf')
+        _stop.clear()
+        _thread = threading.Thread(
+            target=_loop, args=(_env_seconds(INTERVAL_ENV, 2.0),), name='source_watcher', daemon=True
+        )
+        _thread.start()
+    # 기동 시 재생성은 첫 폴링까지 기다리지 않음
+    threading.Thread(target=poll_once, name='source_watcher_init', daemon=True).start()
+    return True
+
+
+def stop(timeout=None):
+    """감시 스레드 종료 요청 (진행 중 재생성은 끝까지 실행)."""
+    global _thread
+    _stop.set()
+    thread = _thread
+    if thread is not None:
+        thread.join(timeout)
+    _thread = None
+
+
+def running():
+    return _thread is not None and _thread.is_alive()
+
+
+@contextmanager
+def exclusive():
+    """감시 재생성과 겹치지 않게 실행 (진행 중 재생성이 끝날 때까지 기다리고, 블록 동안 폴링 중지)."""
+    with _poll_lock:
+        yield
+
+
+def acknowledge(kind, names):
+    """build 없이 결과 파일에 이미 반영한 원본 파일(업로드 등)을 스냅샷에 넣어 다시 재생성하지 않게 함.
+    다른 파일의 변경은 그대로 감지된다. 의존 항목(금융정보 병합)은 재생성 대기로 표시."""
+    with _cond:
+        target = _targets.get(kind)
+        if target is None or not target.directory:
+            return
+        current = _snapshot(target.directory)
+        snap = dict(target.snapshot or {})
+        for name in names:
+            if name in current:
+                snap[name] = current[name]
+            else:
+                snap.pop(name, None)
+        target.snapshot = snap
+        for dep in _dependents(kind):
+            dep.dirty = True
+        _cond.notify_all()
+
+
+def wait_idle(kind, timeout=600):
+    """kind 재생성이 대기·진행 중이면 끝날 때까지 기다림. 감시 중이 아니거나 끝났으면 True, 시간 초과면 False."""
+    with _cond:
+        target = _targets.get(kind)
+        if target is None or not running():
+            return True
+        return _cond.wait_for(lambda: not (target.dirty or target.building), timeout)
+
+
+def status():
+    """kind 별 상태 (감시 폴더, 원본 수, 대기/진행 여부, 마지막 완료 시각·오류)."""
+    with _cond:
+        return {
+            kind: {
+                'directory': t.directory,
+                'files': len(t.snapshot or {}),
+                'pending': t.dirty,
+                'building': t.building,
+                'last_built': t.last_built,
+                'last_error': t.last_error,
+            }
+            for kind, t in _targets.items()
+        }
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""테스트에서 프로젝트 루트·MyCash 모듈을 import 할 수 있게 경로 추가."""
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (PROJECT_ROOT, os.path.join(PROJECT_ROOT, 'MyCash')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""category_rewriter 단계 치환 결과 = 규칙별 순차 str.replace 결과 (무작위 규칙·텍스트)."""
+import random
+import re
+
+import pandas as pd
+import pytest
+
+from category_rewriter import KeywordRewriter, SpacedKeywordRewriter, _spaced_replace_one
+
+ALPHABET = 'ab가나 '
+SEEDS = range(40)
+
+
+def _random_word(rnd, lo, hi):
+    return ''.join(rnd.choice(ALPHABET) for _ in range(rnd.randint(lo, hi)))
+
+
+def _random_rules(rnd, categories):
+    rules = []
+    for _ in range(rnd.randint(1, 8)):
+        kw = _random_word(rnd, 1, 3).strip() or 'a'
+        cat = rnd.choice(categories) if rnd.random() < 0.3 else _random_word(rnd, 0, 3)
+        rules.append((kw, cat))
+    # 연쇄: 앞 규칙 치환 결과가 뒤 규칙 키워드가 되는 규칙
+    if rules and rnd.random() < 0.5:
+        kw, cat = rules[rnd.randrange(len(rules))]
+        if cat.strip():
+            rules.append((cat.strip(), _random_word(rnd, 0, 2)))
+    # 긴 키워드 우선 (실제 규칙 정렬과 같게)
+    rules.sort(key=lambda r: len(r[0]), reverse=True)
+    return rules
+
+
+def _random_texts(rnd, rules, n=30):
+    pieces = [kw for kw, _ in rules] + [cat for _, cat in rules] + list(ALPHABET)
+    return [''.join(rnd.choice(pieces) for _ in range(rnd.randint(0, 6))) for _ in range(n)]
+
+
+def _sequential_regex(series, rules):
+    """기존 은행 후처리: 규칙마다 str.replace(re.escape(kw), cat, regex=True)."""
+    for kw, cat in rules:
+        series = series.fillna('').astype(str).str.replace(re.escape(kw), cat, regex=True)
+    return series
+
+
+def _sequential_literal(series, rules):
+    """기존 카드 전처리/후처리: 규칙마다 str.replace(kw, cat, regex=False)."""
+    for kw, cat in rules:
+        series = series.fillna('').astype(str).str.replace(kw, cat, regex=False)
+    return series
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_keyword_rewriter_template_matches_sequential(seed):
+    rnd = random.Random(seed)
+    rules = _random_rules(rnd, ['\\\\', '\\g<0>\\g<0>', 'a\\\\b', ''])
+    series = pd.Series(_random_texts(rnd, rules), dtype=object)
+    expected = _sequential_regex(series, rules)
+    actual = KeywordRewriter(rules, template=True).rewrite_series(series)
+    assert actual.tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_keyword_rewriter_literal_matches_sequential(seed):
+    rnd = random.Random(1000 + seed)
+    rules = _random_rules(rnd, ['\\', '\\1', 'a\\b', ''])
+    series = pd.Series(_random_texts(rnd, rules), dtype=object)
+    expected = _sequential_literal(series, rules)
+    actual = KeywordRewriter(rules, template=False).rewrite_series(series)
+    assert actual.tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_spaced_rewriter_matches_sequential(seed):
+    rnd = random.Random(2000 + seed)
+    rules = _random_rules(rnd, ['가나', 'ab', ''])
+    texts = _random_texts(rnd, rules) + [None, float('nan'), 12, 'a b 가 나']
+    rewriter = SpacedKeywordRewriter(rules)
+    for text in texts:
+        expected = text
+        for kw, cat in rules:
+            if kw and not re.search(r'\s', kw):
+                expected = _spaced_replace_one(expected, kw, cat)
+        actual = rewriter.rewrite(text)
+        if isinstance(expected, float) and expected != expected:
+            assert isinstance(actual, float) and actual != actual
+        else:
+            assert actual == expected and type(actual) is type(expected)
+
+
+def test_overlapping_and_chained_keywords():
+    rules = [('abc', 'x'), ('bc', 'y'), ('cd', 'ab'), ('ab', 'z')]
+    series = pd.Series(['abcd', 'bcd', 'cdcd', 'xabc', ''], dtype=object)
+    assert (KeywordRewriter(rules, template=False).rewrite_series(series).tolist()
+            == _sequential_literal(series, rules).tolist())
+    assert (KeywordRewriter(rules, template=True).rewrite_series(series).tolist()
+            == _sequential_regex(series, rules).tolist())
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""apply_risk_indicators (np.select) 결과 = 2~10호 순차 적용 참조 구현 결과 (여러 지표에 걸리는 행 포함)."""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import risk_indicators
+import risk_indicators_sequential as sequential
+
+업종분류_ROWS = [
+    {'분류': '업종분류', '키워드': '증권/선물', '카테고리': '투기성지표'},
+    {'분류': '업종분류', '키워드': '대부, 파산', '카테고리': '사기파산지표'},
+    {'분류': '업종분류', '키워드': '코인/업비트', '카테고리': '가상자산지표'},
+    {'분류': '업종분류', '키워드': '해외송금 SWIFT', '카테고리': '자산은닉지표'},
+    {'분류': '업종분류', '키워드': '명품/골프', '카테고리': '과소비지표'},
+    {'분류': '업종분류', '키워드': '경마/카지노', '카테고리': '사행성지표'},
+]
+심야_22_06 = {'분류': '심야구분', '키워드': '22:00:00/06:00:00', '카테고리': ''}
+심야_01_05 = {'분류': '심야구분', '키워드': '01:00:00/05:00:00', '카테고리': ''}
+
+# (키워드, 카테고리, 기타거래, 입금액, 출금액, 거래시간, 구분, 거래일)
+ROWS = [
+    ('월세', '주거비', '', 0, 6_000_000, '12:00:00', '', '2024-01-03'),        # 3호 + 4호 (같은 키워드 3건)
+    ('월세', '주거비', '', 0, 6_000_000, '12:10:00', '', '2024-02-03'),
+    ('월세', '주거비', '', 0, 1_500_000, '12:20:00', '', '2024-03-03'),        # 4호만
+    ('관리비', '주거비', '', 0, 5_000_000, '12:30:00', '', '2024-03-04'),      # 3호만
+    ('증권', '투자', '', 0, 600_000, '09:00:00', '', '2024-01-05'),            # 5호
+    ('증권 경마', '', '', 0, 600_000, '10:00:00', '', '2024-01-06'),           # 5호 + 10호
+    ('대부', '', '', 0, 700_000, '10:00:00', '', '2024-01-07'),                # 6호
+    ('', '가상자산거래', '', 0, 700_000, '11:00:00', '', '2024-01-08'),        # 7호 (카테고리)
+    (None, '', '업비트 업비트', 0, 800_000, '', '', '2024-01-09'),             # 7호 (기타거래 키워드)
+    ('해외송금', '', '', 0, 6_000_000, '15:00:00', '', '2024-01-10'),          # 3호 + 8호
+    ('명품', '쇼핑', '', 0, 400_000, '16:00:00', '', '2024-01-11'),            # 9호 (50만 미만)
+    ('골프', '', '', 0, 600_000, '16:00:00', '', '2024-01-11'),                # 9호
+    ('경마', '', '', 0, 150_000, '17:00:00', '', '2024-01-12'),                # 10호
+    ('경마', '', '', 0, 200_000, '23:30:00', '', '2024-01-12'),                # 심야 → 2호
+    ('증권', '', '', 0, 6_000_000, '0230', ' 폐업 ', '2024-01-13'),            # 폐업 → 2호
+    ('증권', '', '', 100, 600_000, '09:00:00', '', '2024-01-14'),              # 입금 있음 → 5호 아님
+    ('SWIFT', '', 'swift', np.nan, '600000', None, None, '2024-01-15'),         # 8호 (문자 금액)
+    ('카지노', '', '', 0, 'x', '03:00:00', '정상', '2024-01-16'),               # 금액 인식 불가
+    ('마트', '식비', '마트', 0, 50_000, '13:00:00', '', '2024-01-17'),          # 1호
+]
+
+
+def _frame(columns):
+    df = pd.DataFrame(ROWS, columns=['키워드', '카테고리', '기타거래', '입금액', '출금액', '거래시간', '구분', '거래일'])
+    if columns == 'risk':
+        df['위험도분류'] = ''
+        df['위험도'] = 0.0
+    elif columns == '업종':
+        df['업종분류'] = ''
+        df['업종키워드'] = 'k'
+    elif columns == 'object':
+        df = df.astype(object)
+    return df
+
+
+@pytest.fixture(params=['plain', 'simya_22_06', 'simya_01_05', 'none'])
+def category_table(request, tmp_path):
+    if request.param == 'none':
+        return None
+    rows = list(업종분류_ROWS)
+    if request.param == 'simya_22_06':
+        rows.append(심야_22_06)
+    elif request.param == 'simya_01_05':
+        rows.append(심야_01_05)
+    path = tmp_path / 'category_table.json'
+    path.write_text(json.dumps(rows, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('columns', ['risk', '업종', 'object', 'bare'])
+def test_matches_sequential(category_table, columns):
+    expected = _frame(columns)
+    sequential.apply_risk_indicators(expected, category_table)
+    got = _frame(columns)
+    risk_indicators.apply_risk_indicators(got, category_table)
+    pd.testing.assert_frame_equal(got, expected)
+
+
+def test_fixture_hits_several_indicators(tmp_path):
+    path = tmp_path / 'category_table.json'
+    path.write_text(json.dumps(업종분류_ROWS + [심야_22_06], ensure_ascii=False), encoding='utf-8')
+    df = _frame('risk')
+    risk_indicators.apply_risk_indicators(df, str(path))
+    classes = set(df['위험도분류'])
+    assert {'심야폐업지표', '자료소명지표', '비정형지표', '투기성지표', '사기파산지표', '가상자산지표',
+            '자산은닉지표', '과소비지표', '사행성지표', '분류제외지표'} <= classes
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""원본 엑셀 업로드 작업: 스트리밍 저장 → 백그라운드 파싱·증분 반영, 작업 id 로 진행 조회. (MyBank·MyCard 업로드 API 공용)
+
+  - request_upload(): multipart(file 필드) 또는 본문 그대로(?filename= / X-Filename 헤더, URL 인코딩 가능) 업로드에서 (파일명, 스트림)
+  - content_too_large(): 요청 Content-Length 가 MAX_UPLOAD_BYTES 초과면 True (본문을 읽기 전에 413)
+  - start_upload(): 스트림을 청크 단위로 .source/upload_tmp/<작업 id>/ 에 저장 (파일 전체를 메모리에 올리지 않음),
+    MAX_UPLOAD_BYTES 를 넘으면 저장을 멈추고 state='error', too_large=True (Content-Length 없는 본문도 제한),
+    저장이 끝나면 작업 큐에 넣고 작업 id 반환. 원본 폴더(.source/Bank·Card)에는 반영이 끝난 뒤 work 가 옮긴다
+    (복사 중 파일을 통합·감시가 읽지 않게)
+  - move_to_source(): 반영이 끝난 임시 파일을 원본 폴더로 옮김. 같은 이름 원본(월별 내보내기 등)은 덮어쓰지 않고
+    '이름_<작업 id 앞 8자>.xlsx' 로 저장해 그 이름을 돌려줌 (acknowledge 에 넘길 이름)
+  - 작업 스레드 하나가 큐 순서대로 work(임시 파일 경로, report) 실행 → before/after 쓰기가 겹치지 않음
+  - get_job(): {'id', 'kind', 'filename', 'bytes', 'state'(uploading/queued/running/done/error), 'stage', 'progress'(0~100),
+    'result', 'error', 'too_large', 'created', 'finished'}
+"""
+import os
+import queue
+import shutil
+import threading
+import time
+import traceback
+import uuid
+from urllib.parse import unquote
+
+UPLOAD_EXTENSIONS = ('.xls', '.xlsx')
+CHUNK_SIZE = 1 << 20
+MAX_UPLOAD_BYTES = 50 << 20  # 원본 엑셀 1개 최대 크기
+TOO_LARGE_MESSAGE = f'파일이 너무 큽니다 (최대 {MAX_UPLOAD_BYTES >> 20}MB).'
+MAX_JOBS = 200  # 보관할 작업 수 (끝난 작업부터 오래된 순으로 지움)
+
+_lock = threading.Lock()
+_jobs = {}  # id -> 작업 dict (생성 순서)
+_queue = queue.Queue()
+_worker = None
+
+
+def safe_filename(name):
+    """업로드 파일명 → 경로 부분을 뗀 .xls/.xlsx 파일명. 쓸 수 없는 이름이면 None. (한글 유지)"""
+    if not name:
+        return None
+    name = os.path.basename(str(name).replace('\\', '/')).strip()
+    if not name or name.startswith(('.', '~$')) or any(ord(ch) < 32 for ch in name):
+        return None
+    if not name.lower().endswith(UPLOAD_EXTENSIONS):
+        return None
+    return name
+
+
+def request_upload(request):
+    """Flask request → (파일명, 스트림). multipart 'file' 필드 우선, 없으면 본문 그대로."""
+    file = request.files.get('file')
+    if file is not None and file.filename:
+        return file.filename, file.stream
+    name = request.args.get('filename') or request.headers.get('X-Filename') or ''
+    return unquote(name), request.stream
+
+
+def content_too_large(request):
+    """요청 본문 크기(Content-Length)가 MAX_UPLOAD_BYTES 초과인지. 길이를 모르면 False (저장 중 제한)."""
+    length = request.content_length
+    return length is not None and length > MAX_UPLOAD_BYTES
+
+
+def move_to_source(path, directory):
+    """start_upload 가 저장한 임시 파일(path)을 directory 로 옮기고 저장한 파일명 반환.
+    같은 이름 파일이 있으면 덮어쓰지 않고 작업 id 앞 8자(필요하면 번호)를 붙인 이름으로 저장."""
+    os.makedirs(directory, exist_ok=True)
+    name = os.path.basename(path)
+    stem, ext = os.path.splitext(name)
+    tag = os.path.basename(os.path.dirname(path))[:8]
+    n = 0
+    while os.path.exists(os.path.join(directory, name)):
+        n += 1
+        name = f'{stem}_{tag}{ext}' if n == 1 else f'{stem}_{tag}_{n}{ext}'
+    shutil.move(path, os.path.join(directory, name))
+    return name
+
+
+def _update(job_id, **fields):
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is not None:
+            job.update(fields)
+
+
+def _trim():
+    """MAX_JOBS 초과 시 끝난 작업부터 오래된 순으로 제거 (_lock 보유 상태에서 호출)."""
+    excess = len(_jobs) - MAX_JOBS
+    if excess <= 0:
+        return
+    for job_id in [k for k, j in _jobs.items() if j['state'] in ('done', 'error')][:excess]:
+        del _jobs[job_id]
+
+
+def _ensure_worker():
+    global _worker
+    with _lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_work_loop, name='upload_jobs', daemon=True)
+            _worker.start()
+
+
+def _work_loop():
+    while True:
+        job_id, path, work = _queue.get()
+        try:
+            _run(job_id, path, work)
+        finally:
+            _queue.task_done()
+
+
+def _run(job_id, path, work):
+    def report(stage, percent):
+        _update(job_id, stage=stage, progress=int(percent))
+
+    _update(job_id, state='running', stage='start', progress=5)
+    try:
+        result = work(path, report)
+        _update(job_id, state='done', stage='done', progress=100, result=result, finished=time.time())
+    except Exception as e:
+        traceback.print_exc()
+        _update(job_id, state='error', error=str(e), finished=time.time())
+    finally:
+        shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+
+
+def start_upload(kind, filename, stream, tmp_root, work):
+    """stream 을 tmp_root/<작업 id>/filename 에 저장한 뒤 work(경로, report) 를 작업 스레드에 넣음. 작업 dict 복사본 반환.
+    report(단계, 퍼센트) 로 진행 표시, work 반환값은 result 로 보관. 저장 실패 시 state='error'
+    (MAX_UPLOAD_BYTES 초과면 too_large=True)."""
+    job_id = uuid.uuid4().hex
+    job = {
+        'id': job_id, 'kind': kind, 'filename': filename, 'bytes': 0,
+        'state': 'uploading', 'stage': 'upload', 'progress': 0,
+        'result': None, 'error': None, 'too_large': False, 'created': time.time(), 'finished': None,
+    }
+    with _lock:
+        _jobs[job_id] = job
+        _trim()
+    job_dir = os.path.join(tmp_root, job_id)
+    path = os.path.join(job_dir, filename)
+    written = 0
+    try:
+        os.makedirs(job_dir, exist_ok=True)
+        with open(path, 'wb') as f:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > MAX_UPLOAD_BYTES:
+                    _update(job_id, too_large=True)
+                    raise ValueError(TOO_LARGE_MESSAGE)
+                f.write(chunk)
+                _update(job_id, bytes=written)
+        if written == 0:
+            raise ValueError('빈 파일입니다.')
+    except Exception as e:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        _update(job_id, state='error', error=f'업로드 저장 실패: {e}', finished=time.time())
+        return get_job(job_id)
+    _update(job_id, state='queued', stage='queued', progress=0)
+    _ensure_worker()
+    _queue.put((job_id, path, work))
+    return get_job(job_id)
+
+
+def get_job(job_id):
+    """작업 상태 dict 복사본. 없으면 None."""
+    with _lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+
+def list_jobs(kind=None):
+    """작업 목록 (생성 순서). kind 지정 시 해당 앱 작업만."""
+    with _lock:
+        return [dict(j) for j in _jobs.values() if kind is None or j['kind'] == kind]
+